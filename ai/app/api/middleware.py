@@ -0,0 +1,46 @@
+"""
+API 공통 미들웨어
+"""
+from llm.clients.rate_limiter import llm_endpoint
+from llm.clients.response_cache import bypass_llm_cache
+
+BYPASS_HEADER = b"x-llm-cache"
+
+
+class LLMCacheBypassMiddleware:
+    """
+    `Cache-Control: no-cache` 또는 `X-LLM-Cache: bypass` 헤더가 있는 요청은 LLM 응답 캐시를 우회합니다.
+    순수 ASGI 미들웨어로, 요청을 처리하는 태스크의 컨텍스트에 우회 플래그를 설정합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        bypass = (
+            b"no-cache" in headers.get(b"cache-control", b"").lower()
+            or headers.get(BYPASS_HEADER, b"").lower() == b"bypass"
+        )
+        with bypass_llm_cache(bypass):
+            await self.app(scope, receive, send)
+
+
+class LLMEndpointMiddleware:
+    """
+    요청 경로를 LLM 제한기의 엔드포인트로 설정합니다.
+    같은 경로의 LLM 호출은 하나의 대기열로 모이고, 대기열끼리는 번갈아 처리됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with llm_endpoint(scope.get("path") or "/"):
+            await self.app(scope, receive, send)
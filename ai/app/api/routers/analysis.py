@@ -1,13 +1,24 @@
 # app/api/routers/analysis.py
+import json
+from contextlib import aclosing
+
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from app.api.dependencies import get_case_analysis_service, get_current_user
 from app.api.exceptions import BadRequestException
 from app.api.schemas.analysis import AnalysisRequest, AnalysisResponseData, AnalysisResponse
 from app.api.schemas.error import BaseErrorResponse
 from services.case_analysis_service import CaseAnalysisService
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @router.post(
     "/analysis",
     response_model=AnalysisResponse,               # ← 공통 성공 래퍼 사용
@@ -41,3 +52,42 @@ async def analyze_case_endpoint(
     # 공통 응답 규격으로 반환
     return {"success": True, "data": data}
 
+
+
+@router.post(
+    "/analysis/stream",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_user)],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": BaseErrorResponse, "description": "잘못된 요청"},
+        status.HTTP_401_UNAUTHORIZED: {"model": BaseErrorResponse, "description": "인증 실패"},
+    },
+)
+async def stream_analysis_endpoint(
+    request: AnalysisRequest,
+    case_analysis_service: CaseAnalysisService = Depends(get_case_analysis_service),
+):
+    """
+    사건 분석을 SSE(text/event-stream)로 스트리밍합니다.
+    이벤트: status(판례 검색 완료) → token(LLM 출력 조각) / field(완성된 필드) → result(최종 분석 결과) → done
+    처리 중 오류가 나면 error 이벤트를 보낸 뒤 done으로 종료합니다.
+    """
+    if not request.case or not getattr(request.case, "fullText", "").strip():
+        raise BadRequestException("필수 필드 'case.fullText'가 누락되었습니다.")
+
+    async def event_stream():
+        try:
+            # 클라이언트 연결이 끊겨 이 제너레이터가 닫히면 분석 스트림(과 LLM 응답)도 함께 닫힘
+            async with aclosing(case_analysis_service.stream_analysis(user_query=request.case.fullText)) as events:
+                async for event, data in events:
+                    yield _sse(event, data)
+        except Exception as e:
+            logger.error(f"Error during analysis stream: {e}", exc_info=True)
+            yield _sse("error", {"message": "사건 분석 중 오류가 발생했습니다."})
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from core.lifecycle import get_readiness
+from core.metrics import collect_metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/health/live",
+    status_code=status.HTTP_200_OK,
+    summary="Liveness 체크",
+    description="프로세스가 살아 있으면 항상 200을 반환합니다.",
+)
+async def liveness():
+    return {"status": "ok"}
+
+
+@router.get(
+    "/health/ready",
+    status_code=status.HTTP_200_OK,
+    summary="Readiness 체크",
+    description="모델 로드와 워밍업이 끝나 트래픽을 받을 수 있으면 200, 아니면 503을 반환합니다.",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "준비되지 않음"}},
+)
+async def readiness():
+    snapshot = get_readiness().snapshot()
+    if not snapshot["ready"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=snapshot)
+    return snapshot
+
+
+@router.get(
+    "/health/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="내부 지표",
+    description="캐시 적중률 등 이 워커 프로세스에 등록된 지표를 반환합니다.",
+)
+async def metrics():
+    return collect_metrics()
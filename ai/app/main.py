@@ -1,3 +1,10 @@
+# torch/numpy가 import 되기 전에 워커 단위 BLAS/토크나이저 스레드 수를 고정합니다.
+# (아래 서비스/모델 모듈이 numpy를 불러오므로 반드시 다른 import보다 먼저 실행)
+from llm.models.runtime import apply_thread_env
+
+apply_thread_env()
+
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -11,9 +18,17 @@ from app.api.handlers import (
     http_error_handler,
 )
 from app.api.exceptions import APIException
-from app.api.routers import analysis, structuring, search, chat, consult
-from config.settings import get_api_settings
-from llm.models.model_loader import ModelLoader
+from app.api.middleware import LLMCacheBypassMiddleware, LLMEndpointMiddleware
+from app.api.routers import analysis, structuring, search, chat, consult, health
+from config.settings import get_api_settings, get_warmup_settings, get_tag_classifier_settings
+from core.container import get_container
+from core.lifecycle import StartupTimer, get_readiness
+from core.warmup import warmup_models, warmup_db_pool
+from core.prefork import log_memory_stats
+from db.database import close_connection_pool
+from llm.models.embedding_model import EmbeddingModel
+from llm.models.cross_encoder_model import CrossEncoderModel
+from services.chat_summarizer import ChatHistorySummarizer
 from utils.logger import setup_logger, get_logger
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -23,13 +38,68 @@ logger = get_logger(__name__)
 # 설정 로드
 api_settings = get_api_settings()
 
+async def _warmup(timer: StartupTimer, embedding_model: EmbeddingModel, cross_encoder_model: CrossEncoderModel):
+    """모델/DB 워밍업을 백그라운드에서 수행하고 완료되면 ready 상태로 전환합니다."""
+    readiness = get_readiness()
+    warmup_settings = get_warmup_settings()
+    try:
+        if warmup_settings.enabled:
+            readiness.set_phase("warming_up")
+            with timer.phase("warmup_models"):
+                model_stats = await asyncio.to_thread(
+                    warmup_models, embedding_model, cross_encoder_model, warmup_settings
+                )
+            readiness.update(models=model_stats)
+            with timer.phase("warmup_db_pool"):
+                try:
+                    db_stats = await asyncio.to_thread(warmup_db_pool)
+                    readiness.update(db=db_stats)
+                except Exception as e:
+                    # DB 장애는 검색 요청 시점에 처리되므로 준비 상태를 막지 않습니다.
+                    logger.warning(f"DB 커넥션 풀 워밍업 실패: {e}")
+                    readiness.update(db={"error": str(e)})
+        if get_tag_classifier_settings().enabled:
+            # 태그 기준 벡터 계산을 첫 상담 요청 전에 끝내 둡니다.
+            from services.tag_classifier import TagClassifier
+            with timer.phase("tag_classifier"):
+                await asyncio.to_thread(get_container().get, TagClassifier)
+        readiness.update(memory=log_memory_stats("worker ready"))
+        readiness.mark_ready()
+        logger.info("Application startup: Ready to serve traffic.")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"워밍업 중 오류 발생: {e}", exc_info=True)
+        readiness.mark_failed(str(e))
+    finally:
+        timer.log_report()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application startup: Loading models...")
-    ModelLoader.get_embedding_model()
-    ModelLoader.get_cross_encoder_model()
+    timer = StartupTimer()
+    with timer.phase("container"):
+        container = get_container()
+    with timer.phase("embedding_model"):
+        embedding_model = container.get(EmbeddingModel)
+    with timer.phase("cross_encoder_model"):
+        cross_encoder_model = container.get(CrossEncoderModel)
     logger.info("Application startup: Models loaded.")
+
+    # 워밍업은 백그라운드에서 진행하고, 완료 전까지 /health/ready는 503을 반환합니다.
+    warmup_task = asyncio.create_task(_warmup(timer, embedding_model, cross_encoder_model))
     yield
+    get_readiness().mark_not_ready("shutting_down")
+    warmup_task.cancel()
+    try:
+        await warmup_task
+    except asyncio.CancelledError:
+        pass
+    # 진행 중인 채팅 이력 요약을 마치고 종료 (요약 결과가 세션 저장소에 반영되도록)
+    if container.is_initialized(ChatHistorySummarizer):
+        await container.get(ChatHistorySummarizer).drain()
+    close_connection_pool()
     logger.info("Application shutdown.")
 
 app = FastAPI(lifespan=lifespan, response_model_exclude_none=True)
@@ -41,6 +111,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(LLMCacheBypassMiddleware)
+app.add_middleware(LLMEndpointMiddleware)
 
 app.add_exception_handler(APIException, api_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -52,6 +124,7 @@ app.include_router(structuring.router, prefix="/api", tags=["structuring"])
 app.include_router(search.router, prefix="/api", tags=["Search"])
 app.include_router(chat.router, prefix="/api/ai", tags=["Chat"])
 app.include_router(consult.router, prefix="/api", tags=["Consultation"])
+app.include_router(health.router, tags=["Health"])
 
 @app.get("/")
 def read_root():
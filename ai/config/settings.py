@@ -26,6 +26,8 @@ class DatabaseSettings(BaseSettings):
     host: str
     port: int
     name: str
+    pool_min_size: int = 1
+    pool_max_size: int = 10
     
     def __init__(self, **data):
         # 환경변수에서 직접 값 로드
@@ -35,7 +37,9 @@ class DatabaseSettings(BaseSettings):
                 'password': os.environ.get('DB_PASSWORD', ''),
                 'host': os.environ.get('DB_HOST', 'localhost'),
                 'port': int(os.environ.get('DB_PORT', '5432')),
-                'name': os.environ.get('DB_NAME', 'postgres')
+                'name': os.environ.get('DB_NAME', 'postgres'),
+                'pool_min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+                'pool_max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10'))
             }
         super().__init__(**data)
     
@@ -71,6 +75,31 @@ class LLMSettings(BaseSettings):
     max_retries: int
     embedding_model_name: str
     cross_encoder_model_name: str
+    consult_call_timeout: float = 20.0
+    consult_merge_questions_tags: bool = False
+    response_cache_enabled: bool = False
+    response_cache_path: str = "data/llm_cache.sqlite3"
+    response_cache_ttl_seconds: float = 7 * 24 * 3600
+    response_cache_max_mb: int = 256
+    analysis_prompt_max_tokens: int = 6000
+    analysis_query_max_tokens: int = 1500
+    analysis_min_doc_tokens: int = 80
+    analysis_compression_enabled: bool = True
+    analysis_sentences_per_case: int = 3
+    analysis_compression_batch_size: int = 64
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 60.0
+    http_write_timeout: float = 10.0
+    http_pool_timeout: float = 10.0
+    http_dns_cache_ttl: float = 300.0
+    limiter_enabled: bool = True
+    limiter_max_concurrency: int = 16
+    limiter_requests_per_minute: float = 0
+    limiter_tokens_per_minute: float = 0
     
     def __init__(self, **data):
         if not data:
@@ -79,7 +108,32 @@ class LLMSettings(BaseSettings):
                 'max_history_tokens': int(os.environ.get('MAX_HISTORY_TOKENS', '3000')),
                 'max_retries': int(os.environ.get('LLM_MAX_RETRIES', '3')),
                 'embedding_model_name': os.environ.get('EMBEDDING_MODEL_NAME', 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'),
-                'cross_encoder_model_name': os.environ.get('CROSS_ENCODER_MODEL_NAME', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+                'cross_encoder_model_name': os.environ.get('CROSS_ENCODER_MODEL_NAME', 'cross-encoder/ms-marco-MiniLM-L-6-v2'),
+                'consult_call_timeout': float(os.environ.get('CONSULT_CALL_TIMEOUT', '20')),
+                'consult_merge_questions_tags': os.environ.get('CONSULT_MERGE_QUESTIONS_TAGS', 'false').lower() == 'true',
+                'response_cache_enabled': os.environ.get('LLM_CACHE_ENABLED', 'false').lower() == 'true',
+                'response_cache_path': os.environ.get('LLM_CACHE_PATH', 'data/llm_cache.sqlite3'),
+                'response_cache_ttl_seconds': float(os.environ.get('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+                'response_cache_max_mb': int(os.environ.get('LLM_CACHE_MAX_MB', '256')),
+                'analysis_prompt_max_tokens': int(os.environ.get('ANALYSIS_PROMPT_MAX_TOKENS', '6000')),
+                'analysis_query_max_tokens': int(os.environ.get('ANALYSIS_QUERY_MAX_TOKENS', '1500')),
+                'analysis_min_doc_tokens': int(os.environ.get('ANALYSIS_MIN_DOC_TOKENS', '80')),
+                'analysis_compression_enabled': os.environ.get('ANALYSIS_COMPRESSION_ENABLED', 'true').lower() == 'true',
+                'analysis_sentences_per_case': int(os.environ.get('ANALYSIS_SENTENCES_PER_CASE', '3')),
+                'analysis_compression_batch_size': int(os.environ.get('ANALYSIS_COMPRESSION_BATCH_SIZE', '64')),
+                'http_max_connections': int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', '100')),
+                'http_max_keepalive_connections': int(os.environ.get('LLM_HTTP_MAX_KEEPALIVE', '20')),
+                'http_keepalive_expiry': float(os.environ.get('LLM_HTTP_KEEPALIVE_EXPIRY', '30')),
+                'http2_enabled': os.environ.get('LLM_HTTP2', 'true').lower() == 'true',
+                'http_connect_timeout': float(os.environ.get('LLM_HTTP_CONNECT_TIMEOUT', '5')),
+                'http_read_timeout': float(os.environ.get('LLM_HTTP_READ_TIMEOUT', '60')),
+                'http_write_timeout': float(os.environ.get('LLM_HTTP_WRITE_TIMEOUT', '10')),
+                'http_pool_timeout': float(os.environ.get('LLM_HTTP_POOL_TIMEOUT', '10')),
+                'http_dns_cache_ttl': float(os.environ.get('LLM_DNS_CACHE_TTL', '300')),
+                'limiter_enabled': os.environ.get('LLM_LIMITER_ENABLED', 'true').lower() == 'true',
+                'limiter_max_concurrency': int(os.environ.get('LLM_MAX_CONCURRENCY', '16')),
+                'limiter_requests_per_minute': float(os.environ.get('LLM_REQUESTS_PER_MINUTE', '0')),
+                'limiter_tokens_per_minute': float(os.environ.get('LLM_TOKENS_PER_MINUTE', '0'))
             }
         super().__init__(**data)
 
@@ -155,6 +209,155 @@ class LoggingSettings(BaseSettings):
         super().__init__(**data)
 
 
+class WarmupSettings(BaseSettings):
+    """기동 시 모델 워밍업 관련 설정"""
+    model_config = {
+        "extra": "ignore"
+    }
+    
+    enabled: bool
+    min_iterations: int
+    max_iterations: int
+    window: int
+    stability_tolerance: float
+    rerank_batch_sizes_str: str
+    
+    def __init__(self, **data):
+        if not data:
+            data = {
+                'enabled': os.environ.get('WARMUP_ENABLED', 'true').lower() == 'true',
+                'min_iterations': int(os.environ.get('WARMUP_MIN_ITERATIONS', '6')),
+                'max_iterations': int(os.environ.get('WARMUP_MAX_ITERATIONS', '60')),
+                'window': int(os.environ.get('WARMUP_WINDOW', '3')),
+                'stability_tolerance': float(os.environ.get('WARMUP_STABILITY_TOLERANCE', '0.1')),
+                'rerank_batch_sizes_str': os.environ.get('WARMUP_RERANK_BATCH_SIZES', '5,10,20')
+            }
+        super().__init__(**data)
+    
+    @property
+    def rerank_batch_sizes(self) -> List[int]:
+        """워밍업에 사용할 Cross-encoder 배치 크기 리스트를 반환"""
+        return [int(size.strip()) for size in self.rerank_batch_sizes_str.split(',') if size.strip()]
+
+
+class TagClassifierSettings(BaseSettings):
+    """로컬 임베딩 태그 분류기 관련 설정"""
+    model_config = {
+        "extra": "ignore"
+    }
+    
+    enabled: bool
+    threshold: float
+    top_k: int
+    min_confidence: float
+    
+    def __init__(self, **data):
+        if not data:
+            data = {
+                'enabled': os.environ.get('TAG_CLASSIFIER_ENABLED', 'false').lower() == 'true',
+                'threshold': float(os.environ.get('TAG_CLASSIFIER_THRESHOLD', '0.35')),
+                'top_k': int(os.environ.get('TAG_CLASSIFIER_TOP_K', '3')),
+                'min_confidence': float(os.environ.get('TAG_CLASSIFIER_MIN_CONFIDENCE', '0.5'))
+            }
+        super().__init__(**data)
+
+
+class AnalysisCacheSettings(BaseSettings):
+    """사건 분석 시맨틱 캐시 관련 설정"""
+    model_config = {
+        "extra": "ignore"
+    }
+    
+    enabled: bool
+    threshold: float
+    max_entries: int
+    ttl_seconds: float
+    
+    def __init__(self, **data):
+        if not data:
+            data = {
+                'enabled': os.environ.get('ANALYSIS_CACHE_ENABLED', 'false').lower() == 'true',
+                'threshold': float(os.environ.get('ANALYSIS_CACHE_THRESHOLD', '0.95')),
+                'max_entries': int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', '1000')),
+                'ttl_seconds': float(os.environ.get('ANALYSIS_CACHE_TTL_SECONDS', '86400'))
+            }
+        super().__init__(**data)
+
+
+class ChatSettings(BaseSettings):
+    """실시간 채팅 세션 저장소 관련 설정"""
+    model_config = {
+        "extra": "ignore"
+    }
+    
+    session_backend: str
+    session_path: str
+    max_sessions: int
+    session_ttl_seconds: float
+    session_max_mb: int
+    summary_enabled: bool
+    summary_threshold_tokens: int
+    summary_keep_turns: int
+    summary_max_tokens: int
+    
+    def __init__(self, **data):
+        if not data:
+            data = {
+                'session_backend': os.environ.get('CHAT_SESSION_BACKEND', 'memory').lower(),
+                'session_path': os.environ.get('CHAT_SESSION_PATH', 'data/chat_sessions.sqlite3'),
+                'max_sessions': int(os.environ.get('CHAT_MAX_SESSIONS', '10000')),
+                'session_ttl_seconds': float(os.environ.get('CHAT_SESSION_TTL_SECONDS', '86400')),
+                'session_max_mb': int(os.environ.get('CHAT_SESSION_MAX_MB', '64')),
+                'summary_enabled': os.environ.get('CHAT_SUMMARY_ENABLED', 'true').lower() == 'true',
+                'summary_threshold_tokens': int(os.environ.get('CHAT_SUMMARY_THRESHOLD_TOKENS', '1500')),
+                'summary_keep_turns': int(os.environ.get('CHAT_SUMMARY_KEEP_TURNS', '2')),
+                'summary_max_tokens': int(os.environ.get('CHAT_SUMMARY_MAX_TOKENS', '400'))
+            }
+        super().__init__(**data)
+
+
+class RuntimeSettings(BaseSettings):
+    """CPU 추론 런타임(torch/토크나이저/BLAS) 설정 — 워커 단위로 적용"""
+    model_config = {
+        "extra": "ignore"
+    }
+    
+    workers: int
+    torch_intra_op_threads: int
+    torch_inter_op_threads: int
+    blas_threads: int
+    tokenizers_parallelism: bool
+    inference_mode: bool
+    bf16_autocast: bool
+    torch_compile: bool
+    
+    def __init__(self, **data):
+        if not data:
+            data = {
+                'workers': int(os.environ.get('WEB_CONCURRENCY', '1')),
+                'torch_intra_op_threads': int(os.environ.get('TORCH_INTRA_OP_THREADS', '0')),
+                'torch_inter_op_threads': int(os.environ.get('TORCH_INTER_OP_THREADS', '1')),
+                'blas_threads': int(os.environ.get('BLAS_THREADS', '0')),
+                'tokenizers_parallelism': os.environ.get('TOKENIZERS_PARALLELISM', 'false').lower() == 'true',
+                'inference_mode': os.environ.get('TORCH_INFERENCE_MODE', 'true').lower() == 'true',
+                'bf16_autocast': os.environ.get('TORCH_BF16_AUTOCAST', 'false').lower() == 'true',
+                'torch_compile': os.environ.get('TORCH_COMPILE', 'false').lower() == 'true'
+            }
+        super().__init__(**data)
+    
+    @property
+    def intra_op_threads(self) -> int:
+        """워커당 intra-op 스레드 수 (0이면 CPU 코어 수 / 워커 수)"""
+        if self.torch_intra_op_threads > 0:
+            return self.torch_intra_op_threads
+        return max(1, (os.cpu_count() or 1) // max(1, self.workers))
+    
+    @property
+    def resolved_blas_threads(self) -> int:
+        """워커당 BLAS/OpenMP 스레드 수 (0이면 intra-op 스레드 수와 동일)"""
+        return self.blas_threads if self.blas_threads > 0 else self.intra_op_threads
+
+
 class Settings(BaseSettings):
     """전체 애플리케이션 설정"""
     model_config = {
@@ -167,6 +370,11 @@ class Settings(BaseSettings):
     api: APISettings = APISettings()
     search: SearchSettings = SearchSettings()
     logging: LoggingSettings = LoggingSettings()
+    warmup: WarmupSettings = WarmupSettings()
+    runtime: RuntimeSettings = RuntimeSettings()
+    tag_classifier: TagClassifierSettings = TagClassifierSettings()
+    analysis_cache: AnalysisCacheSettings = AnalysisCacheSettings()
+    chat: ChatSettings = ChatSettings()
 
 
 # 싱글톤 패턴으로 설정 인스턴스 제공
@@ -199,4 +407,24 @@ def get_search_settings() -> SearchSettings:
 
 
 def get_logging_settings() -> LoggingSettings:
-    return get_settings().logging
\ No newline at end of file
+    return get_settings().logging
+
+
+def get_warmup_settings() -> WarmupSettings:
+    return get_settings().warmup
+
+
+def get_runtime_settings() -> RuntimeSettings:
+    return get_settings().runtime
+
+
+def get_tag_classifier_settings() -> TagClassifierSettings:
+    return get_settings().tag_classifier
+
+
+def get_analysis_cache_settings() -> AnalysisCacheSettings:
+    return get_settings().analysis_cache
+
+
+def get_chat_settings() -> ChatSettings:
+    return get_settings().chat
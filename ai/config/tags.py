@@ -48,3 +48,57 @@ SPECIALTY_TAGS = [
     "M&A",
     "기업법무",
 ]
+
+
+# 로컬 태그 분류기(services/tag_classifier.py)의 태그 프로토타입.
+# 태그별로 설명과 대표 사연 문장을 함께 임베딩하여 평균한 벡터를 해당 태그의 기준 벡터로 사용합니다.
+SPECIALTY_TAG_DESCRIPTIONS = {
+    "음주운전": ["술을 마신 상태로 운전하여 단속되거나 사고를 낸 사건", "음주측정 거부, 혈중알코올농도, 면허취소 처분"],
+    "무면허운전": ["운전면허 없이 또는 면허 정지·취소 상태에서 운전한 사건", "면허가 취소된 줄 모르고 차를 몰다가 적발됐어요"],
+    "성범죄": ["강제추행, 성폭력, 불법촬영, 성희롱 등 성적 침해 범죄", "지하철에서 추행 혐의로 신고를 당했습니다"],
+    "마약사건": ["마약류 투약, 소지, 매매, 대마 관련 형사 사건", "대마를 피운 혐의로 경찰 조사를 받게 됐어요"],
+    "폭력·폭행": ["폭행, 상해, 협박, 특수폭행 등 신체에 대한 유형력 행사", "술자리에서 시비가 붙어 상대방을 때렸습니다"],
+    "사기": ["속여서 재물이나 재산상 이익을 얻은 사기죄 고소·피해", "중고거래에서 돈만 받고 물건을 보내지 않았어요"],
+    "교통사고": ["자동차 사고로 인한 인명·물적 피해와 교통사고처리특례법", "신호위반 차량과 충돌하여 다쳤습니다"],
+    "자동차손해배상": ["자동차 사고 피해자의 손해배상 청구와 자동차손해배상보장법", "사고 후 치료비와 휴업손해를 배상받고 싶어요"],
+    "보험합의": ["보험사와의 합의금, 보험금 지급 거절 및 과실비율 분쟁", "보험사가 제시한 합의금이 너무 적습니다"],
+    "이혼": ["협의이혼, 재판상 이혼 절차와 이혼 사유", "배우자와 성격 차이로 이혼하고 싶습니다"],
+    "상간소송": ["배우자의 부정행위 상대방(상간자)에 대한 위자료 청구 소송", "남편의 외도 상대에게 소송을 걸고 싶어요"],
+    "위자료": ["정신적 손해에 대한 배상금 청구", "이혼하면서 위자료를 얼마나 받을 수 있나요"],
+    "재산분할": ["이혼 시 부부 공동재산의 분할 청구", "결혼 중 모은 아파트와 예금을 나누는 문제"],
+    "양육권": ["이혼 후 자녀의 친권·양육권, 양육비, 면접교섭", "아이를 제가 키우고 양육비를 받고 싶습니다"],
+    "채무불이행": ["약정한 채무를 이행하지 않아 발생한 손해배상·이행 청구", "빌려준 돈을 약속한 날짜에 갚지 않습니다"],
+    "계약분쟁": ["계약의 해석, 해제·해지, 위약금을 둘러싼 분쟁", "공사 계약을 해지하자 위약금을 요구합니다"],
+    "소비자분쟁": ["사업자와 소비자 간 환불, 하자, 청약철회 분쟁", "헬스장 회원권 환불을 거부당했어요"],
+    "전세사기": ["임대인의 보증금 미반환, 깡통전세, 전세보증금 편취", "집주인이 전세보증금을 돌려주지 않고 연락이 끊겼어요"],
+    "파산·회생": ["채무자 파산과 회생 절차 전반, 면책", "빚을 감당할 수 없어 파산 신청을 고민 중입니다"],
+    "개인회생": ["일정 소득이 있는 개인 채무자의 변제계획에 따른 채무 조정 절차", "월급에서 일부를 갚고 나머지 빚을 탕감받고 싶어요"],
+    "채무조정": ["신용회복위원회 채무조정, 금융기관과의 상환 조건 조정", "카드빚 이자를 줄이고 분할 상환하고 싶습니다"],
+    "상속·유류분": ["상속 순위, 상속포기·한정승인, 유류분 반환 청구", "아버지가 형에게만 재산을 물려줘 유류분을 청구하려 합니다"],
+    "유언검인": ["자필 유언장 등 유언의 검인과 효력 다툼", "돌아가신 어머니의 자필 유언장이 발견됐어요"],
+    "상속재산분할": ["공동상속인 사이 상속재산의 분할 협의와 심판", "형제들과 부모님 집을 어떻게 나눌지 다투고 있습니다"],
+    "특허": ["발명 특허의 출원, 침해, 무효 분쟁", "경쟁사가 우리 특허 기술을 베낀 제품을 팔고 있어요"],
+    "상표": ["상표 등록, 상표권 침해, 유사 상표 분쟁", "우리 가게 이름과 비슷한 상표를 다른 업체가 씁니다"],
+    "저작권": ["저작물 무단 복제·배포, 저작권 침해와 손해배상", "제 사진을 허락 없이 블로그에 올렸습니다"],
+    "지적재산권": ["특허·상표·저작권·영업비밀 등 지식재산 전반의 보호", "퇴사한 직원이 영업비밀을 유출했어요"],
+    "부당해고": ["정당한 이유나 절차 없는 해고와 부당해고 구제신청", "회사에서 갑자기 구두로 해고를 통보받았습니다"],
+    "근로기준법 위반": ["임금체불, 퇴직금 미지급, 근로시간·휴가 위반", "회사가 석 달째 월급과 퇴직금을 주지 않습니다"],
+    "산업재해": ["업무상 재해, 산재보험 급여 신청, 중대재해", "작업 중 기계에 손을 다쳤는데 산재 처리가 안 됩니다"],
+    "노동법": ["근로관계, 노동조합, 직장 내 괴롭힘 등 노동 분쟁 전반", "상사의 괴롭힘으로 회사를 다니기 힘듭니다"],
+    "행정소송": ["행정청의 처분 취소, 영업정지, 인허가 거부에 대한 불복", "구청의 영업정지 처분을 취소하고 싶어요"],
+    "조세·세금": ["세무조사, 세금 부과 처분, 양도세·증여세 불복", "증여세가 과도하게 부과되어 이의를 제기하려 합니다"],
+    "병영법": ["군 복무 중 사건, 군형법, 병역 관련 분쟁", "군대에서 선임에게 가혹행위를 당했습니다"],
+    "공정거래": ["담합, 불공정거래, 하도급 갑질, 가맹사업 분쟁", "본사가 가맹점에 부당하게 물품 구매를 강요합니다"],
+    "의료사고": ["진료·수술 과실로 인한 피해와 의료분쟁 손해배상", "수술 후 후유증이 생겼는데 병원이 책임을 부인합니다"],
+    "식품·의약품": ["식품위생법, 약사법 위반과 식품·의약품 피해", "식당 음식을 먹고 식중독에 걸렸어요"],
+    "생명윤리": ["연명의료, 장기이식, 생명윤리법 관련 분쟁", "연명치료 중단 결정에 대해 가족 간 의견이 다릅니다"],
+    "개인정보보호": ["개인정보 유출, 무단 수집·이용, 사생활 침해", "회사가 제 개인정보를 동의 없이 제3자에게 넘겼습니다"],
+    "환경오염": ["소음·분진·악취, 수질·토양 오염 피해 배상", "공사장 소음과 먼지로 생활이 어렵습니다"],
+    "건설·부동산": ["부동산 매매, 임대차, 공사대금, 하자보수 분쟁", "아파트 하자를 건설사가 보수해 주지 않습니다"],
+    "소비자보호": ["소비자기본법, 약관 규제, 허위·과장 광고 피해", "광고와 다른 제품을 받아 피해를 봤습니다"],
+    "금융사기": ["보이스피싱, 투자사기, 대출사기 등 금융 범죄 피해", "검찰을 사칭한 전화에 속아 돈을 이체했습니다"],
+    "증권범죄": ["주가조작, 미공개정보 이용, 불공정 주식거래", "내부 정보를 이용한 주식 거래로 조사를 받고 있어요"],
+    "기업파산": ["법인의 파산·회생 절차와 채권 신고", "거래처 회사가 파산해 대금을 못 받게 됐습니다"],
+    "M&A": ["기업 인수합병, 지분 양수도 계약, 실사", "회사 지분을 인수하는 계약을 검토하고 있습니다"],
+    "기업법무": ["회사 설립, 주주총회·이사회, 계약 검토 등 기업 자문", "동업자와 회사 지분과 경영권 문제로 다툽니다"],
+}
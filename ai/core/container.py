@@ -1,82 +1,106 @@
 """
 의존성 주입 컨테이너
+
+서비스/모델/클라이언트 모듈은 `setup_default_dependencies()` 안에서 import 하고,
+모델과 LLM 클라이언트는 처음 조회될 때 생성합니다.
+(`core.container` import 만으로 torch, sentence-transformers, openai 가 로드되지 않도록)
 """
+import threading
 from typing import Dict, Type, TypeVar, Callable, Any, Optional
-from abc import ABC, abstractmethod
-
-from llm.models.embedding_model import EmbeddingModel
-from llm.models.cross_encoder_model import CrossEncoderModel
-from llm.models.model_loader import ModelLoader
-from services.search_service import SearchService
-from services.structuring_service import StructuringService
-from services.case_analysis_service import CaseAnalysisService
-from services.chat_service import ChatService
-from services.consultation_service import ConsultationService
-from llm.clients.openai_client import get_async_openai_client
-from llm.clients.langchain_client import Gpt4oMini
 
 T = TypeVar('T')
 
 
 class Container:
     """간단한 의존성 주입 컨테이너"""
-    
+
     def __init__(self):
         self._services: Dict[str, Any] = {}
         self._factories: Dict[str, Callable] = {}
         self._singletons: Dict[str, Any] = {}
-        
+        self._lazy_singletons: Dict[str, Callable] = {}
+        self._lock = threading.RLock()
+
     def register_singleton(self, interface: Type[T], instance: T) -> None:
         """싱글톤 인스턴스 등록"""
         key = interface.__name__
         self._singletons[key] = instance
-    
+
     def register_factory(self, interface: Type[T], factory: Callable[[], T]) -> None:
         """팩토리 함수 등록"""
         key = interface.__name__
         self._factories[key] = factory
-    
+
+    def register_lazy_singleton(self, interface: Type[T], factory: Callable[[], T]) -> None:
+        """최초 조회 시 factory로 생성하여 이후 재사용하는 싱글톤 등록"""
+        key = interface.__name__
+        self._lazy_singletons[key] = factory
+
     def get(self, interface: Type[T]) -> T:
         """의존성 조회"""
         key = interface.__name__
-        
+
         # 싱글톤 먼저 확인
         if key in self._singletons:
             return self._singletons[key]
-        
+
+        # 지연 싱글톤 확인 (최초 조회 시 생성)
+        if key in self._lazy_singletons:
+            with self._lock:
+                if key not in self._singletons:
+                    self._singletons[key] = self._lazy_singletons[key]()
+            return self._singletons[key]
+
         # 팩토리 확인
         if key in self._factories:
             instance = self._factories[key]()
             return instance
-        
+
         # 등록되지 않은 경우 기본 생성
         try:
             return interface()
         except TypeError as e:
             raise ValueError(f"Cannot create instance of {interface.__name__}: {e}")
-    
+
+    def is_initialized(self, interface: Type[T]) -> bool:
+        """싱글톤 인스턴스가 이미 생성되었는지 확인"""
+        return interface.__name__ in self._singletons
+
     def setup_default_dependencies(self):
         """기본 의존성들을 설정"""
-        # 모델들 (싱글톤)
-        embedding_model = ModelLoader.get_embedding_model()
-        cross_encoder_model = ModelLoader.get_cross_encoder_model()
-        
-        self.register_singleton(EmbeddingModel, embedding_model)
-        self.register_singleton(CrossEncoderModel, cross_encoder_model)
-        
+        from llm.models.embedding_model import EmbeddingModel
+        from llm.models.cross_encoder_model import CrossEncoderModel
+        from llm.models.model_loader import ModelLoader
+        from services.search_service import SearchService
+        from services.structuring_service import StructuringService
+        from services.case_analysis_service import CaseAnalysisService
+        from services.chat_service import ChatService
+        from services.chat_session_store import (
+            ChatSessionStore, InMemoryChatSessionStore, SQLiteChatSessionStore
+        )
+        from services.chat_summarizer import ChatHistorySummarizer
+        from services.consultation_service import ConsultationService
+        from services.tag_classifier import TagClassifier
+        from services.semantic_cache import SemanticAnalysisCache
+        from services.context_compressor import ContextCompressor
+        from config.settings import get_llm_settings
+        from config.settings import get_tag_classifier_settings, get_analysis_cache_settings, get_chat_settings
+        from core.metrics import register_metrics
+        from llm.clients.openai_client import get_async_openai_client
+        from llm.clients.langchain_client import Gpt4oMini
+        from llm.llm_response_parser import is_complete_analysis_output
+        from llm.structuring_parser import is_complete_structuring_output
+
+        # 모델들 (최초 조회 시 로드되는 싱글톤)
+        self.register_lazy_singleton(EmbeddingModel, ModelLoader.get_embedding_model)
+        self.register_lazy_singleton(CrossEncoderModel, ModelLoader.get_cross_encoder_model)
+
         # LLM 클라이언트들
         self.register_factory(
             Gpt4oMini,
             lambda: Gpt4oMini()
         )
-        
-        # OpenAI 클라이언트 (import 추가 필요)
-        from llm.clients.openai_client import get_async_openai_client
-        self.register_factory(
-            type(get_async_openai_client()),
-            get_async_openai_client
-        )
-        
+
         # 서비스들 (매번 새 인스턴스)
         self.register_factory(
             SearchService,
@@ -85,44 +109,125 @@ class Container:
                 self.get(CrossEncoderModel)
             )
         )
-        
+
         self.register_factory(
             StructuringService,
-            lambda: StructuringService(self.get(Gpt4oMini))
+            # 응답 캐시에는 파서가 복구 없이 읽을 수 있는 응답만 저장
+            lambda: StructuringService(Gpt4oMini(output_validator=is_complete_structuring_output))
         )
-        
+
+        analysis_cache_settings = get_analysis_cache_settings()
+
+        def create_semantic_cache() -> SemanticAnalysisCache:
+            cache = SemanticAnalysisCache(
+                threshold=analysis_cache_settings.threshold,
+                max_entries=analysis_cache_settings.max_entries,
+                ttl_seconds=analysis_cache_settings.ttl_seconds,
+            )
+            register_metrics("analysis_semantic_cache", cache.metrics)
+            return cache
+
+        self.register_lazy_singleton(SemanticAnalysisCache, create_semantic_cache)
+
+        llm_settings = get_llm_settings()
+        self.register_lazy_singleton(
+            ContextCompressor,
+            lambda: ContextCompressor(
+                self.get(CrossEncoderModel),
+                sentences_per_case=llm_settings.analysis_sentences_per_case,
+                batch_size=llm_settings.analysis_compression_batch_size,
+            )
+        )
+
         self.register_factory(
             CaseAnalysisService,
             lambda: CaseAnalysisService(
-                self.get(Gpt4oMini),
-                self.get(SearchService)
+                Gpt4oMini(output_validator=is_complete_analysis_output),
+                self.get(SearchService),
+                semantic_cache=self.get(SemanticAnalysisCache) if analysis_cache_settings.enabled else None,
+                context_compressor=(
+                    self.get(ContextCompressor) if llm_settings.analysis_compression_enabled else None
+                ),
             )
         )
-        
+
+        chat_settings = get_chat_settings()
+
+        def create_chat_session_store() -> ChatSessionStore:
+            options = dict(
+                max_history_tokens=llm_settings.max_history_tokens,
+                max_sessions=chat_settings.max_sessions,
+                ttl_seconds=chat_settings.session_ttl_seconds,
+                max_bytes=chat_settings.session_max_mb * 1024 * 1024,
+            )
+            if chat_settings.session_backend == "sqlite":
+                store = SQLiteChatSessionStore(chat_settings.session_path, **options)
+            else:
+                store = InMemoryChatSessionStore(**options)
+            register_metrics("chat_sessions", store.stats)
+            return store
+
+        self.register_lazy_singleton(ChatSessionStore, create_chat_session_store)
+
+        def create_chat_summarizer() -> ChatHistorySummarizer:
+            summarizer = ChatHistorySummarizer(
+                get_async_openai_client(),
+                self.get(ChatSessionStore),
+                threshold_tokens=chat_settings.summary_threshold_tokens,
+                keep_recent_turns=chat_settings.summary_keep_turns,
+                max_summary_tokens=chat_settings.summary_max_tokens,
+            )
+            register_metrics("chat_summarizer", summarizer.stats)
+            return summarizer
+
+        self.register_lazy_singleton(ChatHistorySummarizer, create_chat_summarizer)
+
         self.register_factory(
             ChatService,
-            lambda: ChatService(get_async_openai_client())
+            lambda: ChatService(
+                get_async_openai_client(),
+                session_store=self.get(ChatSessionStore),
+                summarizer=self.get(ChatHistorySummarizer) if chat_settings.summary_enabled else None,
+            )
         )
-        
+
+        tag_settings = get_tag_classifier_settings()
+        self.register_lazy_singleton(
+            TagClassifier,
+            lambda: TagClassifier(
+                self.get(EmbeddingModel),
+                threshold=tag_settings.threshold,
+                top_k=tag_settings.top_k,
+                min_confidence=tag_settings.min_confidence,
+            )
+        )
+
         self.register_factory(
             ConsultationService,
-            lambda: ConsultationService(get_async_openai_client())
+            lambda: ConsultationService(
+                get_async_openai_client(),
+                tag_classifier=self.get(TagClassifier) if tag_settings.enabled else None,
+            )
         )
 
 
 # 전역 컨테이너 인스턴스
 _container: Optional[Container] = None
+_container_lock = threading.Lock()
 
 
 def get_container() -> Container:
     """컨테이너 인스턴스 반환 (싱글톤)"""
     global _container
     if _container is None:
-        _container = Container()
-        _container.setup_default_dependencies()
+        with _container_lock:
+            if _container is None:
+                container = Container()
+                container.setup_default_dependencies()
+                _container = container
     return _container
 
 
 def inject(interface: Type[T]) -> T:
     """의존성 주입 헬퍼 함수"""
-    return get_container().get(interface)
\ No newline at end of file
+    return get_container().get(interface)
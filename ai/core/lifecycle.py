@@ -0,0 +1,104 @@
+"""
+애플리케이션 기동/종료 단계 관리
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupTimer:
+    """기동 단계별 소요 시간을 기록하고 요약 리포트를 출력하는 클래스"""
+
+    def __init__(self):
+        self._started_at = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """`with timer.phase("name"):` 블록의 소요 시간을 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.phases.append((name, duration_ms))
+            logger.info(f"[startup] {name} 완료 [{duration_ms:.0f}ms]")
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started_at) * 1000
+
+    def report(self) -> str:
+        """단계별 소요 시간 요약 문자열을 반환합니다."""
+        total_ms = self.total_ms
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = ["Startup phase report:"]
+        for name, duration_ms in self.phases:
+            ratio = duration_ms / total_ms * 100 if total_ms else 0.0
+            lines.append(f"  {name:<{width}}  {duration_ms:8.0f}ms  {ratio:5.1f}%")
+        lines.append(f"  {'total':<{width}}  {total_ms:8.0f}ms")
+        return "\n".join(lines)
+
+    def log_report(self):
+        logger.info(self.report())
+
+
+class ReadinessState:
+    """
+    로드밸런서 헬스체크용 준비 상태
+
+    - live: 프로세스가 요청을 받을 수 있는 상태 (기동 직후부터 True)
+    - ready: 모델 로드와 워밍업이 끝나 트래픽을 받아도 되는 상태
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = False
+        self.phase = "starting"
+        self.error: Optional[str] = None
+        self.details: Dict[str, Any] = {}
+
+    def set_phase(self, phase: str):
+        with self._lock:
+            self.phase = phase
+
+    def update(self, **details: Any):
+        with self._lock:
+            self.details.update(details)
+
+    def mark_ready(self):
+        with self._lock:
+            self.ready = True
+            self.phase = "ready"
+            self.error = None
+
+    def mark_failed(self, error: str):
+        with self._lock:
+            self.ready = False
+            self.phase = "failed"
+            self.error = error
+
+    def mark_not_ready(self, phase: str):
+        with self._lock:
+            self.ready = False
+            self.phase = phase
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {"ready": self.ready, "phase": self.phase, "details": dict(self.details)}
+            if self.error:
+                snapshot["error"] = self.error
+            return snapshot
+
+
+_readiness = ReadinessState()
+
+
+def get_readiness() -> ReadinessState:
+    """프로세스 전역 준비 상태를 반환합니다."""
+    return _readiness
@@ -0,0 +1,40 @@
+"""
+프로세스 내부 지표 수집
+
+각 컴포넌트가 `register_metrics(name, provider)`로 지표 함수를 등록하면
+`/health/metrics`에서 `collect_metrics()` 결과(JSON)를 워커 단위로 조회할 수 있습니다.
+"""
+import threading
+from typing import Any, Callable, Dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]):
+    """지표 함수를 등록합니다. 같은 이름으로 다시 등록하면 교체합니다."""
+    with _lock:
+        _providers[name] = provider
+
+
+def unregister_metrics(name: str):
+    with _lock:
+        _providers.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """등록된 지표를 모두 수집합니다. 실패한 지표는 오류 메시지로 대신합니다."""
+    with _lock:
+        providers = dict(_providers)
+    metrics: Dict[str, Any] = {}
+    for name, provider in sorted(providers.items()):
+        try:
+            metrics[name] = provider()
+        except Exception as e:
+            logger.warning(f"지표 수집 실패 ({name}): {e}")
+            metrics[name] = {"error": str(e)}
+    return metrics
@@ -0,0 +1,96 @@
+"""
+pre-fork 멀티 워커 서버 모드 지원
+
+gunicorn `preload_app` 모드에서 마스터 프로세스가 모델을 한 번만 로드하고
+워커를 fork 하여 모델 가중치를 copy-on-write로 공유합니다.
+
+fork 안전성
+- 마스터에서는 추론을 실행하지 않습니다. (torch/OpenMP 스레드 풀이 fork 이전에 생성되지 않도록)
+- DB 엔진/커넥션 풀과 OpenAI httpx 클라이언트는 각 모듈의 `os.register_at_fork` 훅이
+  자식 프로세스에서 참조를 버리고, 최초 사용 시 다시 생성합니다.
+- 워커별 torch/BLAS 스레드 수는 `configure_worker_threads()`로 fork 직후 설정합니다.
+"""
+import gc
+import os
+from typing import Dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+_SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_clean_mb",
+    "Shared_Dirty": "shared_dirty_mb",
+    "Private_Clean": "private_clean_mb",
+    "Private_Dirty": "private_dirty_mb",
+}
+
+
+def read_memory_stats() -> Dict[str, float]:
+    """
+    현재 프로세스의 RSS/PSS/공유 메모리 통계(MB)를 반환합니다.
+
+    Linux의 /proc/self/smaps_rollup을 사용하며, 지원하지 않는 환경에서는
+    resource 모듈의 최대 RSS만 반환합니다.
+    """
+    stats: Dict[str, float] = {}
+    try:
+        with open(_SMAPS_ROLLUP, "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in _SMAPS_FIELDS:
+                    stats[_SMAPS_FIELDS[key]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        import resource
+        # Linux는 KB, macOS는 byte 단위
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats["max_rss_mb"] = round(max_rss / 1024, 1)
+        return stats
+
+    shared = stats.get("shared_clean_mb", 0.0) + stats.get("shared_dirty_mb", 0.0)
+    stats["shared_mb"] = round(shared, 1)
+    if stats.get("rss_mb"):
+        stats["shared_ratio"] = round(shared / stats["rss_mb"], 3)
+    return stats
+
+
+def log_memory_stats(label: str) -> Dict[str, float]:
+    """메모리 통계를 pid와 함께 로깅하고 반환합니다."""
+    stats = read_memory_stats()
+    logger.info(f"[memory] {label} pid={os.getpid()} {stats}")
+    return stats
+
+
+def preload_models():
+    """
+    마스터 프로세스에서 모델을 로드하고 GC 추적 객체를 고정(freeze)합니다.
+
+    gc.freeze()로 이후 GC가 프리로드된 객체의 헤더를 건드리지 않게 하여
+    워커에서 불필요한 copy-on-write 페이지 복사를 줄입니다.
+    """
+    from core.container import get_container
+    from llm.models.embedding_model import EmbeddingModel
+    from llm.models.cross_encoder_model import CrossEncoderModel
+
+    container = get_container()
+    container.get(EmbeddingModel)
+    container.get(CrossEncoderModel)
+
+    gc.collect()
+    gc.freeze()
+    return log_memory_stats("master after preload")
+
+
+def configure_worker_threads():
+    """
+    fork 직후 워커의 torch/BLAS 스레드 수를 런타임 프로파일에 맞게 설정합니다.
+
+    기본값은 (CPU 코어 수 / 워커 수)로, 여러 워커가 같은 코어를 두고 경합하지 않도록 합니다.
+    (`config/settings.py`의 RuntimeSettings 참고)
+    """
+    from llm.models.runtime import configure_torch
+
+    configure_torch()
@@ -0,0 +1,81 @@
+"""
+동일 요청 병합 (single-flight)
+
+같은 입력으로 동시에 들어온 요청은 진행 중인 한 번의 계산 결과를 함께 기다립니다.
+- 키: 정규화(NFC, 연속 공백 축소)한 입력을 JSON으로 직렬화한 sha256 (`make_request_key`)
+- 계산은 별도 태스크에서 실행하므로 한 호출자가 취소되어도 다른 호출자의 결과에는 영향이 없으며,
+  기다리는 호출자가 모두 취소되면 계산도 취소합니다.
+- 계산에서 발생한 예외는 기다리던 모든 호출자에게 그대로 전달되며, 완료(성공/실패) 즉시 키를 비웁니다.
+  (결과를 캐시하지 않음)
+"""
+import asyncio
+import hashlib
+import json
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from core.metrics import register_metrics
+
+T = TypeVar("T")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(unicodedata.normalize("NFC", value).split())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+
+def make_request_key(*parts: Any) -> str:
+    payload = json.dumps(_normalize(list(parts)), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Call:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self._calls: Dict[str, _Call] = {}
+        register_metrics(f"single_flight_{name}", self.stats)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """key로 진행 중인 계산이 있으면 그 결과를, 없으면 fn()을 실행한 결과를 반환합니다."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # 이 호출자만 취소된 경우 — 남은 대기자가 없을 때만 계산을 취소
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced,
+                "cancelled": self.cancelled}
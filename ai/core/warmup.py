@@ -0,0 +1,110 @@
+"""
+기동 직후 모델/DB 워밍업
+
+첫 요청이 토크나이저 초기화, torch 커널 선택, 메모리 할당기 확장 비용을 떠안지 않도록
+실제 서비스에서 사용하는 입력 형태로 모델을 반복 호출하고,
+지연 시간의 중앙값(p50)이 안정될 때까지 워밍업을 진행합니다.
+"""
+import statistics
+import time
+from typing import Dict, List, Any
+
+from config.settings import WarmupSettings
+from llm.models.embedding_model import EmbeddingModel
+from llm.models.cross_encoder_model import CrossEncoderModel
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 검색 키워드(짧은 질의)와 사건 본문(긴 질의) 두 가지 길이로 워밍업합니다.
+_SAMPLE_QUERIES = [
+    "부동산 매매 계약 해지",
+    "얼마 전 새해 목표를 다짐하며 동료와 함께 헬스장에 등록했다. 운동복으로 갈아입고 샤워실을 찾다가, "
+    "문이 열린 채 여자 탈의실에 잘못 들어가고 말았다. 카운터 직원에게 실수를 솔직히 인정하고 사과 의사를 전했으나, "
+    "헬스장 측에서는 회원 등록 취소를 요청했고, 이후 상대방이 경찰에 신고했다는 이야기를 전해 들었다.",
+]
+
+# Cross-encoder 재정렬 대상(판례 요약) 예시
+_SAMPLE_DOCUMENTS = [
+    "부동산 매매 계약은 당사자 일방이 재산권을 상대방에게 이전할 것을 약정하고 상대방이 그 대금을 지급할 것을 약정함으로써 효력이 생긴다.",
+    "계약 해지는 당사자 일방의 의사표시로 가능하며, 해지 시에는 원상회복의 의무가 발생한다.",
+    "임대차 계약은 임대인이 임차인에게 목적물을 사용, 수익하게 하고 임차인이 이에 대한 차임을 지급할 것을 약정함으로써 성립한다.",
+    "성적 목적을 위한 다중이용장소 침입죄는 자기의 성적 욕망을 만족시킬 목적으로 공중화장실, 목욕장 등에 침입한 경우에 성립한다.",
+]
+
+
+def _rerank_batch(size: int) -> List[str]:
+    """요청한 배치 크기만큼 예시 문서를 반복하여 채웁니다."""
+    return [_SAMPLE_DOCUMENTS[i % len(_SAMPLE_DOCUMENTS)] for i in range(size)]
+
+
+def _is_steady(latencies_ms: List[float], window: int, tolerance: float) -> bool:
+    """최근 두 구간의 p50 변화율이 tolerance 이하이면 안정 상태로 판단합니다."""
+    if len(latencies_ms) < window * 2:
+        return False
+    previous = statistics.median(latencies_ms[-window * 2:-window])
+    current = statistics.median(latencies_ms[-window:])
+    if previous == 0:
+        return True
+    return abs(current - previous) / previous <= tolerance
+
+
+def warmup_models(
+    embedding_model: EmbeddingModel,
+    cross_encoder_model: CrossEncoderModel,
+    settings: WarmupSettings,
+) -> Dict[str, Any]:
+    """
+    임베딩/Cross-encoder 모델을 실제 배치 형태로 반복 호출하여 워밍업합니다.
+
+    한 번의 반복(iteration)은 질의 임베딩 + 설정된 배치 크기별 재정렬로 구성되며,
+    최소 반복 횟수를 채운 뒤 p50 지연이 안정되거나 최대 반복 횟수에 도달하면 종료합니다.
+
+    반환값
+    ----------
+    dict
+        반복 횟수, 안정 여부, 첫 반복/최종 p50 지연(ms) 등 워밍업 결과.
+    """
+    batch_sizes = settings.rerank_batch_sizes
+    latencies_ms: List[float] = []
+    steady = False
+
+    for iteration in range(settings.max_iterations):
+        start = time.perf_counter()
+        for query in _SAMPLE_QUERIES:
+            embedding_model.get_embedding(query)
+            for size in batch_sizes:
+                cross_encoder_model.get_cross_encoder_scores(query, _rerank_batch(size))
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if iteration + 1 >= settings.min_iterations and _is_steady(
+            latencies_ms, settings.window, settings.stability_tolerance
+        ):
+            steady = True
+            break
+
+    result = {
+        "iterations": len(latencies_ms),
+        "steady": steady,
+        "batch_sizes": batch_sizes,
+        "first_ms": round(latencies_ms[0], 1) if latencies_ms else None,
+        "p50_ms": round(statistics.median(latencies_ms[-settings.window:]), 1) if latencies_ms else None,
+    }
+    if steady:
+        logger.info(f"모델 워밍업 완료: {result}")
+    else:
+        logger.warning(f"모델 워밍업이 최대 반복 횟수 내에 안정되지 않았습니다: {result}")
+    return result
+
+
+def warmup_db_pool() -> Dict[str, Any]:
+    """DB 커넥션 풀을 열고 간단한 쿼리로 연결을 확인합니다."""
+    from db.database import pooled_connection
+
+    start = time.perf_counter()
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    duration_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"DB 커넥션 풀 워밍업 완료 [{duration_ms:.0f}ms]")
+    return {"connect_ms": round(duration_ms, 1)}
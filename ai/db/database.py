@@ -1,27 +1,50 @@
 
+import os
+import threading
+from contextlib import contextmanager
 import psycopg2
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base
 from typing import Generator
 
 from config.settings import get_database_settings
 from utils.logger import setup_logger, get_logger
 
-setup_logger()
 logger = get_logger(__name__)
 
 # 데이터베이스 설정 가져오기
 db_settings = get_database_settings()
 
-# SQLAlchemy 설정
-engine = create_engine(db_settings.url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQLAlchemy 설정 (엔진/세션 팩토리는 최초 사용 시 생성)
+_engine = None
+_session_local = None
+_connection_pool = None
+_engine_lock = threading.Lock()
 Base = declarative_base()
 
+
+def get_engine():
+    """SQLAlchemy 엔진을 반환합니다. (최초 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                _engine = create_engine(db_settings.url)
+    return _engine
+
+
+def get_session_local():
+    """SQLAlchemy 세션 팩토리를 반환합니다. (최초 호출 시 생성)"""
+    global _session_local
+    if _session_local is None:
+        from sqlalchemy.orm import sessionmaker
+        _session_local = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_local
+
+
 def get_db() -> Generator:
     """SQLAlchemy 세션을 반환하는 의존성 주입 함수"""
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         yield db
     finally:
@@ -33,16 +56,80 @@ def get_psycopg2_connection():
     """
     return psycopg2.connect(**db_settings.psycopg2_params)
 
+
+def get_connection_pool():
+    """psycopg2 커넥션 풀을 반환합니다. (최초 호출 시 생성)"""
+    global _connection_pool
+    if _connection_pool is None:
+        with _engine_lock:
+            if _connection_pool is None:
+                from psycopg2.pool import ThreadedConnectionPool
+                _connection_pool = ThreadedConnectionPool(
+                    db_settings.pool_min_size,
+                    db_settings.pool_max_size,
+                    **db_settings.psycopg2_params
+                )
+                logger.info(
+                    f"DB 커넥션 풀 생성 (min={db_settings.pool_min_size}, max={db_settings.pool_max_size})"
+                )
+    return _connection_pool
+
+
+@contextmanager
+def pooled_connection():
+    """
+    커넥션 풀에서 psycopg2 커넥션을 빌려 사용 후 반납합니다.
+    반납 전 열린 트랜잭션은 롤백하고, 끊어진 커넥션은 풀에서 제거합니다.
+    """
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def _reset_after_fork():
+    """
+    fork된 자식 프로세스에서 부모로부터 상속한 엔진/커넥션 풀을 버립니다.
+    부모와 소켓을 공유하므로 닫지 않고 참조만 끊은 뒤, 자식에서 최초 사용 시 새로 생성합니다.
+    """
+    global _engine, _session_local, _connection_pool, _engine_lock
+    if _engine is not None:
+        _engine.dispose(close=False)
+    _engine = None
+    _session_local = None
+    _connection_pool = None
+    _engine_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def close_connection_pool():
+    """커넥션 풀의 모든 커넥션을 닫습니다."""
+    global _connection_pool
+    with _engine_lock:
+        if _connection_pool is not None:
+            _connection_pool.closeall()
+            _connection_pool = None
+
 if __name__ == "__main__":
+    setup_logger()
     logger.debug(f"Database URL: {db_settings.url}")
     logger.info("Database engine created successfully.")
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             logger.info("Database connection successful.")
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
     try:
-        db = SessionLocal()
+        db = get_session_local()()
         logger.info("Session created successfully.")
         db.close()
     except Exception as e:
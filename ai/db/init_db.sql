@@ -27,3 +27,40 @@ CREATE TABLE IF NOT EXISTS legal_chunks (
     token_count  INT,
     UNIQUE (case_id, chunk_index, section)
 );
+
+-- 증분 인덱싱: 판례 내용 해시와 청크/모델 버전
+ALTER TABLE legal_cases ADD COLUMN IF NOT EXISTS content_hash  TEXT;
+ALTER TABLE legal_cases ADD COLUMN IF NOT EXISTS index_version TEXT;
+
+-- 인덱싱 실행(run)별로 확인된 판례 ID (삭제된 판례 정리 및 재개용)
+CREATE TABLE IF NOT EXISTS legal_index_run_cases (
+    run_id   TEXT NOT NULL,
+    case_id  TEXT NOT NULL,
+    PRIMARY KEY (run_id, case_id)
+);
+
+-- 인덱스 버전(blue/green): 검색은 legal_*_current 뷰를 통해 활성 버전 테이블을 조회
+CREATE TABLE IF NOT EXISTS legal_index_versions (
+    version       TEXT PRIMARY KEY,
+    status        TEXT NOT NULL,             -- building / active / retired / failed
+    index_version TEXT,
+    case_count    BIGINT,
+    chunk_count   BIGINT,
+    recall        DOUBLE PRECISION,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    activated_at  TIMESTAMPTZ
+);
+
+INSERT INTO legal_index_versions (version, status, activated_at)
+VALUES ('base', 'active', now())
+ON CONFLICT (version) DO NOTHING;
+
+DO $$
+BEGIN
+    IF to_regclass('legal_cases_current') IS NULL THEN
+        CREATE VIEW legal_cases_current AS SELECT * FROM legal_cases;
+    END IF;
+    IF to_regclass('legal_chunks_current') IS NULL THEN
+        CREATE VIEW legal_chunks_current AS SELECT * FROM legal_chunks;
+    END IF;
+END $$;
@@ -0,0 +1,54 @@
+"""
+gunicorn 설정 — pre-fork 멀티 워커 서버 모드
+
+마스터 프로세스에서 모델을 한 번 로드한 뒤 워커를 fork 하여
+모델 가중치를 copy-on-write로 공유합니다.
+
+실행:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+환경변수:
+    WEB_CONCURRENCY   워커 수 (기본값: 2)
+    API_HOST/API_PORT 바인드 주소 (기본값: 0.0.0.0:8000)
+    GUNICORN_TIMEOUT  워커 타임아웃 초 (기본값: 120)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+# 런타임 프로파일(RuntimeSettings)이 워커 수를 알 수 있도록 설정 로드 전에 환경변수로 전달
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# 앱/모델 모듈이 numpy/torch를 불러오기 전에 BLAS/토크나이저 스레드 수를 고정 (직접 지정한 값은 유지)
+from llm.models.runtime import apply_thread_env  # noqa: E402
+
+apply_thread_env()
+
+from core.prefork import preload_models, configure_worker_threads, log_memory_stats  # noqa: E402
+from utils.logger import setup_logger  # noqa: E402
+
+bind = f"{os.environ.get('API_HOST', '0.0.0.0')}:{os.environ.get('API_PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    """마스터: 앱 preload 이후, 워커 fork 이전에 모델을 로드합니다."""
+    setup_logger()
+    server.log.info("Preloading models in master process...")
+    preload_models()
+
+
+def post_fork(server, worker):
+    """워커: fork 직후 torch/BLAS 스레드 수를 설정합니다. (DB/OpenAI 클라이언트는 모듈 훅이 초기화)"""
+    configure_worker_threads()
+
+
+def post_worker_init(worker):
+    """워커: 초기화 직후 메모리 통계를 기록합니다. (앱 기동 완료 후 통계는 lifespan에서 기록)"""
+    log_memory_stats(f"worker {worker.age} after init")
@@ -1,2 +1,14 @@
-from .clients.langchain_client import Gpt4oMini
-from .clients.openai_client import call_gpt4o
+# langchain/openai 등 무거운 모듈은 실제로 접근할 때 import 합니다.
+# (`llm.models.*` 만 사용하는 경로에서 LLM 클라이언트가 함께 로드되지 않도록)
+_LAZY_ATTRS = {
+    "Gpt4oMini": ".clients.langchain_client",
+    "call_gpt4o": ".clients.openai_client",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,441 @@
+"""
+OpenAI(GMS) 호출용 httpx 클라이언트
+
+- 커넥션 풀 한도/keep-alive/HTTP/2/타임아웃을 LLMSettings로 설정합니다.
+  (HTTP/2는 h2 패키지가 설치된 경우에만 사용하며, 서버가 지원하지 않으면 ALPN으로 HTTP/1.1을 사용)
+- DNS 조회 결과를 TTL 동안 캐시합니다. TCP 연결만 캐시된 IP로 하고, TLS(SNI/인증서 검증)는 원래 호스트명을 사용합니다.
+- 풀 사용 지표: 사용 중/유휴 커넥션 수, 커넥션을 얻기까지 기다린 시간, 새 연결 수립 시간.
+  httpcore의 trace 확장으로 요청 시작부터 첫 연결/전송 이벤트까지를 풀 대기 시간으로 측정하며,
+  대기 시간이 길면 LLM 지연이 업스트림이 아니라 풀 한도(LLM_HTTP_MAX_CONNECTIONS) 때문임을 알 수 있습니다.
+- 동기/비동기 클라이언트 모두 프로세스 공용 LLM 제한기(llm.clients.rate_limiter)를 거쳐 요청합니다.
+  (동기 클라이언트는 제한기를 사용 중인 이벤트 루프가 있을 때만 제한되며, 동기 전용 프로세스에서는 제한하지 않음)
+"""
+import asyncio
+import socket
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import httpcore
+import httpx
+
+from config.settings import get_llm_settings
+from core.metrics import register_metrics
+from llm.clients.rate_limiter import LLMRateLimiter, estimate_request_tokens, get_llm_limiter, parse_retry_after
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 풀 대기 시간 백분위 계산에 사용할 최근 요청 수
+WAIT_SAMPLE_SIZE = 1000
+
+_POOL_EVENTS = ("connection.connect_tcp.started", "http11.send_request_headers.started",
+                "http2.send_request_headers.started")
+
+
+class DNSCache:
+    """getaddrinfo 결과를 ttl_seconds 동안 재사용합니다."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, port: int) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def set(self, host: str, port: int, infos) -> List[str]:
+        # 같은 주소가 프로토콜별로 중복되어 나오므로 순서를 유지하며 중복 제거
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self.ttl_seconds, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def _resolve_error(host: str, error: Exception) -> Exception:
+    if isinstance(error, TimeoutError):
+        return httpcore.ConnectTimeout(f"DNS lookup timed out: {host}")
+    return httpcore.ConnectError(f"DNS lookup failed: {host}: {error}")
+
+
+class CachingAsyncNetworkBackend(httpcore.AsyncNetworkBackend):
+    """DNS 캐시를 거쳐 IP로 TCP 연결하는 네트워크 백엔드 (나머지는 원래 백엔드에 위임)"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, dns_cache: DNSCache):
+        self._backend = backend
+        self._dns_cache = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        import anyio
+
+        addresses = self._dns_cache.get(host, port)
+        if addresses is None:
+            try:
+                with anyio.fail_after(timeout):
+                    infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except (OSError, TimeoutError) as e:
+                raise _resolve_error(host, e) from e
+            addresses = self._dns_cache.set(host, port, infos)
+        last_error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        # IP가 바뀌었을 수 있으므로 다음 연결은 다시 조회
+        self._dns_cache.invalidate(host, port)
+        raise last_error or httpcore.ConnectError(f"no address for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class CachingSyncNetworkBackend(httpcore.NetworkBackend):
+    """CachingAsyncNetworkBackend의 동기 버전"""
+
+    def __init__(self, backend: httpcore.NetworkBackend, dns_cache: DNSCache):
+        self._backend = backend
+        self._dns_cache = dns_cache
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = self._dns_cache.get(host, port)
+        if addresses is None:
+            try:
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError as e:
+                raise _resolve_error(host, e) from e
+            addresses = self._dns_cache.set(host, port, infos)
+        last_error = None
+        for address in addresses:
+            try:
+                return self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        self._dns_cache.invalidate(host, port)
+        raise last_error or httpcore.ConnectError(f"no address for {host}")
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float):
+        self._backend.sleep(seconds)
+
+
+class PoolMetrics:
+    """커넥션 풀 사용 지표 (요청 수, 풀 대기 시간, 연결 수립 시간)"""
+
+    def __init__(self, pool: Union[httpcore.AsyncConnectionPool, httpcore.ConnectionPool], limits: httpx.Limits,
+                 http2: bool, dns_cache: Optional[DNSCache]):
+        self._pool = pool
+        self.limits = limits
+        self.http2 = http2
+        self.dns_cache = dns_cache
+        self.requests = 0
+        self.in_flight = 0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+
+    def finish(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self._waits.append(seconds)
+
+    def record_connect(self, seconds: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        connections = list(self._pool.connections)
+        in_use = sum(1 for c in connections if not c.is_idle() and not c.is_closed())
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "http2": self.http2,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "connections": len(connections),
+                "connections_in_use": in_use,
+                "connections_idle": sum(1 for c in connections if c.is_idle()),
+                "requests": self.requests,
+                "requests_in_flight": self.in_flight,
+                # HTTP/1.1에서는 사용 중인 커넥션보다 진행 중인 요청이 많으면 그만큼 풀에서 대기 중
+                # (HTTP/2는 한 커넥션에 여러 요청을 다중화하므로 pool_wait_ms로 판단)
+                "requests_waiting": 0 if self.http2 else max(0, self.in_flight - in_use),
+                "connects": self.connects,
+                "connect_ms_avg": self.connect_seconds / self.connects * 1000 if self.connects else 0.0,
+            }
+        for q in (50, 90, 99):
+            stats[f"pool_wait_ms_p{q}"] = waits[min(len(waits) - 1, len(waits) * q // 100)] * 1000 if waits else 0.0
+        stats["pool_wait_ms_max"] = waits[-1] * 1000 if waits else 0.0
+        if self.dns_cache is not None:
+            stats["dns_cache"] = self.dns_cache.stats()
+        return stats
+
+
+class _Trace:
+    """
+    httpcore trace 이벤트로 풀 대기 시간과 새 연결 수립 시간을 기록합니다.
+    - 풀 대기: 요청 시작 → 새 연결 시작 또는 (재사용 커넥션에서) 요청 헤더 전송 시작
+    - 연결 수립: 새 연결 시작 → 요청 헤더 전송 시작 (TCP + TLS + HTTP/2 초기화)
+    """
+
+    def __init__(self, metrics: PoolMetrics):
+        self.metrics = metrics
+        self.started_at = time.perf_counter()
+        self.waited = False
+        self.connect_started_at: Optional[float] = None
+
+    def on_event(self, event_name: str):
+        now = time.perf_counter()
+        if not self.waited and event_name in _POOL_EVENTS:
+            self.waited = True
+            self.metrics.record_wait(now - self.started_at)
+        if event_name == "connection.connect_tcp.started":
+            self.connect_started_at = now
+        elif event_name.endswith(".send_request_headers.started") and self.connect_started_at is not None:
+            self.metrics.record_connect(now - self.connect_started_at)
+            self.connect_started_at = None
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]):
+        self.on_event(event_name)
+
+    def trace(self, event_name: str, info: Dict[str, Any]):
+        self.on_event(event_name)
+
+
+class _Once:
+    """여러 경로(본문 소진/취소/닫기/GC)에서 호출되어도 callback을 한 번만 실행합니다."""
+
+    def __init__(self, callback: Callable[[], None]):
+        self._callback = callback
+        self.done = False
+
+    def __call__(self):
+        if not self.done:
+            self.done = True
+            self._callback()
+
+
+def _finalize_on_loop(loop: asyncio.AbstractEventLoop, once: _Once):
+    # GC는 어느 스레드에서든 일어날 수 있으므로 제한기 상태 변경은 이벤트 루프에서 실행
+    if not once.done and not loop.is_closed():
+        loop.call_soon_threadsafe(once)
+
+
+class _TrackedAsyncStream(httpx.AsyncByteStream):
+    """
+    응답 본문 사용이 끝나면 on_close를 한 번 호출합니다.
+    닫기(aclose) 외에도 본문 반복이 끝나거나 취소(CancelledError/GeneratorExit)될 때 호출하며,
+    닫히지 않은 채 버려진 응답은 가비지 컬렉션 시점에 호출해 실행 권한이 새지 않도록 합니다.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = _Once(on_close)
+        weakref.finalize(self, _finalize_on_loop, asyncio.get_running_loop(), self._on_close)
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            self._on_close()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class _TrackedSyncStream(httpx.SyncByteStream):
+    """_TrackedAsyncStream의 동기 버전 (GC 시점의 on_close는 그 스레드에서 바로 호출)"""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = _Once(on_close)
+        weakref.finalize(self, self._on_close)
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self._on_close()
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    풀 지표를 수집하고, dns_cache가 주어지면 DNS 캐시를 거쳐 연결하는 transport.
+    limiter가 주어지면 요청마다 실행 권한을 얻은 뒤 보내고, 응답 본문을 닫을 때 반환합니다.
+    """
+
+    def __init__(self, *args, dns_cache: Optional[DNSCache] = None,
+                 limiter: Optional[LLMRateLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if dns_cache is not None:
+            # httpx는 네트워크 백엔드 지정 인자를 제공하지 않으므로 내부 httpcore 풀의 백엔드를 감쌉니다.
+            self._pool._network_backend = CachingAsyncNetworkBackend(self._pool._network_backend, dns_cache)
+        self.metrics = PoolMetrics(self._pool, kwargs.get("limits", httpx.Limits()), kwargs.get("http2", False),
+                                   dns_cache)
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        permit = None
+        if self.limiter is not None:
+            permit = await self.limiter.acquire(tokens=estimate_request_tokens(request.content))
+        trace = _Trace(self.metrics)
+        request.extensions = {**request.extensions, "trace": trace.atrace}
+        self.metrics.start()
+
+        def on_close():
+            self.metrics.finish()
+            if permit is not None:
+                permit.release()
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            on_close()
+            raise
+        if self.limiter is not None:
+            self.limiter.record_response(response.status_code, _retry_after(response.headers))
+        response.stream = _TrackedAsyncStream(response.stream, on_close)
+        return response
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """
+    InstrumentedAsyncTransport의 동기 버전.
+    limiter가 주어지면 limiter.acquire_blocking()으로 실행 권한을 기다린 뒤 보냅니다.
+    """
+
+    def __init__(self, *args, dns_cache: Optional[DNSCache] = None,
+                 limiter: Optional[LLMRateLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if dns_cache is not None:
+            self._pool._network_backend = CachingSyncNetworkBackend(self._pool._network_backend, dns_cache)
+        self.metrics = PoolMetrics(self._pool, kwargs.get("limits", httpx.Limits()), kwargs.get("http2", False),
+                                   dns_cache)
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        permit = None
+        if self.limiter is not None:
+            permit = self.limiter.acquire_blocking(tokens=estimate_request_tokens(request.content))
+        trace = _Trace(self.metrics)
+        request.extensions = {**request.extensions, "trace": trace.trace}
+        self.metrics.start()
+
+        def on_close():
+            self.metrics.finish()
+            if permit is not None:
+                permit.release()
+
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            on_close()
+            raise
+        if permit is not None:
+            permit.record_response(response.status_code, _retry_after(response.headers))
+        response.stream = _TrackedSyncStream(response.stream, on_close)
+        return response
+
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return parse_retry_after(headers.get("retry-after"))
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _transport_options() -> Dict[str, Any]:
+    settings = get_llm_settings()
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("h2 패키지가 없어 LLM 호출에 HTTP/1.1을 사용합니다. (pip install h2)")
+        http2 = False
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        "dns_cache": DNSCache(settings.http_dns_cache_ttl) if settings.http_dns_cache_ttl > 0 else None,
+    }
+
+
+def get_http_timeout() -> httpx.Timeout:
+    settings = get_llm_settings()
+    return httpx.Timeout(
+        settings.http_read_timeout,
+        connect=settings.http_connect_timeout,
+        write=settings.http_write_timeout,
+        pool=settings.http_pool_timeout,
+    )
+
+
+def build_async_http_client() -> httpx.AsyncClient:
+    """
+    설정을 적용한 비동기 httpx 클라이언트를 만들고 풀 지표를 llm_http_async로 등록합니다.
+    LLM 동시성/속도 제한기(활성화된 경우)를 transport에 연결하여 모든 비동기 LLM 호출이 거치도록 합니다.
+    """
+    transport = InstrumentedAsyncTransport(**_transport_options(), limiter=get_llm_limiter())
+    register_metrics("llm_http_async", transport.metrics.stats)
+    return httpx.AsyncClient(transport=transport, timeout=get_http_timeout(), follow_redirects=True)
+
+
+def build_sync_http_client() -> httpx.Client:
+    """
+    설정을 적용한 동기 httpx 클라이언트를 만들고 풀 지표를 llm_http_sync로 등록합니다.
+    비동기 클라이언트와 같은 LLM 제한기(활성화된 경우)를 transport에 연결합니다.
+    """
+    transport = InstrumentedTransport(**_transport_options(), limiter=get_llm_limiter())
+    register_metrics("llm_http_sync", transport.metrics.stats)
+    return httpx.Client(transport=transport, timeout=get_http_timeout(), follow_redirects=True)
@@ -1,10 +1,11 @@
-from typing import Any, List, Mapping, Optional
+from typing import Any, AsyncIterator, Callable, List, Mapping, Optional
 
-from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from langchain.llms.base import LLM
+from langchain_core.outputs import GenerationChunk
 
 # This relative import is correct for modules in the same directory
-from .openai_client import call_gpt4o
+from .openai_client import async_call_gpt4o, call_gpt4o
 
 
 class Gpt4oMini(LLM):
@@ -12,6 +13,8 @@ class Gpt4oMini(LLM):
 
     temperature: float = 0.0
     max_tokens: int = 2048
+    # 주어지면 이 검사를 통과한 응답만 LLM 응답 캐시에 저장 (파싱할 수 없는 응답이 재시도 때 재사용되지 않도록)
+    output_validator: Optional[Callable[[str], bool]] = None
 
     @property
     def _llm_type(self) -> str:
@@ -30,8 +33,55 @@ class Gpt4oMini(LLM):
             messages=messages,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
+            validate=self.output_validator,
         )
 
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        비동기 클라이언트로 GPT-4o-mini 모델을 호출합니다.
+        기본 구현(_call을 스레드에서 실행)과 달리 이벤트 루프를 막지 않고, 재시도 대기도 비동기로 수행됩니다.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        return await async_call_gpt4o(
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            validate=self.output_validator,
+        )
+
+    async def _astream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[GenerationChunk]:
+        """스트리밍 모드로 호출하여 생성되는 텍스트 조각을 차례로 반환합니다. (astream에서 사용, 끝나면 스트림을 닫음)"""
+        messages = [{"role": "user", "content": prompt}]
+        stream = await async_call_gpt4o(
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if run_manager:
+                    await run_manager.on_llm_new_token(delta)
+                yield GenerationChunk(text=delta)
+        finally:
+            # 소비자가 중간에 취소/종료해도(예: SSE 연결 끊김) 응답 스트림과 커넥션을 즉시 반환
+            await stream.close()
+
     @property
     def _identifying_params(self) -> Mapping[str, Any]:
         """모델의 식별 파라미터를 반환합니다."""
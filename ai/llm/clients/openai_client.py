@@ -1,117 +1,167 @@
-import sys
 import os
-from typing import Optional
-from openai import OpenAI, AsyncOpenAI
+import threading
+from typing import Callable, Optional, TYPE_CHECKING
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
 from config.settings import get_llm_settings
+from llm.clients.http_client import build_async_http_client, build_sync_http_client, get_http_timeout
+from llm.clients.response_cache import acached_completion, cached_completion
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from openai import OpenAI, AsyncOpenAI
+
 logger = get_logger(__name__)
 
-# --- 설정값 로드 --- #
-llm_settings = get_llm_settings()
+# --- 클라이언트 (최초 사용 시 생성) --- #
+_client: Optional["OpenAI"] = None
+_async_client: Optional["AsyncOpenAI"] = None
+_client_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """
+    fork된 자식 프로세스에서 부모의 httpx 커넥션 풀을 공유하지 않도록
+    클라이언트 참조를 버립니다. (자식에서 최초 사용 시 새로 생성)
+    """
+    global _client, _async_client, _client_lock
+    _client = None
+    _async_client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
 
-# --- 클라이언트 초기화 --- #
 def _validate_settings():
     """LLM 설정 검증"""
-    if not llm_settings.gms_key:
+    if not get_llm_settings().gms_key:
         raise ValueError(
             "GMS_KEY(또는 OPENAI_API_KEY)가 설정되지 않았습니다. "
             "프로젝트의 `config/.env` 파일에 GMS_KEY를 설정해주세요."
         )
 
-_validate_settings()
-
-# OpenAI 클라이언트 설정 준비
-client_kwargs = {
-    "api_key": llm_settings.gms_key,
-}
 
-# GMS 기본 URL이 있는 경우 추가 (선택사항)
-gms_base_url = os.getenv("GMS_BASE_URL")
-if gms_base_url:
-    client_kwargs["base_url"] = gms_base_url
-    logger.info(f"Using GMS base URL: {gms_base_url}")
-else:
-    logger.info("Using default OpenAI API endpoint")
+def _build_client_kwargs() -> dict:
+    """OpenAI 클라이언트 생성 인자를 준비합니다. (httpx 클라이언트는 호출 측에서 추가)"""
+    _validate_settings()
+    client_kwargs = {
+        "api_key": get_llm_settings().gms_key,
+        "timeout": get_http_timeout(),
+    }
 
-# 동기 클라이언트
-client = OpenAI(**client_kwargs)
+    # GMS 기본 URL이 있는 경우 추가 (선택사항)
+    gms_base_url = os.getenv("GMS_BASE_URL")
+    if gms_base_url:
+        client_kwargs["base_url"] = gms_base_url
+        logger.info(f"Using GMS base URL: {gms_base_url}")
+    else:
+        logger.info("Using default OpenAI API endpoint")
+    return client_kwargs
 
-# 비동기 클라이언트
-async_client = AsyncOpenAI(**client_kwargs)
 
 @retry(
-    wait=wait_random_exponential(min=1, max=60), 
+    wait=wait_random_exponential(min=1, max=60),
     stop=stop_after_attempt(3)  # llm_settings.max_retries
 )
 def call_gpt4o(
-    messages, 
-    temperature: float = 0.3, 
-    max_tokens: int = 2048, 
+    messages,
+    temperature: float = 0.3,
+    max_tokens: int = 2048,
     stream: bool = False,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    validate: Optional[Callable[[str], bool]] = None,
 ):
     """
     (동기) OpenAI API를 통해 GPT 모델을 호출하는 함수입니다.
+    스트리밍 호출은 응답 스트림을, 그 외에는 응답 텍스트(choices[0].message.content)를 반환합니다.
+    스트리밍이 아닌 호출은 LLM 응답 캐시(활성화된 경우)를 거치며, validate가 주어지면 통과한 응답만 저장합니다.
     """
     model_name = model or os.getenv("MODEL_NAME", "gpt-4o-mini")
-    
-    try:
+
+    def create():
         logger.debug(f"Calling OpenAI API with model: {model_name}")
-        response = client.chat.completions.create(
+        return get_sync_openai_client().chat.completions.create(
             model=model_name,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             stream=stream,
         )
+
+    try:
         if stream:
-            return response
-        else:
-            return response.choices[0].message.content
+            return create()
+        return cached_completion(
+            model_name, messages, {"temperature": temperature, "max_tokens": max_tokens},
+            lambda: create().choices[0].message.content, validate=validate,
+        )
     except Exception as e:
         logger.error(f"OpenAI API 동기 호출 중 오류 발생: {e}")
         raise
 
 @retry(
-    wait=wait_random_exponential(min=1, max=60), 
+    wait=wait_random_exponential(min=1, max=60),
     stop=stop_after_attempt(3)  # llm_settings.max_retries
 )
 async def async_call_gpt4o(
-    messages, 
-    temperature: float = 0.3, 
-    max_tokens: int = 2048, 
+    messages,
+    temperature: float = 0.3,
+    max_tokens: int = 2048,
     stream: bool = False,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    validate: Optional[Callable[[str], bool]] = None,
 ):
     """
     (비동기) OpenAI API를 통해 GPT 모델을 호출하는 함수입니다.
-    스트리밍 호출을 지원합니다.
+    call_gpt4o와 같이 스트리밍 호출은 응답 스트림을, 그 외에는 응답 텍스트(choices[0].message.content)를 반환합니다.
+    (캐시에는 텍스트만 저장되므로 응답 객체가 아닌 텍스트를 반환합니다.)
+    스트리밍이 아닌 호출은 LLM 응답 캐시(활성화된 경우)를 거치며, validate가 주어지면 통과한 응답만 저장합니다.
     """
     model_name = model or os.getenv("MODEL_NAME", "gpt-4o-mini")
-    
-    try:
+
+    async def create():
         logger.debug(f"Calling OpenAI API (async) with model: {model_name}")
-        response = await async_client.chat.completions.create(
+        return await get_async_openai_client().chat.completions.create(
             model=model_name,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             stream=stream,
         )
-        return response
+
+    async def fetch_content():
+        return (await create()).choices[0].message.content
+
+    try:
+        if stream:
+            return await create()
+        return await acached_completion(
+            model_name, messages, {"temperature": temperature, "max_tokens": max_tokens}, fetch_content,
+            validate=validate,
+        )
     except Exception as e:
         logger.error(f"OpenAI API 비동기 호출 중 오류 발생: {e}")
         raise
 
 
-def get_async_openai_client() -> AsyncOpenAI:
-    """비동기 OpenAI 클라이언트를 반환합니다."""
-    return async_client
+def get_async_openai_client() -> "AsyncOpenAI":
+    """비동기 OpenAI 클라이언트를 반환합니다. (최초 호출 시 생성)"""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                from openai import AsyncOpenAI
+                _async_client = AsyncOpenAI(**_build_client_kwargs(), http_client=build_async_http_client())
+    return _async_client
 
 
-def get_sync_openai_client() -> OpenAI:
-    """동기 OpenAI 클라이언트를 반환합니다."""
-    return client
+def get_sync_openai_client() -> "OpenAI":
+    """동기 OpenAI 클라이언트를 반환합니다. (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(**_build_client_kwargs(), http_client=build_sync_http_client())
+    return _client
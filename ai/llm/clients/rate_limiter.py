@@ -0,0 +1,349 @@
+"""
+LLM 호출 프로세스 공용 동시성/속도 제한기
+
+OpenAI 클라이언트의 transport(llm.clients.http_client)에서 모든 LLM 요청이 이 제한기를 거칩니다.
+- 동시 요청 수 상한 (max_concurrency)
+- 요청 수/토큰 수 토큰 버킷 (분당 한도, 요청 토큰은 프롬프트 추정치 + max_tokens)
+- 엔드포인트별 대기열을 번갈아 처리하는 공정 대기 (한 API의 폭주가 다른 API를 막지 않도록)
+- 429 응답을 받으면 Retry-After(없으면 기본 대기) 동안 새 요청을 보내지 않고 동시성 상한을 절반으로 줄이며,
+  이후 성공이 recovery_successes번 이어질 때마다 상한을 1씩 되돌립니다. (AIMD)
+
+엔드포인트는 `with llm_endpoint("/api/analysis"):` 블록(API에서는 미들웨어)의 값을 사용합니다.
+
+제한기 상태는 이를 사용하는 이벤트 루프에서만 바뀝니다. 동기 클라이언트(다른 스레드)는 acquire_blocking()으로
+그 루프에 권한을 요청하며, 이벤트 루프 없이 동기 호출만 하는 프로세스(스크립트 등)에서는 제한하지 않습니다.
+"""
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+from config.settings import get_llm_settings
+from core.metrics import register_metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ENDPOINT = "default"
+# Retry-After 헤더가 없는 429 응답 후 새 요청을 멈추는 시간(초)
+DEFAULT_THROTTLE_SECONDS = 1.0
+MAX_THROTTLE_SECONDS = 60.0
+# 대기 시간 백분위 계산에 사용할 최근 요청 수
+WAIT_SAMPLE_SIZE = 1000
+
+_endpoint: ContextVar[str] = ContextVar("llm_endpoint", default=DEFAULT_ENDPOINT)
+
+_limiter: Optional["LLMRateLimiter"] = None
+_limiter_lock = threading.Lock()
+
+
+@contextmanager
+def llm_endpoint(name: str):
+    """블록 안의 LLM 호출을 name 엔드포인트 대기열로 집계합니다. (현재 요청/태스크에만 적용)"""
+    token = _endpoint.set(name)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def current_endpoint() -> str:
+    return _endpoint.get()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After(초) 또는 OpenAI 호환 retry-after-ms 값을 초 단위로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def estimate_request_tokens(body: bytes, tokenizer=None) -> int:
+    """
+    chat.completions 요청 본문에서 프롬프트 토큰 추정치 + 최대 출력 토큰 수를 계산합니다.
+    모든 요청마다 이벤트 루프에서 실행되므로 기본값은 토크나이저 대신 UTF-8 바이트 수 / 4로 추정합니다.
+    (ASCII 4자, 한글 약 1.3자를 한 토큰으로 보아 실제보다 약간 많게 추정)
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return 0
+    if not isinstance(payload, dict):
+        return 0
+    text = "".join(
+        m.get("content") if isinstance(m.get("content"), str) else json.dumps(m.get("content"), ensure_ascii=False)
+        for m in payload.get("messages") or [] if isinstance(m, dict)
+    )
+    prompt_tokens = tokenizer.count(text) if tokenizer is not None else math.ceil(len(text.encode("utf-8")) / 4)
+    max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens") or 0
+    return prompt_tokens + int(max_tokens)
+
+
+class TokenBucket:
+    """분당 rate만큼 채워지는 토큰 버킷 (용량 = 1분치). rate가 0 이하면 제한하지 않습니다."""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간(초). 용량보다 큰 요청은 가득 찼을 때 허용합니다."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.tokens >= needed else (needed - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+
+@dataclass
+class _Waiter:
+    endpoint: str
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class Permit:
+    """
+    획득한 실행 권한. release()는 여러 번 호출해도 한 번만 반영됩니다.
+    loop가 주어지면(acquire_blocking) 제한기 상태 변경을 그 이벤트 루프에서 실행하므로 어느 스레드에서든 호출할 수 있습니다.
+    """
+
+    def __init__(self, limiter: "LLMRateLimiter", loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._limiter = limiter
+        self._loop = loop
+        self._released = False
+
+    def _call(self, fn, *args):
+        if self._loop is None:
+            fn(*args)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(fn, *args)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._call(self._limiter._release)
+
+    def record_response(self, status_code: int, retry_after: Optional[float] = None):
+        """이 권한으로 보낸 요청의 응답을 제한기에 반영합니다. (LLMRateLimiter.record_response)"""
+        self._call(self._limiter.record_response, status_code, retry_after)
+
+
+class LLMRateLimiter:
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        min_concurrency: int = 1,
+        recovery_successes: int = 20,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.recovery_successes = recovery_successes
+        self.limit = max_concurrency
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.active = 0
+        self.throttled = 0
+        self.completed = 0
+        self._successes = 0
+        self._blocked_until = 0.0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # --- 획득/반환 --- #
+
+    async def acquire(self, endpoint: Optional[str] = None, tokens: int = 0) -> Permit:
+        """실행 순서가 올 때까지 기다린 뒤 Permit을 반환합니다. 사용 후 반드시 release()"""
+        loop = self._loop = asyncio.get_running_loop()
+        waiter = _Waiter(endpoint or current_endpoint(), tokens, loop.create_future())
+        self._queues.setdefault(waiter.endpoint, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 권한을 받은 직후 취소된 경우 (실행하지 않았으므로 completed에 세지 않음)
+                self.active -= 1
+                self._dispatch()
+            else:
+                self._remove(waiter)
+            raise
+        return Permit(self)
+
+    def acquire_blocking(self, endpoint: Optional[str] = None, tokens: int = 0) -> Optional[Permit]:
+        """
+        동기 호출용 acquire. 제한기를 사용 중인 이벤트 루프에 권한을 요청하고 받을 때까지 현재 스레드를 블로킹합니다.
+        그런 루프가 없거나(동기 전용 프로세스) 그 루프의 스레드에서 호출되면(교착 방지) 제한 없이 None을 반환합니다.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return None
+        try:
+            if asyncio.get_running_loop() is loop:
+                return None
+        except RuntimeError:
+            pass
+        future = asyncio.run_coroutine_threadsafe(self.acquire(endpoint or current_endpoint(), tokens), loop)
+        try:
+            future.result()
+        except BaseException:
+            future.cancel()
+            raise
+        return Permit(self, loop)
+
+    def _remove(self, waiter: _Waiter):
+        queue = self._queues.get(waiter.endpoint)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.endpoint]
+        self._dispatch()
+
+    def _release(self):
+        self.active -= 1
+        self.completed += 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        실행 가능한 대기 요청을 엔드포인트 순서대로 하나씩 깨웁니다.
+        맨 앞 요청이 토큰 버킷을 기다려야 하는 엔드포인트는 건너뛰어 다른 엔드포인트를 막지 않으며,
+        실행 가능한 요청이 없으면 가장 빨리 가능해지는 시점에 타이머를 예약합니다.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queues and self.active < self.limit:
+            now = time.monotonic()
+            ready, delay = self._next_ready(now)
+            if ready is None:
+                if delay is not None:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            endpoint, queue = ready
+            waiter = queue.popleft()
+            self.request_bucket.take(1)
+            self.token_bucket.take(waiter.tokens)
+            # 처리한 엔드포인트는 맨 뒤로 보내 다른 엔드포인트와 번갈아 처리 (라운드 로빈)
+            del self._queues[endpoint]
+            if queue:
+                self._queues[endpoint] = queue
+            self.active += 1
+            self._waits.append(now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _next_ready(self, now: float):
+        """((엔드포인트, 대기열), None) 또는 실행 가능한 요청이 없으면 (None, 가장 짧은 대기 시간)"""
+        # 요청 수 버킷/429 대기는 모든 엔드포인트에 공통
+        shared_delay = max(self._blocked_until - now, self.request_bucket.wait_time(1, now))
+        min_delay: Optional[float] = None
+        for endpoint, queue in list(self._queues.items()):
+            while queue and queue[0].future.done():  # 취소된 대기
+                queue.popleft()
+            if not queue:
+                del self._queues[endpoint]
+                continue
+            delay = max(shared_delay, self.token_bucket.wait_time(queue[0].tokens, now))
+            if delay <= 0:
+                return (endpoint, queue), None
+            min_delay = delay if min_delay is None else min(min_delay, delay)
+            if shared_delay > 0:
+                break
+        return None, min_delay
+
+    # --- 업스트림 응답에 따른 조정 --- #
+
+    def record_response(self, status_code: int, retry_after: Optional[float] = None):
+        """429면 Retry-After 동안 멈추고 동시성 상한을 절반으로, 성공이 이어지면 1씩 회복합니다."""
+        if status_code == 429:
+            self.throttled += 1
+            self._successes = 0
+            pause = min(MAX_THROTTLE_SECONDS, retry_after if retry_after is not None else DEFAULT_THROTTLE_SECONDS)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            previous, self.limit = self.limit, max(self.min_concurrency, self.limit // 2)
+            logger.warning(f"LLM 429 응답: {pause:.1f}초 대기, 동시성 상한 {previous} → {self.limit}")
+        elif status_code < 400:
+            self._successes += 1
+            if self.limit < self.max_concurrency and self._successes >= self.recovery_successes:
+                self._successes = 0
+                self.limit += 1
+                self._dispatch()
+
+    # --- 지표 --- #
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        stats: Dict[str, Any] = {
+            "limit": self.limit,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "queue_depth": sum(len(q) for q in self._queues.values()),
+            "queue_by_endpoint": {endpoint: len(q) for endpoint, q in self._queues.items()},
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "blocked_seconds": max(0.0, self._blocked_until - time.monotonic()),
+        }
+        for q in (50, 90, 99):
+            stats[f"wait_ms_p{q}"] = waits[min(len(waits) - 1, len(waits) * q // 100)] * 1000 if waits else 0.0
+        stats["wait_ms_max"] = waits[-1] * 1000 if waits else 0.0
+        if not self.request_bucket.unlimited:
+            stats["request_bucket"] = round(self.request_bucket.tokens, 1)
+        if not self.token_bucket.unlimited:
+            stats["token_bucket"] = round(self.token_bucket.tokens, 1)
+        return stats
+
+
+def get_llm_limiter() -> Optional[LLMRateLimiter]:
+    """설정에서 활성화된 경우 프로세스 공용 제한기를 반환합니다. (최초 호출 시 생성)"""
+    global _limiter
+    settings = get_llm_settings()
+    if not settings.limiter_enabled:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = LLMRateLimiter(
+                    max_concurrency=settings.limiter_max_concurrency,
+                    requests_per_minute=settings.limiter_requests_per_minute,
+                    tokens_per_minute=settings.limiter_tokens_per_minute,
+                )
+                register_metrics("llm_limiter", _limiter.stats)
+    return _limiter
+
+
+def _reset_after_fork():
+    global _limiter, _limiter_lock
+    _limiter = None
+    _limiter_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,228 @@
+"""
+LLM 응답 디스크 캐시 (SQLite)
+
+같은 모델/메시지/파라미터로 다시 호출하면 네트워크 없이 저장된 응답을 반환합니다.
+- 키: sha256(모델, 메시지, 파라미터를 정렬된 JSON으로 직렬화)
+- TTL이 지난 항목은 조회하지 않으며, 전체 크기가 max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제합니다.
+- 요청 단위 우회: `with bypass_llm_cache(): ...` 안의 호출은 캐시를 읽지도 쓰지도 않습니다.
+  (API에서는 `Cache-Control: no-cache` 또는 `X-LLM-Cache: bypass` 헤더로 우회)
+
+여러 워커 프로세스가 같은 파일을 공유할 수 있도록 WAL 모드를 사용하며,
+fork된 자식 프로세스는 부모의 연결을 버리고 새로 엽니다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.settings import get_llm_settings
+from core.metrics import register_metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+_cache: Optional["LLMResponseCache"] = None
+_cache_lock = threading.Lock()
+
+
+@contextmanager
+def bypass_llm_cache(enabled: bool = True):
+    """블록 안의 LLM 호출이 캐시를 사용하지 않도록 합니다. (현재 요청/태스크에만 적용)"""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_cache_bypassed() -> bool:
+    """현재 요청이 캐시 우회를 요청했는지 여부 (다른 캐시 계층도 같은 플래그를 따릅니다)"""
+    return _bypass.get()
+
+
+def make_cache_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int, evict_interval: int = 100):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key         TEXT PRIMARY KEY,
+                model       TEXT NOT NULL,
+                response    TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at)")
+        self.evict()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now)
+            )
+            self._writes += 1
+            due = self._writes % self.evict_interval == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """만료된 항목을 지우고, 전체 크기가 max_bytes 이하가 될 때까지 오래 사용하지 않은 항목을 삭제합니다."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            if total > self.max_bytes:
+                # 오래 사용하지 않은 순으로, 앞선 항목들의 누적 크기가 초과분에 못 미치는 항목까지 삭제
+                removed += self._conn.execute("""
+                    DELETE FROM llm_responses WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY accessed_at, key) - size AS freed_before
+                            FROM llm_responses
+                        ) WHERE freed_before < ?
+                    )
+                """, (total - self.max_bytes,)).rowcount
+        if removed:
+            logger.debug(f"LLM 응답 캐시 {removed}건 삭제")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """설정에서 활성화된 경우 프로세스 공용 캐시를 반환합니다. (최초 호출 시 생성)"""
+    global _cache
+    settings = get_llm_settings()
+    if not settings.response_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(
+                    settings.response_cache_path,
+                    ttl_seconds=settings.response_cache_ttl_seconds,
+                    max_bytes=settings.response_cache_max_mb * 1024 * 1024,
+                )
+                register_metrics("llm_response_cache", _cache.stats)
+                logger.info(f"LLM 응답 캐시 사용: {settings.response_cache_path}")
+    return _cache
+
+
+def _reset_after_fork():
+    global _cache, _cache_lock
+    _cache = None
+    _cache_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _active_cache() -> Optional[LLMResponseCache]:
+    return None if is_cache_bypassed() else get_llm_cache()
+
+
+def _should_store(response: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    return bool(response) and (validate is None or validate(response))
+
+
+def cached_completion(
+    model: str,
+    messages: Any,
+    params: Dict[str, Any],
+    fetch: Callable[[], str],
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    캐시에 있으면 저장된 응답을, 없으면 fetch() 결과를 저장하고 반환합니다.
+    validate가 주어지면 통과한 응답만 저장합니다. (파싱할 수 없는 응답이 캐시에 남지 않도록)
+    """
+    cache = _active_cache()
+    if cache is None:
+        return fetch()
+    key = make_cache_key(model, messages, params)
+    response = cache.get(key)
+    if response is not None:
+        return response
+    response = fetch()
+    if _should_store(response, validate):
+        cache.set(key, model, response)
+    return response
+
+
+async def acached_completion(
+    model: str,
+    messages: Any,
+    params: Dict[str, Any],
+    fetch: Callable[[], Awaitable[str]],
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    cached_completion의 비동기 버전
+    SQLite 조회/저장(주기적인 정리 포함)은 다른 워커와의 잠금 대기로 이벤트 루프를 막지 않도록 워커 스레드에서 실행합니다.
+    """
+    cache = _active_cache()
+    if cache is None:
+        return await fetch()
+    key = make_cache_key(model, messages, params)
+    response = await asyncio.to_thread(cache.get, key)
+    if response is not None:
+        return response
+    response = await fetch()
+    if _should_store(response, validate):
+        await asyncio.to_thread(cache.set, key, model, response)
+    return response
@@ -1,6 +1,6 @@
 import re
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Tuple
 from langchain.schema import BaseOutputParser
 # from pydantic import BaseModel, Field # CaseAnalysisResult 이동으로 더 이상 필요 없음
 
@@ -25,6 +25,72 @@ class CotOutputParser(BaseOutputParser):
         return {"thought_process": thought, "conclusion": conclusion}
 
 
+class IncrementalAnalysisParser:
+    """
+    스트리밍되는 분석 출력(JSON)에서 값이 완성된 필드를 바로 꺼냅니다.
+    출력 예시의 키 순서대로, 다음 키의 값이 끝까지 도착했을 때만 JSON으로 디코딩하고 위치를 앞으로 옮기므로
+    조각마다 전체를 다시 파싱하지 않습니다. 반환하는 이름은 CaseAnalysisResult의 필드명입니다.
+    """
+    FIELDS = [
+        (re.compile(rf'"{key}"\s*:\s*'), name) for key, name in [
+            ("issues", "issues"),
+            ("opinion", "opinion"),
+            ("sentencePrediction", "expected_sentence"),
+            ("confidence", "confidence"),
+            ("references", "references"),
+            ("tags", "tags"),
+        ]
+    ]
+    _DELIMITER = re.compile(r"\s*[,}\]]")
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._next = 0
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 출력"""
+        if self._chunks:
+            self._buffer += "".join(self._chunks)
+            self._chunks = []
+        return self._buffer
+
+    def feed(self, chunk: str) -> Iterator[Tuple[str, Any]]:
+        """출력 조각을 추가하고 새로 완성된 (필드명, 값)을 반환합니다."""
+        self._chunks.append(chunk)
+        buffer = self.text
+        while self._next < len(self.FIELDS):
+            pattern, name = self.FIELDS[self._next]
+            match = pattern.search(buffer, self._pos)
+            if match is None:
+                return
+            try:
+                value, end = self._decoder.raw_decode(buffer, match.end())
+            except json.JSONDecodeError:
+                return
+            # 숫자는 뒤에 자릿수가 더 올 수 있으므로("0" → "0.84") 다음 구분자가 도착한 뒤에 확정
+            delimiter = self._DELIMITER.match(buffer, end)
+            if delimiter is None:
+                return
+            self._pos = end
+            self._next += 1
+            yield name, value
+
+
+def is_complete_analysis_output(raw: str) -> bool:
+    """
+    LLM 응답 캐시에 저장해도 되는 완결된 분석 출력인지 확인합니다.
+    JSON이 끝까지 파싱되고 소견이 있어야 하며, 잘리거나 깨진 응답은 저장하지 않아 재시도 때 다시 생성되게 합니다.
+    """
+    try:
+        return bool(parse_case_analysis_output(CotOutputParser().parse(raw)["conclusion"]).opinion)
+    except Exception:
+        return False
+
+
 def parse_case_analysis_output(raw: str) -> CaseAnalysisResult:
     raw = raw.strip()
 
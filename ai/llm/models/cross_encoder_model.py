@@ -1,6 +1,6 @@
-from sentence_transformers import CrossEncoder
 from functools import lru_cache
 import os
+from llm.models.runtime import configure_torch, inference_context, maybe_compile
 from utils.logger import setup_logger, get_logger
 
 logger = get_logger(__name__)
@@ -13,20 +13,25 @@ class CrossEncoderModel:
 
     def _load_model(self):
         if self._model is None:
+            from sentence_transformers import CrossEncoder
+
+            configure_torch()
             logger.info(f"Cross-encoder 모델 로드 중: {self.model_name}")
             self._model = CrossEncoder(
                 model_name_or_path=self.model_name,
                 device=os.getenv("DEVICE", "cuda" if os.environ.get("CUDA_VISIBLE_DEVICES") else "cpu"),
                 trust_remote_code=True
             )
+            self._model.model = maybe_compile(self._model.model)
             logger.info("Cross-encoder 모델 로드 완료.")
 
-    def get_cross_encoder_scores(self, query: str, documents: list[str]) -> list[float]:
+    def get_cross_encoder_scores(self, query: str, documents: list[str], batch_size: int = 32) -> list[float]:
         if not documents:
             return []
 
         sentence_pairs = [[query, doc] for doc in documents]
-        scores = self._model.predict(sentence_pairs).tolist()
+        with inference_context():
+            scores = self._model.predict(sentence_pairs, batch_size=batch_size, show_progress_bar=False).tolist()
         return scores
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
-from typing import List
-import torch
+from typing import List, TYPE_CHECKING
+from llm.models.runtime import configure_torch, inference_context, maybe_compile
 from utils.logger import setup_logger, get_logger
-from sentence_transformers import SentenceTransformer
 
-setup_logger()
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = get_logger(__name__)
 
 class EmbeddingModel:
@@ -14,16 +15,31 @@ class EmbeddingModel:
 
     def _load_model(self):
         if self._model is None:
+            # torch/sentence-transformers는 모델을 실제로 로드할 때 import 합니다.
+            from sentence_transformers import SentenceTransformer
+
+            configure_torch()
             logger.info(f"SentenceTransformer 모델 로드 중: {self.model_name} (device=cpu)")
             self._model = SentenceTransformer(self.model_name, device="cpu")
+            transformer = self._model[0]
+            transformer.auto_model = maybe_compile(transformer.auto_model)
             logger.info("SentenceTransformer 모델 로드 완료.")
 
     def get_embedding(self, text: str) -> List[float]:
         logger.debug(f"텍스트 인코딩 시도: 타입={type(text)}, 값 일부={text[:100]}...")
-        embedding = self._model.encode(text, batch_size=1, convert_to_numpy=True)
+        with inference_context():
+            embedding = self._model.encode(text, batch_size=1, convert_to_numpy=True)
         return embedding.tolist()
 
+    def encode_batch(self, texts: List[str], batch_size: int = 32) -> "np.ndarray":
+        """여러 텍스트를 한 번에 인코딩하여 (len(texts), dim) 크기의 numpy 배열로 반환합니다."""
+        with inference_context():
+            return self._model.encode(
+                texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+            )
+
 if __name__ == '__main__':
+    setup_logger()
     logger.info("EmbeddingModel 간단 테스트 실행 중...")
     model_instance = EmbeddingModel()
     logger.info(f"로드된 모델: {model_instance.model_name}")
@@ -0,0 +1,91 @@
+"""
+CPU 추론 런타임 프로파일
+
+여러 워커가 한 호스트에서 실행될 때 torch intra/inter-op 스레드, 토크나이저 병렬화,
+BLAS(OpenMP/MKL/OpenBLAS) 스레드가 코어를 과다 점유하지 않도록 워커 단위로 설정합니다.
+"""
+import os
+from contextlib import contextmanager, ExitStack
+from functools import lru_cache
+from typing import Optional
+
+from config.settings import RuntimeSettings, get_runtime_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_BLAS_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def apply_thread_env(settings: Optional[RuntimeSettings] = None, override: bool = False):
+    """
+    BLAS/토크나이저 스레드 환경변수를 설정합니다.
+    torch/numpy가 import 되기 전에 호출해야 효과가 있습니다.
+    운영자가 직접 지정한 값은 유지하며, override=True일 때만 덮어씁니다. (벤치마크 등)
+    """
+    settings = settings or get_runtime_settings()
+    values = {name: str(settings.resolved_blas_threads) for name in _BLAS_ENV_VARS}
+    values["TOKENIZERS_PARALLELISM"] = "true" if settings.tokenizers_parallelism else "false"
+    for name, value in values.items():
+        if override:
+            os.environ[name] = value
+        else:
+            os.environ.setdefault(name, value)
+
+
+def configure_torch(settings: Optional[RuntimeSettings] = None):
+    """현재 프로세스(워커)의 torch 스레드 수를 설정합니다. fork 이후 다시 호출할 수 있습니다."""
+    import torch
+
+    settings = settings or get_runtime_settings()
+    apply_thread_env(settings)
+    torch.set_num_threads(settings.intra_op_threads)
+    try:
+        torch.set_num_interop_threads(settings.torch_inter_op_threads)
+    except RuntimeError:
+        # inter-op 풀이 이미 시작된 뒤에는 변경할 수 없습니다. (fork 이전에 설정된 값 유지)
+        logger.debug("torch inter-op 스레드 수는 이미 설정되어 변경하지 않습니다.")
+    logger.info(
+        f"torch runtime: pid={os.getpid()} intra_op={torch.get_num_threads()} "
+        f"inter_op={torch.get_num_interop_threads()} blas={settings.resolved_blas_threads} "
+        f"inference_mode={settings.inference_mode} bf16={settings.bf16_autocast and bf16_supported()} "
+        f"compile={settings.torch_compile}"
+    )
+
+
+@lru_cache(maxsize=1)
+def bf16_supported() -> bool:
+    """CPU가 bf16 연산(AVX512-BF16/AMX)을 지원하는지 확인합니다."""
+    try:
+        import torch
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+@contextmanager
+def inference_context(settings: Optional[RuntimeSettings] = None):
+    """프로파일에 따라 torch.inference_mode와 bf16 autocast를 적용하는 컨텍스트"""
+    import torch
+
+    settings = settings or get_runtime_settings()
+    with ExitStack() as stack:
+        if settings.inference_mode:
+            stack.enter_context(torch.inference_mode())
+        if settings.bf16_autocast and bf16_supported():
+            stack.enter_context(torch.autocast(device_type="cpu", dtype=torch.bfloat16))
+        yield
+
+
+def maybe_compile(module, settings: Optional[RuntimeSettings] = None):
+    """프로파일에서 torch_compile이 켜진 경우 torch.compile 된 모듈을 반환합니다."""
+    settings = settings or get_runtime_settings()
+    if not settings.torch_compile:
+        return module
+
+    import torch
+    try:
+        return torch.compile(module, dynamic=True)
+    except Exception as e:
+        logger.warning(f"torch.compile 실패, eager 모드로 실행합니다: {e}")
+        return module
@@ -0,0 +1,139 @@
+"""
+RAG 분석 프롬프트 토큰 예산 관리
+
+프롬프트 전체 예산(max_prompt_tokens)을 다음 순서로 배분합니다.
+1. 지시문(템플릿 본문)과 태그 목록: 항상 포함 (고정 비용)
+2. 사용자 질문: 최대 query_max_tokens — 넘으면 앞부분과 끝부분을 남기고 가운데를 생략
+3. 판례 문서: 남은 예산 — 검색 순위(관련도) 순으로 정렬된 문서에 같은 상한(cap)을 적용해 자르고,
+   min_doc_tokens보다 긴 문서에 min_doc_tokens도 줄 수 없으면 관련도가 낮은 문서부터 제외
+   문서는 JSON으로 직렬화되어 들어가므로 토큰 수는 이스케이프(따옴표, 개행 등)가 적용된 본문 기준으로 셉니다.
+
+배분 결과와 실제 토큰 수는 PromptBudgetReport로 반환하여 요청마다 기록합니다.
+"""
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
+
+QUERY_ELLIPSIS = "\n…(중략)…\n"
+
+
+@dataclass
+class PromptBudgetReport:
+    budget: int
+    tokenizer: str
+    exact: bool
+    instruction_tokens: int = 0
+    query_tokens: int = 0
+    query_truncated: bool = False
+    doc_tokens: int = 0
+    docs_total: int = 0
+    docs_kept: int = 0
+    docs_trimmed: int = 0
+    doc_cap: int = 0
+    prompt_tokens: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _serialize_docs(docs: List[Dict[str, Any]]) -> str:
+    return json.dumps(docs, ensure_ascii=False)
+
+
+def _escaped(text: str) -> str:
+    """JSON 문자열 안에 들어갈 때의 본문 (앞뒤 따옴표 제외)"""
+    return json.dumps(text, ensure_ascii=False)[1:-1]
+
+
+def _truncate_escaped(tokenizer, text: str, max_tokens: int) -> str:
+    """이스케이프된 본문이 max_tokens 이하가 되도록 원문을 자릅니다."""
+    limit = max_tokens
+    while True:
+        truncated = tokenizer.truncate(text, limit)
+        overflow = tokenizer.count(_escaped(truncated)) - max_tokens
+        if overflow <= 0 or limit <= 0:
+            return truncated
+        limit = max(0, limit - overflow)
+
+
+def truncate_middle(tokenizer, text: str, max_tokens: int) -> str:
+    """앞 2/3, 끝 1/3을 남기고 가운데를 생략합니다. (사연의 도입부와 결말을 함께 유지)"""
+    if tokenizer.count(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens - tokenizer.count(QUERY_ELLIPSIS))
+    head_budget = budget * 2 // 3
+    head = tokenizer.truncate(text, head_budget)
+    tail = tokenizer.truncate(text, budget - head_budget, from_end=True)
+    return head + QUERY_ELLIPSIS + tail
+
+
+def _fit_cap(lengths: List[int], available: int) -> int:
+    """sum(min(length, cap)) <= available 을 만족하는 가장 큰 cap (이분 탐색)"""
+    lo, hi = 0, max(lengths, default=0)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if sum(min(n, mid) for n in lengths) <= available:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def assemble_analysis_inputs(
+    tokenizer,
+    template_tokens: int,
+    user_query: str,
+    docs: List[Dict[str, Any]],
+    tag_list: str,
+    max_prompt_tokens: int,
+    query_max_tokens: int,
+    min_doc_tokens: int,
+) -> Tuple[Dict[str, str], PromptBudgetReport]:
+    """
+    CoT 프롬프트 입력(user_query, case_docs, tag_list)을 예산에 맞게 만듭니다.
+    docs는 관련도 순으로 정렬된 {"id", "issue", "text"} 목록이며 text만 잘라냅니다.
+    """
+    report = PromptBudgetReport(budget=max_prompt_tokens, tokenizer=tokenizer.name, exact=tokenizer.exact,
+                                docs_total=len(docs))
+    report.instruction_tokens = template_tokens + tokenizer.count(tag_list)
+
+    query = truncate_middle(tokenizer, user_query, query_max_tokens)
+    report.query_truncated = query != user_query
+    report.query_tokens = tokenizer.count(query)
+
+    available = max_prompt_tokens - report.instruction_tokens - report.query_tokens
+    empty_docs = [{**doc, "text": ""} for doc in docs]
+    text_tokens = [tokenizer.count(_escaped(doc.get("text", ""))) for doc in docs]
+
+    kept = len(docs)
+    while kept:
+        # 문서 구조(JSON 키/구분자) 비용을 제외한 본문 예산
+        text_budget = available - tokenizer.count(_serialize_docs(empty_docs[:kept]))
+        # 짧은 문서는 전체를, 긴 문서는 최소 min_doc_tokens를 담을 수 있어야 함
+        if text_budget >= sum(min(n, min_doc_tokens) for n in text_tokens[:kept]):
+            break
+        kept -= 1
+
+    selected: List[Dict[str, Any]] = []
+    case_docs = _serialize_docs(selected)
+    if kept:
+        cap = _fit_cap(text_tokens[:kept], text_budget)
+        while True:
+            selected = [
+                {**doc, "text": _truncate_escaped(tokenizer, doc.get("text", ""), cap)} if n > cap else doc
+                for doc, n in zip(docs[:kept], text_tokens[:kept])
+            ]
+            case_docs = _serialize_docs(selected)
+            # 본문과 구조를 따로 센 합과 직렬화 결과의 토큰 수가 다를 수 있으므로 실제 결과로 확인
+            overflow = tokenizer.count(case_docs) - available
+            if overflow <= 0 or cap == 0:
+                break
+            cap = max(0, cap - overflow)
+        report.doc_cap = cap
+        report.docs_trimmed = sum(n > cap for n in text_tokens[:kept])
+    report.docs_kept = kept
+
+    report.doc_tokens = tokenizer.count(case_docs)
+    report.prompt_tokens = report.instruction_tokens + report.query_tokens + report.doc_tokens
+    return {"user_query": query, "case_docs": case_docs, "tag_list": tag_list}, report
@@ -1,4 +1,4 @@
-from typing import List, Dict, Deque, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 
 # 시스템 프롬프트를 상수로 정의하여 일관성 유지
 SYSTEM_PROMPT = '''당신은 한국법에 대한 풍부한 지식과 경험을 가진 법률 전문가 AI 어시스턴트입니다.
@@ -6,17 +6,36 @@ SYSTEM_PROMPT = '''당신은 한국법에 대한 풍부한 지식과 경험을 
 질문의 주제가 한국 법률이 아닌 경우나 법률 자문을 제공할 수 없는 상황에는 "죄송합니다. 저는 법률 상담만을 제공하도록 설계되었습니다." 라고 간결히 안내해주세요.
 '''  
 
+# 오래된 대화를 압축한 요약문 (이전 요약이 있으면 함께 합쳐서 갱신)
+CHAT_SUMMARY_PROMPT = '''다음은 법률 상담 챗봇과 사용자의 이전 대화입니다.
+이후 답변에 필요한 내용(사용자의 상황, 사실관계, 질문 요지, 이미 안내한 법 조문과 결론)만 남겨 한국어로 간결하게 요약하세요.
+인사말이나 반복되는 내용은 생략하고, 요약문만 출력하세요.
+
+[기존 요약]
+{previous_summary}
+
+[이어진 대화]
+{conversation}
+'''
+
+SUMMARY_MESSAGE_PREFIX = "이전 대화 요약:\n"
+
 class ChatPromptTemplate:
     """채팅 프롬프트를 생성하는 클래스"""
 
     @staticmethod
-    def build_messages(history: Deque[Tuple[str, str]], new_message: str) -> List[Dict[str, str]]:
+    def build_messages(
+        history: Sequence[Tuple[str, str]], new_message: str, summary: Optional[str] = None
+    ) -> List[Dict[str, str]]:
         """
         대화 이력과 새로운 메시지를 바탕으로 LLM에 전달할 messages 리스트를 생성합니다.
+        summary가 있으면 요약된 이전 대화를 시스템 메시지로 함께 전달합니다.
         """
         messages: List[Dict[str, str]] = []
         # 시스템 프롬프트 삽입
         messages.append({"role": "system", "content": SYSTEM_PROMPT})
+        if summary:
+            messages.append({"role": "system", "content": SUMMARY_MESSAGE_PREFIX + summary})
         # 과거 대화 이력 반영
         for role, content in history:
             messages.append({"role": role, "content": content})
@@ -55,21 +55,48 @@ SPECIALTY_TAGS: {specialty_tags}
 - 추가 텍스트, 설명, 코멘트 출력 금지
 """
 
+QUESTION_TAG_GENERATION_PROMPT = """
+당신은 사건 상담을 준비하는 의뢰인을 돕는 한국어 법률 컨설턴트이자 법률 태그 설계자입니다.
+아래 사건 개요와 희망 결과를 바탕으로 두 가지를 한 번에 생성합니다.
+
+[1. questions — 의뢰인이 변호사에게 물어야 할 핵심 질문 3개]
+- 각 질문은 ①전략 선택(소송/합의/가처분 등), ②비용·보수·기간, ③증거 전략, ④리스크 중 최소 1가지를 직접 좁혀줍니다.
+- 한국어. 한 문장씩. 중복·모호한 일반론 금지. “예/아니오”로 끝나지 않게 구체적으로 묻기.
+- **관점 고정**: 반드시 의뢰인이 변호사에게 묻는 형태.
+
+[2. tags — 사건 분류 태그 3개]
+- 제공된 SPECIALTY_TAGS에서 관련 태그를 선택합니다.
+- 한국어 명사 위주, 간결(1~4어절), 중복/동의어 반복 금지.
+
+[출력 형식(반드시 준수)]
+정확히 아래 JSON만 출력:
+{{"questions": ["질문1", "질문2", "질문3"], "tags": ["태그1", "태그2", "태그3"]}}
+
+[입력]
+Case Summary: {fullText}
+Desired Outcome: {desiredOutcome}
+
+SPECIALTY_TAGS: {specialty_tags}
+
+[검증]
+- questions, tags 모두 요소 수는 정확히 3개
+- 추가 텍스트·해설·머리말 금지
+"""
+
 APPLICATION_FORMAT_PROMPT = """
 아래 JSON 데이터의 각 필드(case.title, case.summary, case.fullText, weakPoints, desiredOutcome)에 있는
 문장을 **추가·삭제·요약 없이 원본 그대로 유지**하면서, **가독성을 높이도록** 보기 좋게 다듬어 주세요.
 출력은 반드시 **원본 JSON 구조**를 그대로 유지해야 합니다:
 
-{
-  "case": {
+{{
+  "case": {{
     "title": "...",
     "summary": "...",
     "fullText": "..."
-  },
-  "desiredOutcome": "..."
-  "weakPoints": "...",
-
-}
+  }},
+  "desiredOutcome": "...",
+  "weakPoints": "..."
+}}
 
 원본 JSON:
 {raw_json}
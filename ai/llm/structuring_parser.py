@@ -5,6 +5,18 @@ import re
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+def is_complete_structuring_output(raw: str) -> bool:
+    """
+    LLM 응답 캐시에 저장해도 되는 구조화 출력인지 확인합니다.
+    복구 모드 없이 JSON 객체로 파싱되고 fullText가 있어야 합니다. (깨진 응답이 재시도 때 재사용되지 않도록)
+    """
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and isinstance(data.get("fullText"), str) and bool(data["fullText"].strip())
+
+
 class StructuringParser:
     """
     LLM의 원시 출력을 안전하게 JSON 파싱하고, 특정 키(title, summary, fullText)를 보장하는 파서.
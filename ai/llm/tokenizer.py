@@ -0,0 +1,91 @@
+"""
+LLM 프롬프트 토큰 계산
+
+OpenAI 모델과 같은 tiktoken 인코딩으로 토큰 수를 계산하고 토큰 단위로 자릅니다.
+tiktoken이 없거나 인코딩 파일을 받을 수 없는 환경(오프라인 등)에서는 문자 수 기반 추정으로 대체하며,
+어느 쪽을 사용했는지는 `exact` 속성으로 확인할 수 있습니다.
+(오프라인 배포 시 TIKTOKEN_CACHE_DIR에 인코딩 파일을 미리 넣어 두면 정확한 계산을 사용합니다)
+"""
+import math
+import threading
+from typing import Dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"  # gpt-4o 계열
+
+_tokenizers: Dict[str, "Tokenizer"] = {}
+_lock = threading.Lock()
+
+
+class Tokenizer:
+    """tiktoken 인코딩을 사용하는 토크나이저"""
+    exact = True
+
+    def __init__(self, encoding):
+        self._encoding = encoding
+        self.name = encoding.name
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=())) if text else 0
+
+    def truncate(self, text: str, max_tokens: int, from_end: bool = False) -> str:
+        """
+        앞에서부터(from_end이면 끝에서부터) max_tokens 토큰까지만 남깁니다.
+        토큰 경계에서 잘린 멀티바이트 문자(U+FFFD)는 제거합니다.
+        """
+        if max_tokens <= 0:
+            return ""
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        kept = tokens[-max_tokens:] if from_end else tokens[:max_tokens]
+        return self._encoding.decode(kept).strip("\ufffd")
+
+
+class ApproxTokenizer:
+    """
+    문자 수 기반 토큰 추정기 (tiktoken을 사용할 수 없을 때)
+    한글 등 비ASCII 문자는 1.5자, ASCII는 4자를 한 토큰으로 보고 올림하여 실제보다 약간 많게 추정합니다.
+    """
+    exact = False
+    name = "approx"
+
+    @staticmethod
+    def _weight(ch: str) -> float:
+        return 0.25 if ch.isascii() else 1 / 1.5
+
+    def count(self, text: str) -> int:
+        return math.ceil(sum(self._weight(ch) for ch in text)) if text else 0
+
+    def truncate(self, text: str, max_tokens: int, from_end: bool = False) -> str:
+        if max_tokens <= 0:
+            return ""
+        total = 0.0
+        indices = range(len(text) - 1, -1, -1) if from_end else range(len(text))
+        for i in indices:
+            total += self._weight(text[i])
+            if total > max_tokens:
+                return text[i + 1:] if from_end else text[:i]
+        return text
+
+
+def get_tokenizer(model: str = "gpt-4o-mini"):
+    """모델에 맞는 토크나이저를 반환합니다. (모델별로 한 번만 로드)"""
+    if model in _tokenizers:
+        return _tokenizers[model]
+    with _lock:
+        if model not in _tokenizers:
+            try:
+                import tiktoken
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+                _tokenizers[model] = Tokenizer(encoding)
+            except Exception as e:
+                logger.warning(f"tiktoken 인코딩을 불러오지 못해 토큰 수를 추정합니다 ({model}): {e!r}")
+                _tokenizers[model] = ApproxTokenizer()
+    return _tokenizers[model]
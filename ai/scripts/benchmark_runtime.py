@@ -0,0 +1,119 @@
+"""
+CPU 추론 런타임 프로파일 벤치마크
+
+torch intra-op 스레드 수, inference_mode, bf16 autocast, torch.compile 조합을 바꿔가며
+EmbeddingModel / CrossEncoderModel의 처리량(texts/s)과 코어당 처리량을 출력합니다.
+
+사용 예:
+    python scripts/benchmark_runtime.py --threads 1,2,4 --batch-size 10 --compile
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import argparse
+import itertools
+import time
+
+from config.settings import RuntimeSettings, get_runtime_settings
+from llm.models.runtime import apply_thread_env, bf16_supported, inference_context, maybe_compile
+from utils.logger import setup_logger, get_logger
+
+setup_logger()
+logger = get_logger(__name__)
+
+SAMPLE_QUERY = "헬스장 탈의실에 잘못 들어가 상대방이 경찰에 신고한 사건"
+SAMPLE_DOCUMENT = (
+    "성적 목적을 위한 다중이용장소 침입죄는 자기의 성적 욕망을 만족시킬 목적으로 공중화장실, "
+    "목욕장 등 다중이용장소에 침입하거나 같은 장소에서 퇴거의 요구를 받고 응하지 아니하는 경우에 성립한다."
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CPU 추론 런타임 프로파일 벤치마크")
+    parser.add_argument("--threads", default=None,
+                        help="intra-op 스레드 수 목록 (쉼표 구분, 기본값: 1,2,4,... CPU 코어 수)")
+    parser.add_argument("--batch-size", type=int, default=10, help="재정렬/임베딩 배치 크기")
+    parser.add_argument("--iterations", type=int, default=20, help="조합별 측정 반복 횟수")
+    parser.add_argument("--compile", action="store_true", help="torch.compile 조합도 측정")
+    return parser.parse_args()
+
+
+def default_thread_counts():
+    cpu_count = os.cpu_count() or 1
+    counts, n = [], 1
+    while n < cpu_count:
+        counts.append(n)
+        n *= 2
+    counts.append(cpu_count)
+    return counts
+
+
+def measure(fn, iterations: int) -> float:
+    """워밍업 2회 후 iterations회 실행한 평균 소요 시간(초)을 반환합니다."""
+    for _ in range(2):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    args = parse_args()
+    thread_counts = [int(t) for t in args.threads.split(",")] if args.threads else default_thread_counts()
+    bf16_options = [False, True] if bf16_supported() else [False]
+    compile_options = [False, True] if args.compile else [False]
+
+    # BLAS 스레드는 torch import 이전에만 적용되므로 최대 스레드 수로 고정합니다.
+    base = get_runtime_settings()
+    apply_thread_env(base.model_copy(update={"blas_threads": max(thread_counts)}), override=True)
+
+    import torch
+    from llm.models.model_loader import ModelLoader
+
+    embedding_model = ModelLoader.get_embedding_model()
+    cross_encoder_model = ModelLoader.get_cross_encoder_model()
+    st_transformer = embedding_model._model[0]
+    eager_auto_model = st_transformer.auto_model
+    eager_ce_model = cross_encoder_model._model.model
+
+    texts = [SAMPLE_DOCUMENT] * args.batch_size
+    pairs = [[SAMPLE_QUERY, SAMPLE_DOCUMENT]] * args.batch_size
+
+    print(f"{'threads':>7} {'inf_mode':>8} {'bf16':>5} {'compile':>7} | "
+          f"{'embed/s':>9} {'embed/s/core':>12} | {'rerank/s':>9} {'rerank/s/core':>13}")
+    for threads, use_inference_mode, use_bf16, use_compile in itertools.product(
+        thread_counts, [False, True], bf16_options, compile_options
+    ):
+        settings: RuntimeSettings = base.model_copy(update={
+            "torch_intra_op_threads": threads,
+            "inference_mode": use_inference_mode,
+            "bf16_autocast": use_bf16,
+            "torch_compile": use_compile,
+        })
+        torch.set_num_threads(threads)
+        st_transformer.auto_model = maybe_compile(eager_auto_model, settings)
+        cross_encoder_model._model.model = maybe_compile(eager_ce_model, settings)
+
+        def run_embedding():
+            with inference_context(settings):
+                embedding_model._model.encode(texts, batch_size=args.batch_size, convert_to_numpy=True)
+
+        def run_rerank():
+            with inference_context(settings):
+                cross_encoder_model._model.predict(pairs, batch_size=args.batch_size)
+
+        embed_rate = args.batch_size / measure(run_embedding, args.iterations)
+        rerank_rate = args.batch_size / measure(run_rerank, args.iterations)
+        print(f"{threads:>7} {str(use_inference_mode):>8} {str(use_bf16):>5} {str(use_compile):>7} | "
+              f"{embed_rate:>9.1f} {embed_rate / threads:>12.1f} | "
+              f"{rerank_rate:>9.1f} {rerank_rate / threads:>13.1f}")
+
+    st_transformer.auto_model = eager_auto_model
+    cross_encoder_model._model.model = eager_ce_model
+
+
+if __name__ == "__main__":
+    main()
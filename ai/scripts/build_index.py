@@ -1,141 +1,795 @@
+"""
+판례 인덱스 구축 스크립트
 
-import os, json, glob
-import psycopg2
-from psycopg2.extras import execute_batch
-from tqdm import tqdm
+전처리된 판례를 읽어 legal_cases / legal_chunks 테이블에 적재합니다.
+입력 디렉터리에 manifest.json이 있으면 case_preprocessor.py가 만든 샤드(JSONL/Parquet)를,
+없으면 판례별 JSON 파일을 읽습니다. --delta 를 주면 증분 전처리의 delta 레이어만 적용합니다.
+전체 코퍼스를 메모리에 올리지 않도록 parse → diff → chunk → embed(고정 크기 배치) → write
+제너레이터 파이프라인으로 처리하며, 단계별 처리량을 로그로 남깁니다.
+
+증분/재개
+- 판례별 내용 해시(content_hash)와 청크/모델 버전(index_version)을 legal_cases에 저장하고,
+  둘 다 같은 판례는 건너뜁니다. 변경된 판례는 한 트랜잭션 안에서 청크를 교체합니다.
+- 배치 커밋마다 체크포인트 파일에 마지막으로 처리한 파일을 기록하여,
+  중단된 실행은 그 다음 파일부터 이어서 진행합니다.
+- 전체 실행이 끝나면 이번 실행에서 보이지 않은(삭제된) 판례를 제거합니다.
+
+임베딩
+- --workers N이면 워커 프로세스 N개가 배치를 나누어 인코딩합니다. (scripts/embedding_workers.py)
+- 계산한 벡터는 청크 텍스트 해시/모델 이름을 키로 디스크 캐시에 저장하고,
+  재구축·청크 분할 실험·인덱스 재생성 시 재사용합니다. (scripts/embedding_cache.py)
+
+blue/green (--blue-green)
+- 활성 버전을 직접 수정하지 않고 버전별 섀도 테이블에 구축한 뒤, 행 수와 recall 샘플을 검증하고
+  `legal_*_current` 뷰를 원자적으로 교체합니다. 이전 버전은 --keep-versions개만 남기고 삭제합니다.
+  (scripts/index_versions.py)
+- 기본(in-place) 모드는 현재 활성 버전의 테이블을 증분 갱신합니다.
+
+대량 적재
+- 기본 적재 경로는 `COPY ... FROM STDIN (FORMAT binary)`로 임시 스테이징 테이블에 스트리밍한 뒤
+  한 번의 INSERT ... SELECT로 병합합니다. (임베딩은 pgvector 바이너리 포맷으로 직접 인코딩)
+- 초기 적재(legal_chunks가 비어 있음) 또는 --defer-indexes 시 legal_chunks의 보조 인덱스(HNSW 포함)를
+  삭제해 두고 적재가 끝난 뒤 다시 생성합니다.
+
+사용 예:
+    python scripts/build_index.py --data-dir data/preprocessed --batch-size 64
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import re
+import struct
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from psycopg2.extras import execute_batch, execute_values
 from pgvector.psycopg2 import register_vector
-from dotenv import load_dotenv
-from utils.logger import setup_logger, get_logger
-from llm.embedding_model import load_model as load_embedding_model
+from tqdm import tqdm
 
-load_dotenv()
+from db.database import get_psycopg2_connection
+from scripts.case_shards import iter_shard_cases, read_manifest
+from scripts.embedding_cache import EmbeddingCache, chunk_hash
+from scripts.embedding_workers import EmbeddingEncoder
+from scripts import index_versions
+from scripts.index_versions import BASE_TABLES, IndexTables
+from utils.logger import setup_logger, get_logger
 
-setup_logger()
 logger = get_logger(__name__)
 
-# --------- 설정 ---------
-DATA_DIR      = "F:/S13P11B204/ai/data/preprocessed"
+# --------- 기본 설정 (CLI 인자로 변경 가능) ---------
+PROJECT_ROOT    = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+DATA_DIR        = os.path.join(PROJECT_ROOT, "data", "preprocessed")
+CHECKPOINT_PATH = os.path.join(PROJECT_ROOT, "data", "build_index.checkpoint.json")
+EMBEDDING_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "embedding_cache")
 EMBEDDING_MODEL = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
 CHUNK_SIZE, CHUNK_OVERLAP = 1800, 200
+CHUNKER_VERSION = 1  # 청크 분할 로직이 바뀌면 올려서 전체 재임베딩
+BATCH_SIZE      = 64
+MAX_BATCH_CASES = 1000  # 변경 없는 판례만 이어질 때도 체크포인트가 전진하도록
+LOOKUP_SIZE     = 500
+REPORT_EVERY    = 50
 HNSW_M, HNSW_EF_CONSTRUCTION = 12, 150
+MAINTENANCE_WORK_MEM = "1GB"  # 인덱스 생성 시 세션 메모리
 # ------------------------
 
-def get_db_connection():
-    conn = psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST"), port=os.getenv("POSTGRES_PORT"),
-        dbname=os.getenv("POSTGRES_DB"), user=os.getenv("POSTGRES_USER"), password=os.getenv("POSTGRES_PASSWORD")
-    )
-    register_vector(conn)
-    return conn
+CaseRow = Tuple[Any, ...]
+Chunk = Dict[str, Any]
+Item = Dict[str, Any]
+
+ACTION_INSERT, ACTION_REPLACE, ACTION_SKIP = "insert", "replace", "skip"
 
-def create_hnsw_index(cur):
+CASE_COLUMNS = ("case_id", "title", "decision_date", "category", "issue", "summary",
+                "statutes", "precedents", "full_text", "content_hash", "index_version")
+CHUNK_COLUMNS = ("case_id", "chunk_index", "section", "chunk_text", "embedding", "token_count")
+
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+_NULL_FIELD = struct.pack("!i", -1)
+
+
+class StageStats:
+    """파이프라인 단계별 처리 건수와 소요 시간을 집계합니다."""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.count = 0
+        self.seconds = 0.0
+
+    @contextmanager
+    def timed(self, count: int = 0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += count
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return f"{self.name:<6} {self.count:>9} {self.unit:<6} {self.seconds:8.1f}s  {self.rate:10.1f} {self.unit}/s"
+
+
+def log_stage_report(stages: Iterable[StageStats], title: str = "단계별 처리량"):
+    logger.info(title + "\n" + "\n".join("  " + stage.summary() for stage in stages))
+
+
+def create_hnsw_index(cur, chunks_table: str = BASE_TABLES.chunks):
     cur.execute(f"""
-        CREATE INDEX IF NOT EXISTS idx_legal_chunks_embedding_hnsw
-        ON legal_chunks
+        CREATE INDEX IF NOT EXISTS idx_{chunks_table}_embedding_hnsw
+        ON {chunks_table}
         USING hnsw (embedding vector_l2_ops)
         WITH (m={HNSW_M}, ef_construction={HNSW_EF_CONSTRUCTION});
     """)
 
-def process_text_to_chunks(case_id, header, body):
+
+def ensure_schema(cur):
+    """증분 인덱싱에 필요한 컬럼/테이블을 준비합니다. (db/init_db.sql과 동일)"""
+    cur.execute("""
+        ALTER TABLE legal_cases ADD COLUMN IF NOT EXISTS content_hash  TEXT;
+        ALTER TABLE legal_cases ADD COLUMN IF NOT EXISTS index_version TEXT;
+        CREATE TABLE IF NOT EXISTS legal_index_run_cases (
+            run_id   TEXT NOT NULL,
+            case_id  TEXT NOT NULL,
+            PRIMARY KEY (run_id, case_id)
+        );
+    """)
+
+
+def ensure_staging_tables(cur):
+    """COPY 적재용 세션 임시 테이블을 만듭니다. 커밋마다 비워집니다."""
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS staging_legal_cases (
+            case_id TEXT, title TEXT, decision_date TEXT, category TEXT,
+            issue TEXT, summary TEXT, statutes TEXT, precedents TEXT, full_text TEXT,
+            content_hash TEXT, index_version TEXT
+        ) ON COMMIT DELETE ROWS;
+        CREATE TEMP TABLE IF NOT EXISTS staging_legal_chunks (
+            case_id TEXT, chunk_index INT, section TEXT, chunk_text TEXT,
+            embedding vector, token_count INT
+        ) ON COMMIT DELETE ROWS;
+    """)
+
+
+def drop_secondary_indexes(cur, chunks_table: str = BASE_TABLES.chunks) -> List[str]:
+    """
+    청크 테이블에서 제약 조건에 속하지 않는 인덱스(HNSW 등)를 삭제하고,
+    재생성에 쓸 인덱스 정의(pg_get_indexdef)를 반환합니다.
+    """
+    cur.execute("""
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = %s::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+    """, (chunks_table,))
+    indexes = cur.fetchall()
+    for name, _ in indexes:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+    return [definition for _, definition in indexes]
+
+
+def recreate_indexes(cur, definitions: Iterable[str]):
+    """drop_secondary_indexes()로 삭제한 인덱스를 다시 생성합니다."""
+    cur.execute(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+    for definition in definitions:
+        cur.execute(re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX IF NOT EXISTS ", definition))
+
+
+def _encode_field(value) -> bytes:
+    """COPY 바이너리 포맷의 필드 하나를 인코딩합니다. (text / int4 / pgvector)"""
+    if value is None:
+        return _NULL_FIELD
+    if isinstance(value, np.ndarray):
+        # pgvector 바이너리 포맷: int16 차원 수, int16 예약, float4[] (big-endian)
+        data = struct.pack("!HH", value.shape[0], 0) + value.astype(">f4", copy=False).tobytes()
+    elif isinstance(value, int):
+        data = struct.pack("!i", value)
+    else:
+        data = str(value).encode("utf-8")
+    return struct.pack("!i", len(data)) + data
+
+
+def encode_copy_binary(rows: Iterable[Tuple[Any, ...]]) -> io.BytesIO:
+    """행 목록을 `COPY ... FROM STDIN (FORMAT binary)` 입력 스트림으로 인코딩합니다."""
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    for row in rows:
+        buf.write(struct.pack("!h", len(row)))
+        for value in row:
+            buf.write(_encode_field(value))
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+_UPSERT_CASES_SET = """
+    ON CONFLICT (case_id) DO UPDATE SET
+      title = EXCLUDED.title, decision_date = EXCLUDED.decision_date,
+      category = EXCLUDED.category, issue = EXCLUDED.issue,
+      summary = EXCLUDED.summary, statutes = EXCLUDED.statutes,
+      precedents = EXCLUDED.precedents, full_text = EXCLUDED.full_text,
+      content_hash = EXCLUDED.content_hash, index_version = EXCLUDED.index_version
+"""
+
+
+_CHUNKS_ON_CONFLICT = """
+    ON CONFLICT (case_id, chunk_index, section) DO NOTHING
+"""
+
+
+def dedupe_case_rows(case_rows: List[CaseRow]) -> List[CaseRow]:
+    """
+    같은 case_id가 한 배치에 여러 번 있으면 마지막 행만 남깁니다. (행 단위 upsert를 순서대로 실행한 결과와 동일)
+    INSERT ... SELECT 한 문장 안에서 같은 키를 두 번 갱신하면 ON CONFLICT DO UPDATE가 실패하기 때문입니다.
+    """
+    latest = {row[0]: row for row in case_rows}
+    return case_rows if len(latest) == len(case_rows) else list(latest.values())
+
+
+def copy_rows(cur, tables: IndexTables, case_rows: List[CaseRow], chunk_rows: List[Tuple[Any, ...]]):
+    """스테이징 테이블로 바이너리 COPY 후 본 테이블로 병합합니다. (ensure_staging_tables 필요)"""
+    if case_rows:
+        cur.copy_expert(
+            f"COPY staging_legal_cases ({', '.join(CASE_COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+            encode_copy_binary(dedupe_case_rows(case_rows))
+        )
+        cur.execute(f"""
+            INSERT INTO {tables.cases} ({', '.join(CASE_COLUMNS)})
+            SELECT case_id, title, decision_date::date, category, issue, summary,
+                   statutes, precedents, full_text, content_hash, index_version
+            FROM staging_legal_cases
+        """ + _UPSERT_CASES_SET)
+    if chunk_rows:
+        cur.copy_expert(
+            f"COPY staging_legal_chunks ({', '.join(CHUNK_COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+            encode_copy_binary(chunk_rows)
+        )
+        cur.execute(f"""
+            INSERT INTO {tables.chunks} ({', '.join(CHUNK_COLUMNS)})
+            SELECT {', '.join(CHUNK_COLUMNS)} FROM staging_legal_chunks
+        """ + _CHUNKS_ON_CONFLICT)
+
+
+def insert_rows(cur, tables: IndexTables, case_rows: List[CaseRow], chunk_rows: List[Tuple[Any, ...]]):
+    """행 단위 INSERT(execute_batch)로 적재합니다. (COPY를 쓸 수 없는 환경용)"""
+    if case_rows:
+        execute_batch(cur, f"""
+            INSERT INTO {tables.cases} ({', '.join(CASE_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(CASE_COLUMNS))})
+        """ + _UPSERT_CASES_SET, case_rows)
+    if chunk_rows:
+        execute_batch(cur, f"""
+            INSERT INTO {tables.chunks} ({', '.join(CHUNK_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(CHUNK_COLUMNS))})
+        """ + _CHUNKS_ON_CONFLICT, chunk_rows)
+
+
+LOADERS = {"copy": copy_rows, "insert": insert_rows}
+
+
+def make_index_version(model_name: str, chunk_size: int, chunk_overlap: int) -> str:
+    """청크 분할 방식과 임베딩 모델을 식별하는 버전 문자열"""
+    return f"{model_name}|chunker=v{CHUNKER_VERSION}:{chunk_size}/{chunk_overlap}"
+
+
+def content_hash(d: Dict[str, Any]) -> str:
+    """판례 JSON의 정규화된 내용 해시"""
+    canonical = json.dumps(d, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def process_text_to_chunks(case_id, header, body, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
     chunks = [{"case_id": case_id, "chunk_index": -1,
                "section": "header", "chunk_text": header}]
     start, idx = 0, 0
     while start < len(body):
-        end = start + CHUNK_SIZE
+        end = start + chunk_size
         chunks.append({"case_id": case_id, "chunk_index": idx,
                        "section": "body", "chunk_text": body[start:end]})
-        start += CHUNK_SIZE - CHUNK_OVERLAP
+        start += chunk_size - chunk_overlap
         idx += 1
     return chunks
 
-def main():
-    logger.info("--- 인덱싱 시작 ---")
-    conn, cur = get_db_connection(), None
-    try:
-        cur = conn.cursor()
-        model = load_embedding_model()
 
-        files = glob.glob(os.path.join(DATA_DIR, '**', '*.json'), recursive=True)
-        logger.info(f"{len(files)}개 파일 처리")
+def to_case_row(d: Dict[str, Any]) -> CaseRow:
+    """전처리 JSON을 legal_cases 행으로 변환합니다."""
+    raw_cat  = d.get("category") or ""
+    category = raw_cat.split('_', 1)[0] if raw_cat else ""
 
-        cases, chunks_all = [], []
+    statutes_txt   = ", ".join(d.get("statutes", [])) or None
+    precedents_txt = ", ".join(d.get("precedents", [])) or None
 
-        for fp in tqdm(files, desc="JSON 파싱"):
-            with open(fp, 'r', encoding='utf-8') as f:
-                d = json.load(f)
+    return (
+        d["case_id"],
+        d.get("title"),
+        d.get("decision_date"),
+        category,
+        d.get("issue"),
+        d.get("summary"),
+        statutes_txt,
+        precedents_txt,
+        d.get("full_text")
+    )
 
-            cid = d.get("case_id")
-            if not cid:
+
+def case_header(d: Dict[str, Any]) -> str:
+    return (
+        f"제목: {d.get('title','')}\n"
+        f"쟁점: {d.get('issue','')}\n"
+        f"요약: {d.get('summary','')}"
+    )
+
+
+# ─────────────── 체크포인트 ───────────────
+
+def load_checkpoint(path: str, index_version: str, data_dir: str) -> Optional[Dict[str, Any]]:
+    """같은 데이터/버전으로 중단된 실행의 체크포인트를 반환합니다."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("index_version") != index_version or checkpoint.get("data_dir") != data_dir:
+        logger.info("체크포인트의 데이터 경로/인덱스 버전이 달라 처음부터 시작합니다.")
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """체크포인트를 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다."""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ─────────────── 파이프라인 단계 ───────────────
+
+def iter_case_files(data_dir: str, after: Optional[str] = None) -> Iterator[str]:
+    """
+    data_dir 아래의 JSON 파일 경로를 정렬된 순서로 반환합니다.
+    after가 주어지면 그 경로 다음 파일부터 반환합니다. (재개)
+    """
+    files = sorted(glob.iglob(os.path.join(data_dir, '**', '*.json'), recursive=True))
+    for fp in files:
+        if after is None or fp > after:
+            yield fp
+
+
+def parse_cases(files: Iterable[str], stats: StageStats) -> Iterator[Item]:
+    """[parse] JSON 파일을 하나씩 읽어 case_id가 있는 판례를 반환합니다."""
+    for fp in files:
+        with stats.timed(1):
+            try:
+                with open(fp, 'r', encoding='utf-8') as f:
+                    d = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Failed to load {fp}: {e}")
                 continue
+            if not d.get("case_id"):
+                continue
+            item = {"source": fp, "case_id": d["case_id"], "data": d, "content_hash": content_hash(d)}
+        yield item
+
 
-            raw_cat  = d.get("category") or ""
-            category = raw_cat.split('_', 1)[0] if raw_cat else ""
-
-            statutes_txt   = ", ".join(d.get("statutes", [])) or None
-            precedents_txt = ", ".join(d.get("precedents", [])) or None
-
-            cases.append((
-                cid,
-                d.get("title"),
-                d.get("decision_date"),
-                category,
-                d.get("issue"),
-                d.get("summary"),
-                statutes_txt,
-                precedents_txt,
-                d.get("full_text")
-            ))
-
-            header = (
-                f"제목: {d.get('title','')}\n"
-                f"쟁점: {d.get('issue','')}\n"
-                f"요약: {d.get('summary','')}"
+def parse_shards(
+    data_dir: str,
+    manifest: Dict[str, Any],
+    stats: StageStats,
+    after: Optional[str] = None,
+    layers: Optional[Iterable[int]] = None,
+) -> Iterator[Item]:
+    """[parse] manifest의 샤드를 순서대로 읽어 case_id가 있는 판례를 반환합니다."""
+    records = iter_shard_cases(data_dir, manifest, after, layers)
+    while True:
+        with stats.timed():
+            record = next(records, None)
+            if record is None:
+                return
+            stats.count += 1
+            source, d = record
+            if not d.get("case_id"):
+                continue
+            item = {"source": source, "case_id": d["case_id"], "data": d, "content_hash": content_hash(d)}
+        yield item
+
+
+def resolve_delta_layer(manifest: Optional[Dict[str, Any]], delta: str) -> int:
+    """--delta 값(latest 또는 레이어 ID)에 해당하는 delta 레이어 번호"""
+    if manifest is None or len(manifest["layers"]) < 2:
+        raise SystemExit("적용할 delta 레이어가 없습니다. (샤드 입력의 증분 전처리 결과가 필요)")
+    if delta == "latest":
+        return len(manifest["layers"]) - 1
+    for index, layer in enumerate(manifest["layers"]):
+        if index > 0 and layer["id"] == delta:
+            return index
+    raise SystemExit(f"delta 레이어를 찾을 수 없습니다: {delta}")
+
+
+def iter_cases(data_dir: str, stats: StageStats, after: Optional[str] = None, delta_layer: Optional[int] = None) -> Iterator[Item]:
+    """입력 형식(샤드 / 판례별 JSON 파일)에 맞는 parse 단계를 반환합니다."""
+    manifest = read_manifest(data_dir)
+    if delta_layer is not None:
+        logger.info(f"delta 레이어 적용: {manifest['layers'][delta_layer]['id']}")
+        return parse_shards(data_dir, manifest, stats, after, layers=[delta_layer])
+    if manifest is not None:
+        logger.info(f"샤드 입력: {len(manifest['shards'])}개 ({manifest['format']})")
+        return parse_shards(data_dir, manifest, stats, after)
+    return parse_cases(iter_case_files(data_dir, after), stats)
+
+
+def diff_cases(
+    items: Iterable[Item],
+    conn,
+    index_version: str,
+    stats: StageStats,
+    lookup_size: int = LOOKUP_SIZE,
+    tables: IndexTables = BASE_TABLES,
+) -> Iterator[Item]:
+    """
+    [diff] DB에 저장된 해시/버전과 비교하여 판례별 action을 정합니다.
+    - insert: DB에 없음 / replace: 해시 또는 버전 변경 / skip: 변경 없음
+    이번 실행에서 이미 나온 case_id(재실행 시 생긴 `_N` 사본 등)는 DB 조회 결과 대신 앞선 사본과 비교합니다.
+    내용이 같으면 skip, 다르면 앞선 사본의 청크를 지우고 다시 넣도록 replace로 정합니다.
+    """
+    seen: Dict[str, str] = {}
+
+    def resolve(buffer: List[Item]) -> List[Item]:
+        with stats.timed(len(buffer)), conn.cursor() as cur:
+            cur.execute(
+                f"SELECT case_id, content_hash, index_version FROM {tables.cases} WHERE case_id = ANY(%s)",
+                ([item["case_id"] for item in buffer],)
             )
-            chunks_all.extend(
-                process_text_to_chunks(cid, header, d.get("full_text", ""))
+            existing = {cid: (h, v) for cid, h, v in cur.fetchall()}
+        for item in buffer:
+            previous = seen.get(item["case_id"])
+            seen[item["case_id"]] = item["content_hash"]
+            if previous is not None:
+                if previous == item["content_hash"]:
+                    item["action"] = ACTION_SKIP
+                    continue
+                logger.warning(f"같은 case_id가 다른 내용으로 다시 나와 덮어씁니다: {item['case_id']} ({item['source']})")
+                item["action"] = ACTION_REPLACE
+                continue
+            stored = existing.get(item["case_id"])
+            if stored is None:
+                item["action"] = ACTION_INSERT
+            elif stored == (item["content_hash"], index_version):
+                item["action"] = ACTION_SKIP
+            else:
+                item["action"] = ACTION_REPLACE
+        return buffer
+
+    buffer: List[Item] = []
+    for item in items:
+        buffer.append(item)
+        if len(buffer) >= lookup_size:
+            yield from resolve(buffer)
+            buffer = []
+    if buffer:
+        yield from resolve(buffer)
+
+
+def chunk_cases(
+    items: Iterable[Item],
+    stats: StageStats,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Item]:
+    """[chunk] 적재 대상 판례를 legal_cases 행과 청크 목록으로 변환합니다."""
+    for item in items:
+        d = item.pop("data")
+        if item.get("action") == ACTION_SKIP:
+            item["chunks"] = []
+            yield item
+            continue
+        with stats.timed():
+            item["row"] = to_case_row(d)
+            item["chunks"] = process_text_to_chunks(
+                d["case_id"], case_header(d), d.get("full_text") or "", chunk_size, chunk_overlap
             )
+            stats.count += len(item["chunks"])
+        yield item
 
-        execute_batch(cur, """
-            INSERT INTO legal_cases
-              (case_id, title, decision_date, category,
-               issue, summary, statutes, precedents, full_text)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            ON CONFLICT (case_id) DO NOTHING
-        """, cases)
-        conn.commit()
-        logger.info("legal_cases 입력 완료")
-
-        texts = [c["chunk_text"] for c in chunks_all]
-        logger.info(f"{len(texts)}개 청크 임베딩 생성")
-        embeds = model.encode(texts, show_progress_bar=True, convert_to_numpy=True)
-
-        chunk_rows = []
-        for i, c in enumerate(chunks_all):
-            chunk_rows.append((
-                c["case_id"], c["chunk_index"], c["section"],
-                c["chunk_text"],
-                embeds[i].tolist(),
-                len(c["chunk_text"].split())
-            ))
-
-        execute_batch(cur, """
-            INSERT INTO legal_chunks
-              (case_id, chunk_index, section,
-               chunk_text, embedding, token_count)
-            VALUES (%s,%s,%s,%s,%s,%s)
-            ON CONFLICT (case_id, chunk_index, section) DO NOTHING
-        """, chunk_rows)
-        conn.commit()
-        logger.info("legal_chunks 입력 완료")
 
-        create_hnsw_index(cur)
+def batch_items(
+    items: Iterable[Item],
+    batch_size: int,
+    max_cases: int = MAX_BATCH_CASES,
+) -> Iterator[List[Item]]:
+    """
+    판례 단위로 배치를 묶습니다. 청크 수가 batch_size 이상이거나 판례 수가 max_cases에 도달하면 배치를 내보냅니다.
+    한 판례의 청크는 항상 같은 배치(트랜잭션)에 포함됩니다.
+    """
+    batch: List[Item] = []
+    n_chunks = 0
+    for item in items:
+        batch.append(item)
+        n_chunks += len(item["chunks"])
+        if n_chunks >= batch_size or len(batch) >= max_cases:
+            yield batch
+            batch, n_chunks = [], 0
+    if batch:
+        yield batch
+
+
+def embed_batches(
+    batches: Iterable[List[Item]],
+    encoder,
+    stats: StageStats,
+    cache: Optional[EmbeddingCache] = None,
+) -> Iterator[Tuple[List[Item], Any]]:
+    """
+    [embed] 배치의 모든 청크 임베딩을 계산합니다. (배치 내 청크 순서와 동일)
+    캐시에 있는 청크는 재사용하고, 나머지는 encoder에 제출하여 최대 encoder.max_pending개 배치를 동시에 인코딩합니다.
+    """
+    pending = deque()
+
+    def resolve(entry):
+        items, keys, vectors, missing, future = entry
+        if future is not None:
+            with stats.timed(len(missing)):
+                computed = future.result()
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+            if cache is not None:
+                cache.put_many([keys[i] for i in missing], computed)
+        return items, (np.stack(vectors) if vectors else [])
+
+    for items in batches:
+        texts = [c["chunk_text"] for item in items for c in item["chunks"]]
+        keys = [chunk_hash(text) for text in texts] if cache is not None else []
+        if cache is not None:
+            found, missing = cache.lookup(keys)
+        else:
+            found, missing = {}, list(range(len(texts)))
+        vectors = [found.get(i) for i in range(len(texts))]
+        future = encoder.submit([texts[i] for i in missing]) if missing else None
+        pending.append((items, keys, vectors, missing, future))
+        if len(pending) >= encoder.max_pending:
+            yield resolve(pending.popleft())
+    while pending:
+        yield resolve(pending.popleft())
+
+
+def write_batches(
+    conn,
+    batches: Iterable[Tuple[List[Item], Any]],
+    stats: StageStats,
+    run_id: str,
+    index_version: str,
+    tables: IndexTables = BASE_TABLES,
+    loader=copy_rows,
+    on_batch=None,
+):
+    """
+    [write] 배치마다 한 트랜잭션으로 적재합니다.
+    변경된 판례는 기존 청크를 지우고 새 청크를 넣으며, 모든 판례를 이번 실행에서 확인된 것으로 기록합니다.
+    실제 행 적재는 loader(copy_rows / insert_rows)가 담당합니다.
+    """
+    with conn.cursor() as cur:
+        for items, embeds in batches:
+            # 같은 case_id가 한 배치에 여러 번 있으면 마지막 사본만 적재합니다. (두 loader 공통)
+            pending = [item for item in items if item["action"] != ACTION_SKIP]
+            latest = {item["case_id"]: n for n, item in enumerate(pending)}
+            to_write, chunk_rows = [], []
+            i = 0
+            for n, item in enumerate(pending):
+                keep = latest[item["case_id"]] == n
+                if keep:
+                    to_write.append(item)
+                for c in item["chunks"]:
+                    if keep:
+                        chunk_rows.append((c["case_id"], c["chunk_index"], c["section"], c["chunk_text"],
+                                           embeds[i], len(c["chunk_text"].split())))
+                    i += 1
+
+            with stats.timed(len(to_write) + len(chunk_rows)):
+                replaced = [item["case_id"] for item in to_write if item["action"] == ACTION_REPLACE]
+                if replaced:
+                    cur.execute(f"DELETE FROM {tables.chunks} WHERE case_id = ANY(%s)", (replaced,))
+                case_rows = [item["row"] + (item["content_hash"], index_version) for item in to_write]
+                loader(cur, tables, case_rows, chunk_rows)
+                execute_values(cur, """
+                    INSERT INTO legal_index_run_cases (run_id, case_id) VALUES %s
+                    ON CONFLICT DO NOTHING
+                """, [(run_id, item["case_id"]) for item in items])
+                conn.commit()
+            if on_batch:
+                on_batch(items, len(chunk_rows))
+
+
+def delete_missing_cases(cur, run_id: str, cases_table: str = BASE_TABLES.cases) -> int:
+    """이번 실행에서 확인되지 않은(원본에서 삭제된) 판례를 제거합니다. (청크는 CASCADE)"""
+    cur.execute(f"""
+        DELETE FROM {cases_table} lc
+        WHERE NOT EXISTS (
+            SELECT 1 FROM legal_index_run_cases r
+            WHERE r.run_id = %s AND r.case_id = lc.case_id
+        )
+    """, (run_id,))
+    return cur.rowcount
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="판례 벡터 인덱스 구축")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="전처리된 판례 JSON 디렉터리")
+    parser.add_argument("--model-name", default=EMBEDDING_MODEL, help="임베딩 모델 이름")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="임베딩/적재 배치 크기(청크 수)")
+    parser.add_argument("--workers", type=int, default=1, help="임베딩 워커 프로세스 수")
+    parser.add_argument("--embedding-cache", default=EMBEDDING_CACHE_DIR,
+                        help="임베딩 디스크 캐시 디렉터리 (빈 값이면 사용 안 함)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="본문 청크 길이(문자)")
+    parser.add_argument("--chunk-overlap", type=int, default=CHUNK_OVERLAP, help="청크 간 중첩 길이(문자)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="재개용 체크포인트 파일 경로 (빈 값이면 사용 안 함)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--keep-missing", action="store_true", help="원본에서 사라진 판례를 삭제하지 않음")
+    parser.add_argument("--delta", default=None,
+                        help="증분 전처리 delta 레이어만 적용 (latest 또는 레이어 ID, 삭제는 delta의 삭제 목록으로 처리)")
+    parser.add_argument("--report-every", type=int, default=REPORT_EVERY, help="처리량 로그 출력 간격(배치 수)")
+    parser.add_argument("--loader", choices=sorted(LOADERS), default="copy", help="적재 방식 (기본값: 바이너리 COPY)")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="적재 동안 legal_chunks 보조 인덱스를 삭제하고 완료 후 재생성 (빈 테이블이면 자동)")
+    parser.add_argument("--skip-hnsw", action="store_true", help="HNSW 인덱스 생성 생략")
+    parser.add_argument("--blue-green", action="store_true", help="새 버전 섀도 테이블에 구축 후 검증하여 전환")
+    parser.add_argument("--min-recall", type=float, default=0.9, help="전환 조건: HNSW recall@10 샘플 최소값")
+    parser.add_argument("--max-shrink", type=float, default=0.05, help="전환 조건: 활성 버전 대비 허용 판례 감소율")
+    parser.add_argument("--keep-versions", type=int, default=1, help="보관할 이전(retired/failed) 버전 수")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger()
+    data_dir = os.path.abspath(args.data_dir)
+    index_version = make_index_version(args.model_name, args.chunk_size, args.chunk_overlap)
+    if args.delta and args.blue_green:
+        raise SystemExit("--delta 는 활성 버전을 갱신하므로 --blue-green 과 함께 사용할 수 없습니다.")
+    manifest = read_manifest(data_dir)
+    delta_layer = resolve_delta_layer(manifest, args.delta) if args.delta else None
+    delta_id = manifest["layers"][delta_layer]["id"] if delta_layer is not None else None
+
+    checkpoint = None if args.restart else load_checkpoint(args.checkpoint, index_version, data_dir)
+    if checkpoint and (bool(checkpoint.get("version")) != args.blue_green or checkpoint.get("delta") != delta_id):
+        logger.info("체크포인트의 실행 모드(blue/green, delta)가 달라 처음부터 시작합니다.")
+        checkpoint = None
+    if checkpoint:
+        logger.info(f"--- 인덱싱 재개 --- run_id={checkpoint['run_id']}, after={checkpoint.get('last_source')}")
+    else:
+        checkpoint = {"run_id": uuid.uuid4().hex, "index_version": index_version,
+                      "data_dir": data_dir, "last_source": None, "version": None, "delta": delta_id}
+        logger.info(f"--- 인덱싱 시작 --- run_id={checkpoint['run_id']}, index_version={index_version}")
+
+    encoder = EmbeddingEncoder(args.model_name, workers=args.workers, batch_size=args.batch_size)
+    cache = EmbeddingCache(args.embedding_cache, args.model_name) if args.embedding_cache else None
+
+    parse_stats = StageStats("parse", "docs")
+    diff_stats = StageStats("diff", "cases")
+    chunk_stats = StageStats("chunk", "chunks")
+    embed_stats = StageStats("embed", "chunks")
+    write_stats = StageStats("write", "rows")
+    index_stats = StageStats("index", "idx")
+    stages = (parse_stats, diff_stats, chunk_stats, embed_stats, write_stats, index_stats)
+    counts = {ACTION_INSERT: 0, ACTION_REPLACE: 0, ACTION_SKIP: 0}
+
+    conn = get_psycopg2_connection()
+    register_vector(conn)
+    try:
+        with conn.cursor() as cur:
+            ensure_schema(cur)
+            index_versions.ensure_version_schema(cur)
+            if args.loader == "copy":
+                ensure_staging_tables(cur)
+
+            if args.blue_green:
+                version = checkpoint.get("version")
+                if not version or index_versions.get_version_status(cur, version) != index_versions.STATUS_BUILDING:
+                    version = index_versions.new_version_name()
+                    index_versions.create_shadow_version(cur, version, index_version)
+                    checkpoint.update(version=version, last_source=None, deferred_indexes=[])
+                # 구축이 끝날 때까지(연결이 유지되는 동안) 다른 실행의 gc_versions가 이 버전을 지우지 않도록 잠금
+                if not index_versions.lock_building_version(cur, version):
+                    raise SystemExit(f"다른 프로세스가 인덱스 버전 {version}을 구축 중입니다.")
+                tables = index_versions.tables_for(version)
+            else:
+                tables = index_versions.tables_for(index_versions.get_active_version(cur))
+            logger.info(f"적재 대상 테이블: {tables.cases}, {tables.chunks}")
+
+            cur.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {tables.chunks})")
+            initial_load = cur.fetchone()[0]
+            if args.defer_indexes or initial_load:
+                # 재개 시에는 이전 실행에서 삭제한 인덱스 정의를 체크포인트에서 이어받습니다.
+                deferred = checkpoint.get("deferred_indexes", []) + drop_secondary_indexes(cur, tables.chunks)
+                checkpoint["deferred_indexes"] = list(dict.fromkeys(deferred))
+                logger.info(f"적재 후 생성할 보조 인덱스: {len(checkpoint['deferred_indexes'])}개")
         conn.commit()
+        save_checkpoint(args.checkpoint, checkpoint)
+
+        progress = tqdm(desc="판례 처리", unit="case")
+        batch_count = 0
+
+        def on_batch(items: List[Item], n_chunks: int):
+            nonlocal batch_count
+            batch_count += 1
+            for item in items:
+                counts[item["action"]] += 1
+            checkpoint["last_source"] = items[-1]["source"]
+            save_checkpoint(args.checkpoint, checkpoint)
+            progress.update(len(items))
+            if args.report_every and batch_count % args.report_every == 0:
+                log_stage_report(stages, f"{batch_count}개 배치 처리 {counts}")
+
+        parsed = iter_cases(data_dir, parse_stats, after=checkpoint["last_source"], delta_layer=delta_layer)
+        diffed = diff_cases(parsed, conn, index_version, diff_stats, tables=tables)
+        chunked = chunk_cases(diffed, chunk_stats, args.chunk_size, args.chunk_overlap)
+        batches = batch_items(chunked, args.batch_size)
+        embedded = embed_batches(batches, encoder, embed_stats, cache)
+        write_batches(conn, embedded, write_stats, checkpoint["run_id"], index_version,
+                      tables=tables, loader=LOADERS[args.loader], on_batch=on_batch)
+        progress.close()
+        logger.info(f"적재({args.loader}): {write_stats.count} rows, {write_stats.rate:.1f} rows/s")
+        if cache is not None:
+            cache.flush()
+            logger.info(f"임베딩 캐시: hit={cache.hits}, miss={cache.misses}, 저장된 벡터={len(cache)}")
+
+        with conn.cursor() as cur:
+            if delta_layer is not None:
+                deleted_ids = manifest["layers"][delta_layer]["deleted"]
+                cur.execute(f"DELETE FROM {tables.cases} WHERE case_id = ANY(%s)", (deleted_ids,))
+                logger.info(f"delta에서 삭제된 판례 {cur.rowcount}건 제거")
+            elif not args.keep_missing:
+                deleted = delete_missing_cases(cur, checkpoint["run_id"], tables.cases)
+                logger.info(f"원본에서 삭제된 판례 {deleted}건 제거")
+            cur.execute("DELETE FROM legal_index_run_cases WHERE run_id = %s", (checkpoint["run_id"],))
+            conn.commit()
+
+            deferred = checkpoint.get("deferred_indexes", [])
+            if args.skip_hnsw:
+                deferred = [d for d in deferred if "USING hnsw" not in d]
+            with index_stats.timed(len(deferred)):
+                recreate_indexes(cur, deferred)
+                if not args.skip_hnsw:
+                    create_hnsw_index(cur, tables.chunks)
+                conn.commit()
+        log_stage_report(stages, f"단계별 처리량 {counts}")
+
+        if args.blue_green:
+            version = checkpoint["version"]
+            report = index_versions.validate_version(conn, version, args.min_recall, args.max_shrink)
+            logger.info(f"인덱스 버전 검증 {version}: {report}")
+            if not report["ok"]:
+                index_versions.mark_failed(conn, version)
+                index_versions.gc_versions(conn, args.keep_versions)
+                if args.checkpoint and os.path.exists(args.checkpoint):
+                    os.remove(args.checkpoint)
+                raise SystemExit(f"인덱스 버전 {version} 검증 실패로 전환하지 않습니다: {report['errors']}")
+            index_versions.activate_version(conn, version)
+            index_versions.gc_versions(conn, args.keep_versions)
+
+        if args.checkpoint and os.path.exists(args.checkpoint):
+            os.remove(args.checkpoint)
         logger.info("--- 완료 ---")
 
     finally:
-        if cur:  cur.close()
-        if conn: conn.close()
+        conn.close()
+        encoder.close()
+        if cache is not None:
+            cache.close()
 
 if __name__ == "__main__":
     main()
-
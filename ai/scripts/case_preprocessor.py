@@ -1,132 +1,439 @@
+"""
+판례 원본 전처리 스크립트
+
+RAW_DATA_DIR 아래의 원본 판례 JSON을 정규화하고 사건번호(case_id) 기준으로 중복을 제거합니다.
+원본 파싱은 프로세스 풀에서 병렬로 수행하며, 결과는 파일 순서대로 받아 처음 등장한 사건만 남깁니다.
+
+출력 형식 (--format)
+- jsonl:   zstd 압축 JSONL 샤드 + manifest.json (기본값, scripts/case_shards.py)
+- parquet: zstd 압축 Parquet 샤드 + manifest.json (pyarrow 필요)
+- json:    판례당 JSON 파일 하나 (이전 형식)
+
+증분 전처리
+- 출력 디렉터리의 raw_manifest.jsonl에 원본 파일별 경로, 크기, mtime, sha256, 생성한 case_id를 기록합니다.
+- 다시 실행하면 크기/mtime이 바뀐 파일만 해시를 확인하고, 내용이 바뀐 파일만 다시 파싱합니다.
+- 변경/추가된 판례와 삭제된 판례를 delta 레이어로 기록합니다. (build_index.py --delta 로 적용)
+- delta 레이어가 MAX_DELTA_LAYERS개를 넘거나 --compact 이면 살아있는 판례만 모아 base 샤드로 다시 씁니다.
+- --full 이면 manifest를 무시하고 전체를 다시 처리합니다.
+
+사용 예:
+    python scripts/case_preprocessor.py --workers 8 --format jsonl --shard-size 10000
+"""
+import sys
 import os
-import json
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import argparse
 import glob
+import hashlib
+import json
 import re
-from datetime import datetime
+import time
 from collections import Counter
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
 from tqdm import tqdm
+
+from scripts.case_shards import (
+    FORMAT_JSONL,
+    FORMAT_PARQUET,
+    ShardWriter,
+    compact_shards,
+    new_layer,
+    read_manifest,
+    remove_shards,
+    remove_unlisted_shards,
+    write_manifest,
+)
 from utils.logger import setup_logger, get_logger
 
-# 로거 설정
-setup_logger()
 logger = get_logger(__name__)
 
 # --------- 설정 ---------
-RAW_DATA_DIR     = "F:/S13P11B204/ai/data/raw"
-PREPROCESSED_DIR = "F:/S13P11B204/ai/data/preprocessed"
+PROJECT_ROOT     = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+RAW_DATA_DIR     = os.path.join(PROJECT_ROOT, "data", "raw")
+PREPROCESSED_DIR = os.path.join(PROJECT_ROOT, "data", "preprocessed")
+SHARD_SIZE       = 10000
+IMAP_CHUNKSIZE   = 64
+FORMAT_JSON      = "json"
+RAW_MANIFEST_NAME = "raw_manifest.jsonl"
+MAX_DELTA_LAYERS = 20
 # ------------------------
 
+# 모듈 로드 시 한 번만 컴파일 (워커 프로세스에서도 재사용)
+_GROUP_SPLIT = re.compile(r'(?=\[\d+\])')
+_DATE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d")
+
+
 def parse_date(date_str):
     """
     날짜 문자열을 ISO 포맷으로 변환. 지원 형식: YYYY-MM-DD, YYYY.MM.DD
     실패 시 원본 문자열 반환.
     """
-    for fmt in ("%Y-%m-%d", "%Y.%m.%d"):
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).date().isoformat()
         except ValueError:
             continue
     return date_str
 
+
+def _split_groups(text: str) -> List[str]:
+    """[1], [2] ... 단위로 참조조문/참조판례를 분리합니다."""
+    return [g.replace('\n', ' ').strip() for g in _GROUP_SPLIT.split(text) if g.strip()]
+
+
+def normalize_case(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """원본 판례 JSON을 전처리 형식으로 변환합니다. 사건번호가 없으면 None"""
+    case_id = raw.get('사건번호', '').strip()
+    if not case_id:
+        return None
+
+    statutes_raw   = (raw.get('참조조문')  or '').replace('【참조조문】', '').strip()
+    precedents_raw = (raw.get('참조판례')  or '').replace('【참조판례】', '').strip()
+
+    return {
+        'case_id':       case_id,
+        'title':         raw.get('사건명', '').strip(),
+        'decision_date': parse_date(raw.get('선고일자', '').strip()),
+        'category':      raw.get('사건종류명', '').strip(),
+        'issue':         (raw.get('판시사항')  or '').replace('【판시사항】', '').strip(),
+        'summary':       (raw.get('판결요지')  or '').replace('【판결요지】', '').strip(),
+        'full_text':     (raw.get('판례내용')  or '').replace('【전문】', '').strip(),
+        'statutes':      _split_groups(statutes_raw),
+        'precedents':    _split_groups(precedents_raw),
+    }
+
+
+def _parse_bytes(filepath: str, data: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        raw = json.loads(data)
+    except Exception as e:
+        logger.warning(f"Failed to load {filepath}: {e}")
+        return None
+
+    case = normalize_case(raw)
+    if case is None:
+        logger.warning(f"No case number in {filepath}")
+    return case
+
+
+def parse_raw_file(filepath: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """원본 파일 하나를 읽어 (경로, 전처리된 판례 또는 None)을 반환합니다. (워커 프로세스에서 실행)"""
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"Failed to load {filepath}: {e}")
+        return filepath, None
+    return filepath, _parse_bytes(filepath, data)
+
+
+def scan_raw_file(task: Tuple[str, Optional[str]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]:
+    """
+    원본 파일의 manifest 항목을 만들고, 내용 해시가 known_hash와 다를 때만 파싱합니다. (워커 프로세스에서 실행)
+    반환값: (manifest 항목, 전처리된 판례 또는 None, 내용 변경 여부)
+    """
+    filepath, known_hash = task
+    try:
+        st = os.stat(filepath)
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"Failed to load {filepath}: {e}")
+        return {"path": filepath, "size": -1, "mtime_ns": -1, "sha256": None, "case_id": None}, None, True
+    entry = {"path": filepath, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+             "sha256": hashlib.sha256(data).hexdigest(), "case_id": None}
+    if entry["sha256"] == known_hash:
+        return entry, None, False
+    case = _parse_bytes(filepath, data)
+    entry["case_id"] = case["case_id"] if case else None
+    return entry, case, True
+
+
+def _imap(func, tasks: List[Any], workers: int, chunksize: int = IMAP_CHUNKSIZE) -> Iterator[Any]:
+    """순서를 유지하며 tasks를 처리합니다. workers > 1이면 프로세스 풀을 사용합니다."""
+    if workers <= 1:
+        yield from map(func, tasks)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap(func, tasks, chunksize=chunksize)
+
+
+def iter_parsed(files: List[str], workers: int, chunksize: int = IMAP_CHUNKSIZE) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """파일 순서를 유지하며 원본 파일을 파싱합니다. workers > 1이면 프로세스 풀을 사용합니다."""
+    yield from _imap(parse_raw_file, files, workers, chunksize)
+
+
+# ─────────────── 원본 manifest / delta ───────────────
+
+def load_raw_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    entries = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["path"]] = entry
+    return entries
+
+
+def save_raw_manifest(path: str, entries: Dict[str, Dict[str, Any]]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for file_path in sorted(entries):
+            f.write(json.dumps(entries[file_path], ensure_ascii=False))
+            f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def case_winners(entries: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """case_id별로 판례를 제공하는 원본 파일 (전체 전처리와 같이 경로 순서상 첫 파일)"""
+    winners: Dict[str, str] = {}
+    for file_path in sorted(entries):
+        case_id = entries[file_path].get("case_id")
+        if case_id and case_id not in winners:
+            winners[case_id] = file_path
+    return winners
+
+
+def compute_delta(
+    old_entries: Dict[str, Dict[str, Any]],
+    new_entries: Dict[str, Dict[str, Any]],
+    changed_paths: Iterable[str],
+) -> Tuple[Dict[str, str], List[str]]:
+    """
+    이전/현재 manifest를 비교하여 ({변경·추가된 case_id: 원본 경로}, 삭제된 case_id 목록)을 반환합니다.
+    제공 파일이 바뀌었거나 제공 파일의 내용이 바뀐 판례를 변경된 것으로 봅니다.
+    """
+    changed = set(changed_paths)
+    old_winners, new_winners = case_winners(old_entries), case_winners(new_entries)
+    upserts = {case_id: path for case_id, path in new_winners.items()
+               if old_winners.get(case_id) != path or path in changed}
+    deleted = sorted(set(old_winners) - set(new_winners))
+    return upserts, deleted
+
+
+def iter_unique_cases(parsed: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> Iterator[Dict[str, Any]]:
+    """사건번호 기준으로 처음 등장한 판례만 반환합니다. (사건번호 집합만 메모리에 유지)"""
+    seen = set()
+    for _, case in parsed:
+        if case is None or case['case_id'] in seen:
+            continue
+        seen.add(case['case_id'])
+        yield case
+
+
 def get_unique_cases(files):
     """
     파일 목록을 순회하며 JSON을 로드하고,
     사건번호(case_id) 기준으로 중복 제거된 dict 반환.
     """
-    cases = {}
-    for filepath in files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                raw = json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load {filepath}: {e}")
-            continue
+    return {case['case_id']: case for case in iter_unique_cases(map(parse_raw_file, files))}
 
-        case_id = raw.get('사건번호', '').strip()
-        if not case_id:
-            logger.warning(f"No case number in {filepath}")
-            continue
-        if case_id in cases:
-            continue
 
-        title         = raw.get('사건명', '').strip()
-        decision_date = parse_date(raw.get('선고일자', '').strip())
-        category      = raw.get('사건종류명', '').strip()
-        issue         = (raw.get('판시사항')  or '').replace('【판시사항】', '').strip()
-        summary       = (raw.get('판결요지')  or '').replace('【판결요지】', '').strip()
-        full_text     = (raw.get('판례내용')  or '').replace('【전문】', '').strip()
-
-        # 참조조문 분리
-        statutes_raw    = (raw.get('참조조문')  or '').replace('【참조조문】', '').strip()
-        statute_groups  = re.split(r'(?=\[\d+\])', statutes_raw)
-        statutes        = [g.replace('\n', ' ').strip() for g in statute_groups if g.strip()]
-
-        # 참조판례 분리
-        precedents_raw   = (raw.get('참조판례')  or '').replace('【참조판례】', '').strip()
-        precedent_groups = re.split(r'(?=\[\d+\])', precedents_raw)
-        precedents       = [g.replace('\n', ' ').strip() for g in precedent_groups if g.strip()]
-
-        cases[case_id] = {
-            'case_id':       case_id,
-            'title':         title,
-            'decision_date': decision_date,
-            'category':      category,
-            'issue':         issue,
-            'summary':       summary,
-            'full_text':     full_text,
-            'statutes':      statutes,
-            'precedents':    precedents,
+class CaseStats:
+    """전처리 결과 통계 (날짜 범위, 카테고리 분포)를 스트리밍으로 집계합니다."""
+
+    def __init__(self):
+        self.total_unique = 0
+        self.min_date = None
+        self.max_date = None
+        self.categories = Counter()
+
+    def add(self, case: Dict[str, Any]):
+        self.total_unique += 1
+        self.categories[case['category']] += 1
+        try:
+            decision_date = datetime.fromisoformat(case['decision_date']).date()
+        except ValueError:
+            return
+        if self.min_date is None or decision_date < self.min_date:
+            self.min_date = decision_date
+        if self.max_date is None or decision_date > self.max_date:
+            self.max_date = decision_date
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_unique": self.total_unique,
+            "decision_date_min": self.min_date.isoformat() if self.min_date else None,
+            "decision_date_max": self.max_date.isoformat() if self.max_date else None,
+            "categories": dict(self.categories),
         }
-    return cases
 
-def main():
-    # 출력 디렉터리 준비
-    if not os.path.exists(PREPROCESSED_DIR):
-        os.makedirs(PREPROCESSED_DIR)
 
-    # 원본 JSON 파일 모두 검색
-    files = glob.glob(os.path.join(RAW_DATA_DIR, '**', '*.json'), recursive=True)
-    logger.info(f"Found {len(files)} raw files.")
+def write_json_file(output_dir: str, case: Dict[str, Any]):
+    out_path = os.path.join(output_dir, f"{case['case_id']}.json")
+    try:
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(case, f, ensure_ascii=False, indent=4)
+    except Exception as e:
+        logger.error(f"Failed to write {out_path}: {e}")
 
-    # 중복 제거된 사건 데이터 로드
-    unique_cases = get_unique_cases(files)
-    total_raw    = len(files)
-    total_unique = len(unique_cases)
 
-    # 날짜 범위 계산
-    dates = []
-    for c in unique_cases.values():
-        try:
-            dates.append(datetime.fromisoformat(c['decision_date']).date())
-        except ValueError:
-            continue
-    if dates:
-        min_date, max_date = min(dates), max(dates)
-    else:
-        min_date = max_date = None
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="판례 원본 전처리")
+    parser.add_argument("--raw-dir", default=RAW_DATA_DIR, help="원본 판례 JSON 디렉터리")
+    parser.add_argument("--output-dir", default=PREPROCESSED_DIR, help="전처리 결과 디렉터리")
+    parser.add_argument("--format", choices=[FORMAT_JSONL, FORMAT_PARQUET, FORMAT_JSON], default=FORMAT_JSONL,
+                        help="출력 형식 (기본값: zstd 압축 JSONL 샤드)")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="샤드당 판례 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="파싱 프로세스 수")
+    parser.add_argument("--full", action="store_true", help="원본 manifest를 무시하고 전체를 다시 처리")
+    parser.add_argument("--compact", action="store_true", help="delta 레이어를 base 샤드로 합치기")
+    return parser.parse_args(argv)
 
-    # 카테고리 분포 집계
-    category_counts = Counter(c['category'] for c in unique_cases.values())
 
-    # 통계 로깅
+def log_summary(summary: Dict[str, Any]):
     logger.info("Version: 1.0")
     logger.info(f"Date: {datetime.now().date().isoformat()}")
-    logger.info(f"Total records (raw): {total_raw}")
-    logger.info(f"Total records (deduplicated): {total_unique}")
-    if min_date and max_date:
-        logger.info(f"Decision date range: {min_date.isoformat()} ~ {max_date.isoformat()}")
+    logger.info(f"Total records (raw): {summary['total_raw']}")
+    logger.info(f"Total records (deduplicated): {summary['total_unique']}")
+    if summary.get('decision_date_min') and summary.get('decision_date_max'):
+        logger.info(f"Decision date range: {summary['decision_date_min']} ~ {summary['decision_date_max']}")
     logger.info("Category distribution:")
-    for cat, cnt in category_counts.items():
+    for cat, cnt in summary.get('categories', {}).items():
         logger.info(f"  {cat}: {cnt}")
 
-    # 전처리된 JSON 파일로 저장 (진행 상황 표시)
-    for case_id, case_data in tqdm(unique_cases.items(), desc="전처리 진행"):
-        out_path = os.path.join(PREPROCESSED_DIR, f"{case_id}.json")
-        try:
-            with open(out_path, 'w', encoding='utf-8') as f:
-                json.dump(case_data, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            logger.error(f"Failed to write {out_path}: {e}")
+
+def run_full(args, files: List[str], run_id: str) -> Dict[str, Dict[str, Any]]:
+    """전체 전처리: 모든 원본을 파싱하여 base 레이어(또는 판례별 JSON)로 기록하고 원본 manifest를 반환합니다."""
+    stats = CaseStats()
+    entries: Dict[str, Dict[str, Any]] = {}
+    writer = None
+    if args.format != FORMAT_JSON:
+        writer = ShardWriter(args.output_dir, args.format, args.shard_size, prefix=f"base-{run_id}")
+
+    def parsed():
+        tasks = [(path, None) for path in files]
+        for entry, case, _ in tqdm(_imap(scan_raw_file, tasks, args.workers), total=len(tasks), desc="전처리 진행"):
+            entries[entry["path"]] = entry
+            yield entry["path"], case
+
+    for case in iter_unique_cases(parsed()):
+        stats.add(case)
+        if writer is None:
+            write_json_file(args.output_dir, case)
+        else:
+            writer.write(case)
+
+    summary = {"total_raw": len(files), **stats.to_dict()}
+    if writer is not None:
+        shards = writer.close()
+        write_manifest(args.output_dir, args.format, shards, summary, [new_layer(run_id)])
+        removed = remove_unlisted_shards(args.output_dir, read_manifest(args.output_dir))
+        logger.info(f"Shards: {len(shards)} ({sum(s['bytes'] for s in shards) / 1024 / 1024:.1f} MB), "
+                    f"이전 샤드 {removed}개 삭제")
+    log_summary(summary)
+    return entries
+
+
+def run_incremental(args, files: List[str], old_entries: Dict[str, Dict[str, Any]], run_id: str) -> Dict[str, Dict[str, Any]]:
+    """증분 전처리: 바뀐 원본만 파싱하여 delta를 기록하고 새 원본 manifest를 반환합니다."""
+    new_entries: Dict[str, Dict[str, Any]] = {}
+    tasks = []
+    for path in files:
+        st = os.stat(path)
+        old = old_entries.get(path)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            new_entries[path] = old
+        else:
+            tasks.append((path, old["sha256"] if old else None))
+
+    cases: Dict[str, Dict[str, Any]] = {}
+    changed_paths = []
+    for entry, case, changed in tqdm(_imap(scan_raw_file, tasks, args.workers), total=len(tasks), desc="변경 확인"):
+        path = entry["path"]
+        if changed:
+            new_entries[path] = entry
+            changed_paths.append(path)
+            if case:
+                cases[path] = case
+        else:
+            new_entries[path] = {**old_entries[path], "size": entry["size"], "mtime_ns": entry["mtime_ns"]}
+
+    upserts, deleted = compute_delta(old_entries, new_entries, changed_paths)
+    # 기존 파일이 새로 판례를 제공하게 된 경우(이전 제공 파일 삭제 등) 그 파일만 다시 파싱합니다.
+    reparse = sorted(path for path in set(upserts.values()) if path not in cases)
+    for path, case in _imap(parse_raw_file, reparse, args.workers):
+        if case:
+            cases[path] = case
+    logger.info(f"원본 {len(files)}개 중 확인 {len(tasks)}개, 내용 변경 {len(changed_paths)}개 "
+                f"→ 판례 변경/추가 {len(upserts)}건, 삭제 {len(deleted)}건")
+    if not upserts and not deleted:
+        return new_entries
+
+    upsert_cases = [cases[path] for _, path in sorted(upserts.items(), key=lambda item: item[1]) if path in cases]
+    if args.format == FORMAT_JSON:
+        for case in upsert_cases:
+            write_json_file(args.output_dir, case)
+        for case_id in deleted:
+            out_path = os.path.join(args.output_dir, f"{case_id}.json")
+            if os.path.exists(out_path):
+                os.remove(out_path)
+        return new_entries
+
+    manifest = read_manifest(args.output_dir)
+    layer = len(manifest["layers"])
+    writer = ShardWriter(args.output_dir, manifest["format"], args.shard_size, prefix=f"delta-{run_id}", layer=layer)
+    for case in upsert_cases:
+        writer.write(case)
+    layers = manifest["layers"] + [new_layer(run_id, [c["case_id"] for c in upsert_cases], deleted)]
+    stats = {**manifest.get("stats", {}), "total_raw": len(files), "total_unique": len(case_winners(new_entries))}
+    write_manifest(args.output_dir, manifest["format"], manifest["shards"] + writer.close(), stats, layers)
+    logger.info(f"delta 레이어 기록: {run_id} (layer={layer})")
+    return new_entries
+
+
+def run_compact(args, run_id: str):
+    """delta 레이어를 합쳐 살아있는 판례만 새 base 레이어로 기록합니다."""
+    manifest = read_manifest(args.output_dir)
+    stats = CaseStats()
+    shards = compact_shards(args.output_dir, manifest, args.shard_size, run_id, on_case=stats.add)
+    summary = {**manifest.get("stats", {}), **stats.to_dict()}
+    write_manifest(args.output_dir, manifest["format"], shards, summary, [new_layer(run_id)])
+    removed = remove_unlisted_shards(args.output_dir, read_manifest(args.output_dir))
+    logger.info(f"샤드 압축 완료: 레이어 {len(manifest['layers'])}개 → 1개, 샤드 {len(shards)}개 (삭제 {removed}개)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger()
+    os.makedirs(args.output_dir, exist_ok=True)
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    raw_manifest_path = os.path.join(args.output_dir, RAW_MANIFEST_NAME)
+
+    # 원본 JSON 파일 모두 검색 (정렬하여 중복 사건 중 어떤 파일을 남길지 결정적으로)
+    files = sorted(glob.iglob(os.path.join(args.raw_dir, '**', '*.json'), recursive=True))
+    logger.info(f"Found {len(files)} raw files. (workers={args.workers}, format={args.format})")
+
+    old_entries = {} if args.full else load_raw_manifest(raw_manifest_path)
+    manifest = read_manifest(args.output_dir)
+    if args.format == FORMAT_JSON and manifest is not None:
+        # build_index는 manifest를 먼저 확인하므로 남겨두면 판례별 JSON 대신 이전 샤드를 색인합니다.
+        removed = remove_shards(args.output_dir, manifest)
+        logger.info(f"판례별 JSON으로 다시 처리합니다. (기존 manifest와 샤드 {removed}개 삭제)")
+        old_entries, manifest = {}, None
+    if old_entries and args.format != FORMAT_JSON and (manifest is None or manifest["format"] != args.format):
+        logger.info("출력 형식이 기존 샤드와 달라 전체를 다시 처리합니다.")
+        old_entries = {}
+
+    start = time.perf_counter()
+    if old_entries:
+        entries = run_incremental(args, files, old_entries, run_id)
+    else:
+        entries = run_full(args, files, run_id)
+    save_raw_manifest(raw_manifest_path, entries)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Elapsed: {elapsed:.1f}s ({len(files) / elapsed if elapsed else 0:.1f} files/s)")
+
+    manifest = read_manifest(args.output_dir)
+    if manifest and (args.compact or len(manifest["layers"]) > MAX_DELTA_LAYERS + 1):
+        run_compact(args, run_id)
 
 if __name__ == "__main__":
     main()
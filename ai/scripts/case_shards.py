@@ -0,0 +1,230 @@
+"""
+전처리된 판례 샤드 입출력
+
+판례 하나당 JSON 파일 하나 대신, 여러 판례를 압축된 샤드 파일에 모아 저장합니다.
+- jsonl:   한 줄에 판례 하나, zstd 압축 (.jsonl.zst)
+- parquet: zstd 압축 Parquet (.parquet, pyarrow 필요)
+
+출력 디렉터리의 manifest.json에 샤드 목록과 통계를 기록하며,
+build_index.py는 manifest가 있는 디렉터리를 샤드 모드로 읽습니다.
+
+레이어
+- 전체 전처리 결과는 레이어 0(base), 증분 전처리 결과는 그 위의 delta 레이어로 기록합니다.
+- delta 레이어는 변경/추가된 판례(case_ids)와 삭제된 판례(deleted)를 함께 기록하며,
+  읽을 때 더 위 레이어에서 변경/삭제된 판례는 건너뜁니다.
+- compact_shards()는 살아있는 판례만 모아 새 base 레이어로 다시 씁니다.
+"""
+import io
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+FORMAT_JSONL, FORMAT_PARQUET = "jsonl", "parquet"
+SHARD_EXTENSIONS = {FORMAT_JSONL: ".jsonl.zst", FORMAT_PARQUET: ".parquet"}
+ZSTD_LEVEL = 3
+
+CASE_FIELDS = ("case_id", "title", "decision_date", "category", "issue",
+               "summary", "full_text", "statutes", "precedents")
+
+
+def _parquet_modules():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("parquet 형식을 사용하려면 pyarrow가 필요합니다. (pip install pyarrow)") from e
+    return pa, pq
+
+
+class ShardWriter:
+    """판례를 shard_size개씩 샤드 파일로 나누어 기록합니다."""
+
+    def __init__(self, output_dir: str, fmt: str = FORMAT_JSONL, shard_size: int = 10000,
+                 prefix: str = "cases", layer: int = 0):
+        if fmt not in SHARD_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 샤드 형식: {fmt}")
+        self.output_dir = output_dir
+        self.format = fmt
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.layer = layer
+        self.shards: List[Dict[str, Any]] = []
+        self._buffer: List[Dict[str, Any]] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, case: Dict[str, Any]):
+        self._buffer.append(case)
+        if len(self._buffer) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        name = f"{self.prefix}-{len(self.shards):05d}{SHARD_EXTENSIONS[self.format]}"
+        path = os.path.join(self.output_dir, name)
+        tmp_path = f"{path}.tmp"
+        if self.format == FORMAT_PARQUET:
+            pa, pq = _parquet_modules()
+            table = pa.Table.from_pylist([{k: c.get(k) for k in CASE_FIELDS} for c in self._buffer])
+            pq.write_table(table, tmp_path, compression="zstd")
+        else:
+            import zstandard
+            with open(tmp_path, "wb") as raw:
+                compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+                with io.TextIOWrapper(compressed, encoding="utf-8") as f:
+                    for case in self._buffer:
+                        f.write(json.dumps(case, ensure_ascii=False, separators=(",", ":")))
+                        f.write("\n")
+        os.replace(tmp_path, path)
+        self.shards.append({"file": name, "cases": len(self._buffer), "bytes": os.path.getsize(path),
+                            "layer": self.layer})
+        self._buffer = []
+
+    def close(self) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.shards
+
+
+def new_layer(layer_id: str, case_ids: Optional[Iterable[str]] = None, deleted: Iterable[str] = ()) -> Dict[str, Any]:
+    """레이어 정보. base 레이어는 case_ids가 None입니다."""
+    return {
+        "id": layer_id,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "case_ids": sorted(case_ids) if case_ids is not None else None,
+        "deleted": sorted(deleted),
+    }
+
+
+def write_manifest(
+    output_dir: str,
+    fmt: str,
+    shards: List[Dict[str, Any]],
+    stats: Dict[str, Any],
+    layers: Optional[List[Dict[str, Any]]] = None,
+):
+    """샤드 목록과 통계를 manifest.json에 원자적으로 기록합니다."""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "format": fmt,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "layers": layers or [new_layer("base")],
+        "shards": shards,
+        "stats": stats,
+    }
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(data_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest.setdefault("layers", [new_layer("base")])
+    return manifest
+
+
+def _overridden_ids(manifest: Dict[str, Any]) -> List[Set[str]]:
+    """레이어별로, 그보다 위 레이어에서 변경/삭제된 판례 ID 집합"""
+    layers = manifest["layers"]
+    overridden: List[Set[str]] = [set() for _ in layers]
+    above: Set[str] = set()
+    for layer in range(len(layers) - 1, -1, -1):
+        overridden[layer] = set(above)
+        above.update(layers[layer].get("case_ids") or ())
+        above.update(layers[layer].get("deleted") or ())
+    return overridden
+
+
+def _read_shard(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == FORMAT_PARQUET:
+        _, pq = _parquet_modules()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=1000):
+            yield from batch.to_pylist()
+        return
+    import zstandard
+    with open(path, "rb") as raw, \
+            io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw), encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_shard_cases(
+    data_dir: str,
+    manifest: Dict[str, Any],
+    after: Optional[str] = None,
+    layers: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    manifest의 샤드를 레이어/파일 순서대로 읽어 살아있는 (source, 판례) 쌍을 반환합니다.
+    source는 "<레이어>:<샤드 경로>:<행 번호>" 형식으로 정렬 순서가 읽는 순서와 같아 재개 지점으로 사용할 수 있습니다.
+    layers를 지정하면 해당 레이어의 샤드만 읽습니다. (delta 적용)
+    """
+    fmt = manifest["format"]
+    overridden = _overridden_ids(manifest)
+    selected = set(layers) if layers is not None else None
+    shards = sorted(manifest["shards"], key=lambda s: (s.get("layer", 0), s["file"]))
+    for shard in shards:
+        layer = shard.get("layer", 0)
+        if selected is not None and layer not in selected:
+            continue
+        path = os.path.join(data_dir, shard["file"])
+        prefix = f"{layer:04d}:{path}"
+        if after is not None and f"{prefix}:{shard['cases'] - 1:09d}" <= after:
+            continue
+        skip_ids = overridden[layer]
+        for row, case in enumerate(_read_shard(path, fmt)):
+            source = f"{prefix}:{row:09d}"
+            if (after is None or source > after) and case.get("case_id") not in skip_ids:
+                yield source, case
+
+
+def remove_unlisted_shards(output_dir: str, manifest: Dict[str, Any]) -> int:
+    """manifest에 없는 샤드 파일을 삭제합니다."""
+    listed = {shard["file"] for shard in manifest["shards"]}
+    removed = 0
+    for name in os.listdir(output_dir):
+        if name.endswith(tuple(SHARD_EXTENSIONS.values())) and name not in listed:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    return removed
+
+
+def remove_shards(output_dir: str, manifest: Dict[str, Any]) -> int:
+    """manifest에 있는 샤드 파일과 manifest.json을 삭제하고 삭제한 샤드 수를 반환합니다."""
+    removed = 0
+    for shard in manifest["shards"]:
+        path = os.path.join(output_dir, shard["file"])
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    os.remove(os.path.join(output_dir, MANIFEST_NAME))
+    return removed
+
+
+def compact_shards(
+    output_dir: str,
+    manifest: Dict[str, Any],
+    shard_size: int,
+    layer_id: str,
+    on_case: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """살아있는 판례만 모아 새 base 레이어 샤드로 다시 쓰고 새 샤드 목록을 반환합니다."""
+    writer = ShardWriter(output_dir, manifest["format"], shard_size, prefix=f"base-{layer_id}")
+    for _, case in iter_shard_cases(output_dir, manifest):
+        if on_case:
+            on_case(case)
+        writer.write(case)
+    return writer.close()
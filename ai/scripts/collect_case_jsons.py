@@ -1,33 +1,215 @@
+"""
+판례 원천 JSON 수집 스크립트
+
+Training / Validation 원천데이터 트리의 JSON 파일을 하나의 디렉터리로 모읍니다.
+- 크기가 같은 파일만 sha256으로 비교하여 내용이 같은 파일은 한 번만 복사하고,
+  나머지는 그 파일에 대한 하드링크로 만듭니다. (--skip-duplicates 이면 생략)
+- 첫 복사본은 가능하면 reflink(copy-on-write)로, 안 되면 일반 복사로 만듭니다.
+- 파일명 충돌은 `이름_N.json` 형식으로 해결하며, 사용 중인 이름을 집합으로 관리합니다.
+- 해시 계산과 복사는 스레드 풀에서 수행하고, 끝나면 절약한 용량과 처리량을 출력합니다.
+
+사용 예:
+    python scripts/collect_case_jsons.py --dest all_json --workers 16
+"""
+import sys
 import os
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import argparse
+import errno
+import hashlib
 import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.logger import setup_logger, get_logger
+
+logger = get_logger(__name__)
 
 # 원본이 들어있는 루트 디렉토리들
-source_roots = [
+SOURCE_ROOTS = [
     'Training/01.원천데이터',
     'Validation/01.원천데이터'
 ]
 
 # 모든 JSON을 모아둘 대상 디렉토리
-dest_dir = 'all_json'
-os.makedirs(dest_dir, exist_ok=True)
-
-for root_dir in source_roots:
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for fname in filenames:
-            if fname.lower().endswith('.json'):
-                src_path = os.path.join(dirpath, fname)
-                dst_path = os.path.join(dest_dir, fname)
-
-                # 중복 파일명 처리
-                if os.path.exists(dst_path):
-                    base, ext = os.path.splitext(fname)
-                    i = 1
-                    while True:
-                        new_name = f"{base}_{i}{ext}"
-                        new_dst = os.path.join(dest_dir, new_name)
-                        if not os.path.exists(new_dst):
-                            dst_path = new_dst
-                            break
-                        i += 1
-
-                shutil.copy2(src_path, dst_path)
+DEST_DIR = 'all_json'
+
+HASH_BLOCK_SIZE = 1 << 20
+FICLONE = 0x40049409  # linux/fs.h
+
+MODE_COPY, MODE_HARDLINK, MODE_REFLINK = "copy", "hardlink", "reflink"
+
+
+class SourceFile:
+    __slots__ = ("path", "name", "size", "digest", "dest", "primary")
+
+    def __init__(self, path: str, name: str, size: int):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.digest: Optional[str] = None
+        self.dest: Optional[str] = None
+        self.primary: Optional["SourceFile"] = None  # 내용이 같은 첫 파일 (자신이 첫 파일이면 None)
+
+
+def scan_sources(source_roots: List[str]) -> List[SourceFile]:
+    """원천 트리에서 JSON 파일을 찾습니다. (정렬하여 실행마다 같은 결과)"""
+    files = []
+    for root_dir in source_roots:
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            dirnames.sort()
+            for fname in sorted(filenames):
+                if fname.lower().endswith('.json'):
+                    src_path = os.path.join(dirpath, fname)
+                    files.append(SourceFile(src_path, fname, os.path.getsize(src_path)))
+    return files
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def mark_duplicates(files: List[SourceFile], executor: ThreadPoolExecutor) -> int:
+    """
+    내용이 같은 파일을 찾아 primary를 지정하고 중복 파일 수를 반환합니다.
+    크기가 유일한 파일은 중복일 수 없으므로 해시를 계산하지 않습니다.
+    """
+    by_size: Dict[int, List[SourceFile]] = defaultdict(list)
+    for f in files:
+        by_size[f.size].append(f)
+    candidates = [f for group in by_size.values() if len(group) > 1 for f in group]
+    for f, digest in zip(candidates, executor.map(lambda f: file_digest(f.path), candidates)):
+        f.digest = digest
+
+    first: Dict[Tuple[int, str], SourceFile] = {}
+    duplicates = 0
+    for f in files:
+        if f.digest is None:
+            continue
+        key = (f.size, f.digest)
+        if key in first:
+            f.primary = first[key]
+            duplicates += 1
+        else:
+            first[key] = f
+    return duplicates
+
+
+def assign_dest_names(files: List[SourceFile], dest_dir: str):
+    """파일명 충돌을 `이름_N.json`으로 해결하여 대상 경로를 정합니다."""
+    used: Set[str] = set(os.listdir(dest_dir))
+    next_suffix: Dict[str, int] = defaultdict(lambda: 1)
+    for f in files:
+        name = f.name
+        if name in used:
+            base, ext = os.path.splitext(f.name)
+            i = next_suffix[f.name]
+            while f"{base}_{i}{ext}" in used:
+                i += 1
+            next_suffix[f.name] = i + 1
+            name = f"{base}_{i}{ext}"
+        used.add(name)
+        f.dest = os.path.join(dest_dir, name)
+
+
+def reflink(src: str, dst: str) -> bool:
+    """copy-on-write 복제를 시도합니다. 지원하지 않는 파일시스템이면 False"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError as e:
+        if os.path.exists(dst):
+            os.remove(dst)
+        if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EBADF):
+            return False
+        raise
+    shutil.copystat(src, dst)
+    return True
+
+
+def place_file(f: SourceFile, mode: str) -> str:
+    """첫 복사본을 만들고 사용한 방식을 반환합니다."""
+    if mode == MODE_HARDLINK:
+        try:
+            os.link(f.path, f.dest)
+            return MODE_HARDLINK
+        except OSError:
+            pass
+    if mode in (MODE_REFLINK, MODE_HARDLINK) and reflink(f.path, f.dest):
+        return MODE_REFLINK
+    shutil.copy2(f.path, f.dest)
+    return MODE_COPY
+
+
+def link_duplicate(f: SourceFile) -> str:
+    """중복 파일을 첫 복사본에 대한 하드링크로 만듭니다. 실패하면 복사합니다."""
+    try:
+        os.link(f.primary.dest, f.dest)
+        return MODE_HARDLINK
+    except OSError:
+        shutil.copy2(f.path, f.dest)
+        return MODE_COPY
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="판례 원천 JSON 수집")
+    parser.add_argument("--sources", nargs="+", default=SOURCE_ROOTS, help="원천 루트 디렉터리 목록")
+    parser.add_argument("--dest", default=DEST_DIR, help="대상 디렉터리")
+    parser.add_argument("--workers", type=int, default=min(32, (os.cpu_count() or 1) * 4), help="해시/복사 스레드 수")
+    parser.add_argument("--mode", choices=[MODE_REFLINK, MODE_HARDLINK, MODE_COPY], default=MODE_REFLINK,
+                        help="첫 복사본 생성 방식 (reflink/hardlink 실패 시 일반 복사)")
+    parser.add_argument("--skip-duplicates", action="store_true", help="내용이 같은 파일은 대상에 만들지 않음")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger()
+    os.makedirs(args.dest, exist_ok=True)
+    start = time.perf_counter()
+
+    files = scan_sources(args.sources)
+    total_bytes = sum(f.size for f in files)
+    logger.info(f"원천 JSON {len(files)}개 ({total_bytes / 1024 / 1024:.1f} MB)")
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        duplicates = mark_duplicates(files, executor)
+        if args.skip_duplicates:
+            files = [f for f in files if f.primary is None]
+        assign_dest_names(files, args.dest)
+
+        primaries = [f for f in files if f.primary is None]
+        methods = defaultdict(lambda: [0, 0])  # 방식별 [파일 수, 바이트]
+        for f, method in zip(primaries, executor.map(lambda f: place_file(f, args.mode), primaries)):
+            methods[method][0] += 1
+            methods[method][1] += f.size
+        # 하드링크 대상(첫 복사본)이 모두 만들어진 뒤에 중복 파일을 처리합니다.
+        dups = [f for f in files if f.primary is not None]
+        for f, method in zip(dups, executor.map(link_duplicate, dups)):
+            methods[method][0] += 1
+            methods[method][1] += f.size
+
+    elapsed = time.perf_counter() - start
+    copied_bytes = methods[MODE_COPY][1]
+    saved_bytes = total_bytes - copied_bytes
+    logger.info(f"완료: {len(files)}개 파일 (중복 {duplicates}개{', 생략' if args.skip_duplicates else ''})")
+    for method, (count, size) in sorted(methods.items()):
+        logger.info(f"  {method:<8} {count:>8}개 {size / 1024 / 1024:10.1f} MB")
+    logger.info(f"복사한 용량 {copied_bytes / 1024 / 1024:.1f} MB, 절약한 용량 {saved_bytes / 1024 / 1024:.1f} MB "
+                f"({saved_bytes / total_bytes:.1%})" if total_bytes else "복사할 파일이 없습니다.")
+    logger.info(f"소요 시간 {elapsed:.1f}s, {len(files) / elapsed if elapsed else 0:.1f} files/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+청크 임베딩 디스크 캐시 (content-addressed)
+
+청크 텍스트의 sha256을 키로, 모델별 디렉터리 아래 .npy 샤드에 임베딩을 저장합니다.
+재구축, 청크 분할 실험, 인덱스 재생성 시 같은 텍스트의 벡터를 다시 계산하지 않습니다.
+
+디렉터리 구조:
+    <root>/<model>/<shard>.npy       float32 (n, dim) 벡터 — 조회 시 memory-map으로 엽니다.
+    <root>/<model>/<shard>.keys.npy  벡터와 같은 순서의 키 (S64)
+
+키 파일은 벡터 파일 다음에 원자적으로(os.replace) 생성되므로 키 파일이 있는 샤드만 유효합니다.
+샤드는 추가만 되며 수정하지 않으므로 여러 프로세스가 같은 캐시를 읽어도 안전합니다.
+"""
+import hashlib
+import os
+import re
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SHARD_SIZE = 4096
+_KEYS_SUFFIX = ".keys.npy"
+
+
+def chunk_hash(text: str) -> str:
+    """청크 텍스트의 캐시 키"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _model_dirname(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+
+
+def _atomic_save(path: str, array: np.ndarray):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class EmbeddingCache:
+    """모델별 content-addressed 임베딩 캐시"""
+
+    def __init__(self, root: str, model_name: str, shard_size: int = SHARD_SIZE):
+        self.directory = os.path.join(root, _model_dirname(model_name))
+        self.shard_size = shard_size
+        self.hits = 0
+        self.misses = 0
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._shards: Dict[str, np.ndarray] = {}
+        self._pending: Dict[str, np.ndarray] = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        shards = sorted(name[:-len(_KEYS_SUFFIX)] for name in os.listdir(self.directory)
+                        if name.endswith(_KEYS_SUFFIX))
+        for shard in shards:
+            keys = np.load(os.path.join(self.directory, shard + _KEYS_SUFFIX))
+            for row, key in enumerate(keys):
+                self._index.setdefault(key.decode("ascii"), (shard, row))
+        logger.info(f"임베딩 캐시 로드: {self.directory} (shards={len(shards)}, vectors={len(self._index)})")
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._pending)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pending or key in self._index
+
+    def _vectors(self, shard: str) -> np.ndarray:
+        vectors = self._shards.get(shard)
+        if vectors is None:
+            vectors = np.load(os.path.join(self.directory, shard + ".npy"), mmap_mode="r")
+            self._shards[shard] = vectors
+        return vectors
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        if key in self._pending:
+            return self._pending[key]
+        location = self._index.get(key)
+        if location is None:
+            return None
+        shard, row = location
+        return self._vectors(shard)[row]
+
+    def lookup(self, keys: Sequence[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """키 목록을 조회하여 ({위치: 벡터}, 캐시에 없는 위치 목록)을 반환합니다."""
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            vector = self.get(key)
+            if vector is None:
+                missing.append(i)
+            else:
+                found[i] = vector
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[np.ndarray]):
+        """새 벡터를 추가합니다. shard_size만큼 쌓이면 샤드 파일로 기록합니다."""
+        for key, vector in zip(keys, vectors):
+            if key not in self:
+                self._pending[key] = np.asarray(vector, dtype=np.float32)
+        if len(self._pending) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 벡터를 새 샤드로 기록합니다."""
+        if not self._pending:
+            return
+        shard = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        keys = list(self._pending)
+        _atomic_save(os.path.join(self.directory, shard + ".npy"), np.stack(list(self._pending.values())))
+        _atomic_save(os.path.join(self.directory, shard + _KEYS_SUFFIX), np.array(keys, dtype="S64"))
+        for row, key in enumerate(keys):
+            self._index[key] = (shard, row)
+        self._pending = {}
+        logger.debug(f"임베딩 캐시 샤드 기록: {shard} ({len(keys)} vectors)")
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
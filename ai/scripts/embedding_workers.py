@@ -0,0 +1,81 @@
+"""
+멀티 프로세스 임베딩 인코더
+
+SentenceTransformer.encode 한 번으로는 코어 일부만 사용하므로, 워커 프로세스마다 모델을 로드하고
+배치를 나누어 인코딩합니다. 워커별 torch 스레드 수는 런타임 프로파일(RuntimeSettings)에
+워커 수를 반영하여 (CPU 코어 수 / 워커 수)로 설정합니다.
+
+워커는 spawn으로 생성하여 부모 프로세스의 torch/OpenMP 상태를 물려받지 않습니다.
+"""
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List
+
+_model = None
+_batch_size = 32
+
+
+def _init_worker(model_name: str, workers: int, batch_size: int):
+    global _model, _batch_size
+    from config.settings import get_runtime_settings
+    from llm.models.embedding_model import EmbeddingModel
+    from llm.models.runtime import apply_thread_env, configure_torch
+
+    settings = get_runtime_settings().model_copy(update={"workers": workers})
+    apply_thread_env(settings)
+    _model = EmbeddingModel(model_name)
+    configure_torch(settings)
+    _batch_size = batch_size
+
+
+def _encode(texts: List[str]):
+    return _model.encode_batch(texts, batch_size=_batch_size)
+
+
+class EmbeddingEncoder:
+    """
+    배치 단위 비동기 인코더.
+    workers가 1이면 현재 프로세스에서 바로 인코딩하고, 그 외에는 프로세스 풀에 제출합니다.
+    """
+
+    def __init__(self, model_name: str, workers: int = 1, batch_size: int = 32):
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self._model = None
+        self._executor = None
+        if self.workers == 1:
+            from llm.models.embedding_model import EmbeddingModel
+            self._model = EmbeddingModel(model_name)
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, self.workers, batch_size),
+            )
+
+    @property
+    def max_pending(self) -> int:
+        """동시에 처리 중일 수 있는 배치 수 (워커마다 하나씩 대기 배치를 둡니다)"""
+        return 1 if self._executor is None else self.workers * 2
+
+    def submit(self, texts: List[str]) -> Future:
+        if self._executor is not None:
+            return self._executor.submit(_encode, texts)
+        future: Future = Future()
+        try:
+            future.set_result(self._model.encode_batch(texts, batch_size=self.batch_size))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
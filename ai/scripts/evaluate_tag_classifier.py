@@ -0,0 +1,235 @@
+"""
+로컬 태그 분류기 평가 스크립트
+
+판례(또는 상담 사연) 샘플에 대해 LLM이 고른 태그(KEYWORD_TAG_GENERATION_PROMPT)를 기준으로
+services/tag_classifier.TagClassifier의 결과를 비교하고, threshold별 지표를 출력합니다.
+- precision / recall / f1: 태그 단위 micro 평균
+- top1: 분류기 1순위 태그가 LLM 태그에 포함된 비율
+- fallback: 확신도(min_confidence) 미달로 LLM을 호출하게 되는 비율
+- confident_precision: LLM 없이 로컬 결과만 사용하는 샘플의 precision
+
+LLM 태그는 --labels 파일(jsonl)에 저장하여 다음 실행부터 재사용하며,
+입력 jsonl에 "tags" 필드가 있으면 LLM 대신 그 값을 기준으로 사용합니다.
+
+사용 예:
+    python scripts/evaluate_tag_classifier.py --data data/preprocessed --limit 300
+    python scripts/evaluate_tag_classifier.py --data samples.jsonl --thresholds 0.3,0.35,0.4
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config.settings import get_tag_classifier_settings
+from config.tags import SPECIALTY_TAGS
+from scripts.case_shards import iter_shard_cases, read_manifest
+from utils.logger import setup_logger, get_logger
+
+logger = get_logger(__name__)
+
+LABELS_PATH = "data/tag_labels.jsonl"
+
+
+def sample_text(record: Dict[str, Any]) -> str:
+    """판례/사연 레코드에서 분류에 사용할 텍스트 (제목·요약을 앞에 두어 잘림에 대비)"""
+    if record.get("text"):
+        return record["text"]
+    case = record.get("case", record)
+    parts = (case.get("title"), case.get("summary"), case.get("issue"),
+             case.get("fullText") or case.get("full_text"))
+    return "\n".join(p for p in parts if p)
+
+
+def iter_samples(data: str) -> Iterator[Tuple[str, str, Optional[List[str]]]]:
+    """(id, text, 기준 태그 또는 None)을 반환합니다. 샤드 디렉터리 또는 jsonl 파일"""
+    if os.path.isdir(data):
+        manifest = read_manifest(data)
+        if manifest is None:
+            raise ValueError(f"manifest.json이 없는 디렉터리입니다: {data}")
+        for _, case in iter_shard_cases(data, manifest):
+            yield case["case_id"], sample_text(case), None
+        return
+    with open(data, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            sample_id = str(record.get("id") or record.get("case_id") or line_no)
+            yield sample_id, sample_text(record), record.get("tags")
+
+
+def load_labels(path: str) -> Dict[str, List[str]]:
+    if not os.path.exists(path):
+        return {}
+    labels = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                labels[record["id"]] = record["tags"]
+    return labels
+
+
+async def label_with_llm(
+    samples: List[Tuple[str, str]],
+    labels_path: str,
+    concurrency: int,
+) -> Dict[str, List[str]]:
+    """LLM으로 태그를 생성하여 labels_path에 추가 기록하고 {id: tags}를 반환합니다."""
+    from llm.clients.openai_client import get_async_openai_client
+    from llm.prompt_templates.consult_prompts import KEYWORD_TAG_GENERATION_PROMPT
+
+    client = get_async_openai_client()
+    semaphore = asyncio.Semaphore(concurrency)
+    specialty_tags = ", ".join(SPECIALTY_TAGS)
+
+    async def label(sample_id: str, text: str) -> Tuple[str, Optional[List[str]]]:
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": "You output strict JSON."},
+                        {"role": "user", "content": KEYWORD_TAG_GENERATION_PROMPT.format(
+                            fullText=text, specialty_tags=specialty_tags)},
+                    ],
+                )
+                tags = json.loads(response.choices[0].message.content).get("tags", [])
+                return sample_id, [t for t in tags if isinstance(t, str)]
+            except Exception as e:
+                logger.warning(f"LLM 태그 생성 실패 ({sample_id}): {e!r}")
+                return sample_id, None
+
+    results = await asyncio.gather(*(label(sample_id, text) for sample_id, text in samples))
+    labeled = {sample_id: tags for sample_id, tags in results if tags is not None}
+    os.makedirs(os.path.dirname(os.path.abspath(labels_path)), exist_ok=True)
+    with open(labels_path, "a", encoding="utf-8") as f:
+        for sample_id, tags in labeled.items():
+            f.write(json.dumps({"id": sample_id, "tags": tags}, ensure_ascii=False) + "\n")
+    return labeled
+
+
+def evaluate(
+    classifier,
+    scores: np.ndarray,
+    references: List[Set[str]],
+    thresholds: List[float],
+    top_k: int,
+) -> List[Dict[str, float]]:
+    """threshold별 지표를 계산합니다. scores는 (샘플 수, 태그 수) 코사인 유사도 행렬"""
+    top1 = [classifier.tags[int(np.argmax(row))] for row in scores]
+    top1_accuracy = sum(t in ref for t, ref in zip(top1, references)) / len(references) if references else 0.0
+    report = []
+    for threshold in thresholds:
+        tp = fp = fn = 0
+        confident_tp = confident_fp = fallbacks = 0
+        for row, ref in zip(scores, references):
+            prediction = classifier.select(row, threshold=threshold, top_k=top_k)
+            predicted = set(prediction.tags)
+            hit = len(predicted & ref)
+            tp += hit
+            fp += len(predicted) - hit
+            fn += len(ref) - hit
+            if prediction.confident:
+                confident_tp += hit
+                confident_fp += len(predicted) - hit
+            else:
+                fallbacks += 1
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        report.append({
+            "threshold": threshold,
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "top1": top1_accuracy,
+            "fallback": fallbacks / len(references) if references else 0.0,
+            "confident_precision": (confident_tp / (confident_tp + confident_fp)
+                                    if confident_tp + confident_fp else 0.0),
+        })
+    return report
+
+
+def parse_args(argv=None):
+    settings = get_tag_classifier_settings()
+    parser = argparse.ArgumentParser(description="로컬 태그 분류기와 LLM 태그 비교 평가")
+    parser.add_argument("--data", required=True, help="전처리된 판례 샤드 디렉터리 또는 jsonl 파일")
+    parser.add_argument("--limit", type=int, default=300, help="평가할 샘플 수")
+    parser.add_argument("--labels", default=LABELS_PATH, help="LLM 태그 캐시 파일 (jsonl)")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM 동시 호출 수")
+    parser.add_argument("--thresholds", default="0.25,0.3,0.35,0.4,0.45,0.5", help="비교할 threshold 목록 (쉼표 구분)")
+    parser.add_argument("--top-k", type=int, default=settings.top_k, help="최대 태그 수")
+    parser.add_argument("--min-confidence", type=float, default=settings.min_confidence,
+                        help="LLM fallback 기준 최고 점수")
+    parser.add_argument("--batch-size", type=int, default=32, help="임베딩 배치 크기")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger()
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+
+    samples = []
+    for sample in iter_samples(args.data):
+        if sample[1]:
+            samples.append(sample)
+        if len(samples) >= args.limit:
+            break
+    logger.info(f"평가 샘플 {len(samples)}개")
+
+    labels = load_labels(args.labels)
+    missing = [(sample_id, text) for sample_id, text, tags in samples if tags is None and sample_id not in labels]
+    if missing:
+        logger.info(f"LLM 태그 생성: {len(missing)}개 (동시 {args.concurrency})")
+        labels.update(asyncio.run(label_with_llm(missing, args.labels, args.concurrency)))
+
+    valid_tags = set(SPECIALTY_TAGS)
+    texts, references, skipped = [], [], 0
+    for sample_id, text, tags in samples:
+        ref = set(tags if tags is not None else labels.get(sample_id, [])) & valid_tags
+        if not ref:
+            skipped += 1
+            continue
+        texts.append(text)
+        references.append(ref)
+    if skipped:
+        logger.info(f"SPECIALTY_TAGS에 해당하는 기준 태그가 없는 샘플 {skipped}개 제외")
+    if not texts:
+        logger.error("평가할 샘플이 없습니다.")
+        return
+
+    from llm.models.model_loader import ModelLoader
+    from services.tag_classifier import TagClassifier
+
+    classifier = TagClassifier(ModelLoader.get_embedding_model(), min_confidence=args.min_confidence)
+    scores = np.concatenate([
+        classifier.score(texts[i:i + args.batch_size]) for i in range(0, len(texts), args.batch_size)
+    ])
+    report = evaluate(classifier, scores, references, thresholds, args.top_k)
+
+    print(f"samples={len(texts)} top_k={args.top_k} min_confidence={args.min_confidence}")
+    print(f"{'threshold':>9} | {'precision':>9} {'recall':>7} {'f1':>6} {'top1':>6} | "
+          f"{'fallback':>8} {'conf_prec':>9}")
+    for row in report:
+        print(f"{row['threshold']:>9.2f} | {row['precision']:>9.3f} {row['recall']:>7.3f} {row['f1']:>6.3f} "
+              f"{row['top1']:>6.3f} | {row['fallback']:>8.1%} {row['confident_precision']:>9.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"samples": len(texts), "top_k": args.top_k, "min_confidence": args.min_confidence,
+                       "report": report}, f, ensure_ascii=False, indent=2)
+        logger.info(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+판례 인덱스 버전 관리 (blue/green)
+
+검색은 `legal_cases_current` / `legal_chunks_current` 뷰를 통해 활성 버전의 테이블을 조회합니다.
+새 인덱스는 버전별 섀도 테이블(legal_cases_<version>, legal_chunks_<version>)에 구축하고,
+검증(행 수, recall 샘플)을 통과하면 한 트랜잭션에서 두 뷰를 교체하여 원자적으로 전환합니다.
+뷰는 쿼리마다 해석되므로 SearchService는 재시작 없이 새 버전을 사용합니다.
+
+버전 목록은 legal_index_versions 테이블에 기록합니다.
+- building: 구축 중 (중단된 실행은 이어서 구축). 구축하는 프로세스는 버전별 advisory lock을 세션 동안 잡고 있으며,
+            잠금이 풀린(프로세스가 끝난) building 버전만 버려진 것으로 보고 정리합니다.
+- active:   현재 뷰가 가리키는 버전
+- retired:  교체된 이전 버전 (롤백용으로 최근 N개 보관 후 삭제)
+- failed:   검증 실패 (확인용으로 보관 후 삭제)
+최초 테이블(legal_cases / legal_chunks)은 'base' 버전으로 등록되며 삭제하지 않습니다.
+"""
+import re
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BASE_VERSION = "base"
+CASES_VIEW, CHUNKS_VIEW = "legal_cases_current", "legal_chunks_current"
+STATUS_BUILDING, STATUS_ACTIVE, STATUS_RETIRED, STATUS_FAILED = "building", "active", "retired", "failed"
+SWAP_LOCK_TIMEOUT = "5s"
+
+_VERSION_PATTERN = re.compile(r"^(base|v\d{8}t\d{6})$")
+
+
+class IndexTables(NamedTuple):
+    cases: str
+    chunks: str
+
+
+BASE_TABLES = IndexTables("legal_cases", "legal_chunks")
+
+
+def tables_for(version: str) -> IndexTables:
+    """버전 이름에 해당하는 테이블 이름 (SQL에 직접 들어가므로 형식을 검증합니다)"""
+    if not _VERSION_PATTERN.match(version):
+        raise ValueError(f"잘못된 인덱스 버전 이름: {version}")
+    if version == BASE_VERSION:
+        return BASE_TABLES
+    return IndexTables(f"legal_cases_{version}", f"legal_chunks_{version}")
+
+
+def new_version_name() -> str:
+    return time.strftime("v%Y%m%dt%H%M%S")
+
+
+def ensure_version_schema(cur):
+    """버전 테이블과 현재 버전 뷰를 준비합니다. (db/init_db.sql과 동일, 뷰가 이미 있으면 유지)"""
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS legal_index_versions (
+            version       TEXT PRIMARY KEY,
+            status        TEXT NOT NULL,
+            index_version TEXT,
+            case_count    BIGINT,
+            chunk_count   BIGINT,
+            recall        DOUBLE PRECISION,
+            created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+            activated_at  TIMESTAMPTZ
+        );
+        INSERT INTO legal_index_versions (version, status, activated_at)
+        VALUES ('{BASE_VERSION}', '{STATUS_ACTIVE}', now())
+        ON CONFLICT (version) DO NOTHING;
+        DO $$
+        BEGIN
+            IF to_regclass('{CASES_VIEW}') IS NULL THEN
+                CREATE VIEW {CASES_VIEW} AS SELECT * FROM {BASE_TABLES.cases};
+            END IF;
+            IF to_regclass('{CHUNKS_VIEW}') IS NULL THEN
+                CREATE VIEW {CHUNKS_VIEW} AS SELECT * FROM {BASE_TABLES.chunks};
+            END IF;
+        END $$;
+    """)
+
+
+def get_active_version(cur) -> str:
+    cur.execute("SELECT version FROM legal_index_versions WHERE status = %s", (STATUS_ACTIVE,))
+    row = cur.fetchone()
+    return row[0] if row else BASE_VERSION
+
+
+def get_version_status(cur, version: str) -> Optional[str]:
+    cur.execute("SELECT status FROM legal_index_versions WHERE version = %s", (version,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def create_shadow_version(cur, version: str, index_version: str) -> IndexTables:
+    """활성 버전과 같은 스키마의 섀도 테이블을 만듭니다. (보조/HNSW 인덱스는 적재 후 생성)"""
+    source = tables_for(get_active_version(cur))
+    tables = tables_for(version)
+    cur.execute(f"""
+        CREATE TABLE {tables.cases} (LIKE {source.cases} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES);
+        CREATE TABLE {tables.chunks} (LIKE {source.chunks} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+        ALTER TABLE {tables.chunks}
+            ADD PRIMARY KEY (chunk_id),
+            ADD UNIQUE (case_id, chunk_index, section),
+            ADD FOREIGN KEY (case_id) REFERENCES {tables.cases}(case_id) ON DELETE CASCADE;
+    """)
+    cur.execute(
+        "INSERT INTO legal_index_versions (version, status, index_version) VALUES (%s, %s, %s)",
+        (version, STATUS_BUILDING, index_version)
+    )
+    logger.info(f"섀도 인덱스 생성: {version} ({tables.cases}, {tables.chunks})")
+    return tables
+
+
+def _build_lock_key(version: str) -> str:
+    return f"legal_index_build:{version}"
+
+
+def lock_building_version(cur, version: str) -> bool:
+    """
+    version을 구축 중임을 알리는 세션 advisory lock을 잡습니다. (연결이 끊기면 자동 해제)
+    다른 프로세스가 같은 버전을 구축 중이면 False를 반환합니다.
+    """
+    cur.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (_build_lock_key(version),))
+    return bool(cur.fetchone()[0])
+
+
+def measure_recall(cur, chunks_table: str, sample_size: int, k: int) -> float:
+    """
+    저장된 청크 임베딩을 질의로 사용하여 HNSW 검색 결과와 정확한(순차 스캔) 검색 결과의 recall@k를 계산합니다.
+    호출한 트랜잭션 안에서 SET LOCAL을 사용하므로 호출 후 commit/rollback이 필요합니다.
+    """
+    cur.execute(f"SELECT embedding FROM {chunks_table} ORDER BY random() LIMIT %s", (sample_size,))
+    queries = [row[0] for row in cur.fetchall()]
+    if not queries:
+        return 0.0
+
+    search_sql = f"SELECT chunk_id FROM {chunks_table} ORDER BY embedding <-> %s LIMIT %s"
+    approx = []
+    for query in queries:
+        cur.execute(search_sql, (query, k))
+        approx.append({row[0] for row in cur.fetchall()})
+
+    cur.execute("SET LOCAL enable_indexscan = off")
+    recalls = []
+    for query, found in zip(queries, approx):
+        cur.execute(search_sql, (query, k))
+        exact = {row[0] for row in cur.fetchall()}
+        recalls.append(len(found & exact) / len(exact) if exact else 1.0)
+    return sum(recalls) / len(recalls)
+
+
+def validate_version(
+    conn,
+    version: str,
+    min_recall: float,
+    max_shrink: float,
+    recall_sample: int = 50,
+    recall_k: int = 10,
+) -> Dict[str, Any]:
+    """
+    섀도 버전을 검증하여 {"ok", "errors", 통계...}를 반환하고 버전 테이블에 통계를 기록합니다.
+    - 판례/청크가 비어 있지 않고, 청크가 없는 판례가 없을 것
+    - 판례 수가 활성 버전 대비 max_shrink 비율 이상 줄지 않을 것 (원본 누락 방지)
+    - recall@k 샘플이 min_recall 이상일 것
+    """
+    tables = tables_for(version)
+    with conn.cursor() as cur:
+        active = tables_for(get_active_version(cur))
+        cur.execute(f"SELECT count(*) FROM {tables.cases}")
+        case_count = cur.fetchone()[0]
+        cur.execute(f"SELECT count(*) FROM {tables.chunks}")
+        chunk_count = cur.fetchone()[0]
+        cur.execute(f"""
+            SELECT count(*) FROM {tables.cases} c
+            WHERE NOT EXISTS (SELECT 1 FROM {tables.chunks} ch WHERE ch.case_id = c.case_id)
+        """)
+        orphan_count = cur.fetchone()[0]
+        cur.execute(f"SELECT count(*) FROM {active.cases}")
+        active_case_count = cur.fetchone()[0]
+        recall = measure_recall(cur, tables.chunks, recall_sample, recall_k)
+    conn.rollback()  # SET LOCAL 해제
+
+    errors: List[str] = []
+    if case_count == 0 or chunk_count == 0:
+        errors.append(f"비어 있는 인덱스 (cases={case_count}, chunks={chunk_count})")
+    if orphan_count:
+        errors.append(f"청크가 없는 판례 {orphan_count}건")
+    if active_case_count and case_count < active_case_count * (1 - max_shrink):
+        errors.append(f"판례 수 감소 {active_case_count} → {case_count} (허용 {max_shrink:.0%})")
+    if recall < min_recall:
+        errors.append(f"recall@{recall_k} {recall:.3f} < {min_recall}")
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE legal_index_versions SET case_count = %s, chunk_count = %s, recall = %s WHERE version = %s",
+            (case_count, chunk_count, recall, version)
+        )
+    conn.commit()
+    return {"ok": not errors, "errors": errors, "case_count": case_count, "chunk_count": chunk_count,
+            "active_case_count": active_case_count, "recall": recall}
+
+
+def activate_version(conn, version: str):
+    """두 뷰를 새 버전 테이블로 교체하고 버전 상태를 한 트랜잭션에서 변경합니다."""
+    tables = tables_for(version)
+    with conn.cursor() as cur:
+        cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+        cur.execute(f"CREATE OR REPLACE VIEW {CASES_VIEW} AS SELECT * FROM {tables.cases}")
+        cur.execute(f"CREATE OR REPLACE VIEW {CHUNKS_VIEW} AS SELECT * FROM {tables.chunks}")
+        cur.execute("UPDATE legal_index_versions SET status = %s WHERE status = %s", (STATUS_RETIRED, STATUS_ACTIVE))
+        cur.execute(
+            "UPDATE legal_index_versions SET status = %s, activated_at = now() WHERE version = %s",
+            (STATUS_ACTIVE, version)
+        )
+    conn.commit()
+    logger.info(f"인덱스 버전 전환: {version}")
+
+
+def mark_failed(conn, version: str):
+    with conn.cursor() as cur:
+        cur.execute("UPDATE legal_index_versions SET status = %s WHERE version = %s", (STATUS_FAILED, version))
+    conn.commit()
+
+
+def gc_versions(conn, keep: int) -> List[str]:
+    """
+    retired/failed 버전 중 최근 keep개를 제외한 버전과, 중단 후 버려진 building 버전의 테이블을 삭제합니다. (base 제외)
+    building 버전은 구축 중인 프로세스의 advisory lock이 없는 경우에만 삭제합니다. (lock_building_version)
+    blue/green 실행이 끝난 뒤(자기 버전의 전환 또는 실패 처리 후)에만 호출합니다.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT version FROM legal_index_versions
+            WHERE status IN (%s, %s) AND version <> %s
+            ORDER BY created_at DESC
+            OFFSET %s
+        """, (STATUS_RETIRED, STATUS_FAILED, BASE_VERSION, keep))
+        versions = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT version FROM legal_index_versions WHERE status = %s", (STATUS_BUILDING,))
+        building = [row[0] for row in cur.fetchall()]
+        abandoned = []
+        for version in building:
+            # 잠금을 얻을 수 있으면 구축하던 프로세스가 끝난 것 — 삭제 후 바로 해제
+            if lock_building_version(cur, version):
+                abandoned.append(version)
+            else:
+                logger.info(f"다른 프로세스가 구축 중인 인덱스 버전은 유지: {version}")
+        for version in versions + abandoned:
+            tables = tables_for(version)
+            cur.execute(f"DROP TABLE IF EXISTS {tables.chunks}, {tables.cases}")
+            cur.execute("DELETE FROM legal_index_versions WHERE version = %s", (version,))
+    conn.commit()
+    with conn.cursor() as cur:
+        for version in abandoned:
+            cur.execute("SELECT pg_advisory_unlock(hashtext(%s))", (_build_lock_key(version),))
+    conn.commit()
+    versions += abandoned
+    if versions:
+        logger.info(f"이전 인덱스 버전 삭제: {versions}")
+    return versions
@@ -1,31 +1,62 @@
-from langchain.chains import LLMChain
-from langchain.llms.base import LLM
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional, Tuple, TYPE_CHECKING
+import asyncio
 import json
+import os
+import time
+from contextlib import aclosing
 
 from config.tags import SPECIALTY_TAGS
 from config.settings import get_llm_settings
-from llm.llm_response_parser import CotOutputParser, parse_case_analysis_output, CaseAnalysisResult
+from llm.llm_response_parser import (
+    CotOutputParser, IncrementalAnalysisParser, parse_case_analysis_output, CaseAnalysisResult
+)
 from llm.prompt_templates import get_cot_prompt
+from llm.prompt_budget import assemble_analysis_inputs
+from llm.tokenizer import get_tokenizer
 from llm.models.embedding_model import EmbeddingModel
 from llm.models.cross_encoder_model import CrossEncoderModel
 from services.search_service import SearchService
+from llm.clients.response_cache import is_cache_bypassed
+from core.single_flight import SingleFlight, make_request_key
 from utils.logger import LoggerMixin
 from utils.exceptions import handle_service_exceptions, LLMError
 
+if TYPE_CHECKING:
+    from langchain.llms.base import LLM
+    from services.semantic_cache import SemanticAnalysisCache
+    from services.context_compressor import ContextCompressor
+
+# 같은 질문이 동시에 들어오면(중복 제출/재시도) 한 번만 분석 (서비스는 요청마다 생성되므로 모듈 단위로 공유)
+_analysis_flight = SingleFlight("analyze_case")
+
 class CaseAnalysisService(LoggerMixin):
-    def __init__(self, llm: LLM, search_service: SearchService):
+    def __init__(
+        self,
+        llm: "LLM",
+        search_service: SearchService,
+        semantic_cache: Optional["SemanticAnalysisCache"] = None,
+        context_compressor: Optional["ContextCompressor"] = None,
+    ):
         """
         LLM 객체와 검색 서비스를 주입받아 초기화합니다.
 
         Args:
             llm (LLM): LangChain의 LLM 인터페이스를 구현한 객체
             search_service (SearchService): 검색 서비스 인스턴스
+            semantic_cache (SemanticAnalysisCache): 비슷한 사연의 이전 분석을 재사용하는 캐시 (선택)
+            context_compressor (ContextCompressor): 판례 청크를 관련 문장만 남기도록 압축 (선택)
         """
         self.llm = llm
         self.search_service = search_service
+        self.semantic_cache = semantic_cache
+        self.context_compressor = context_compressor
         self.prompt_template = get_cot_prompt()
         self.parser = CotOutputParser()
+        self.tokenizer = get_tokenizer(os.getenv("MODEL_NAME", "gpt-4o-mini"))
+        # 입력을 제외한 지시문(템플릿 본문)의 토큰 수
+        self.template_tokens = self.tokenizer.count(
+            self.prompt_template.format(user_query="", case_docs="", tag_list="")
+        )
         # `prompt | llm` 로 RunnableSequence를 만듭니다. (LangChain 0.1.17 이상 권장 방식)
         self.chain = self.prompt_template | self.llm
 
@@ -40,51 +71,168 @@ class CaseAnalysisService(LoggerMixin):
                 user_query: 사용자가 물어본 질문
                 top_k_docs: 검색할 관련 판례의 개수
             """
-            self.logger.info(f"Starting case analysis for query: {user_query[:100]}...")
-            # 1. 관련 판례 검색 (RAG)
-            # Call vector_search method of SearchService
-            retrieved_docs, _ = await self.search_service.vector_search(user_query, size=top_k_docs)
-
-            # 2. 검색된 판례 청크를 LLM 입력 형식에 맞게 변환
-            # 이제 search_service는 chunk_text를 포함하여 반환합니다.
-            formatted_case_docs = []
-            for doc in retrieved_docs:
-                formatted_case_docs.append({
-                    "id": doc.get("case_id", ""),
-                    "issue": doc.get("issue", ""),
-                    "text": doc.get("chunk_text", "")  # chunk_text 필드를 직접 사용
-                })
-
-            # case_docs를 JSON 문자열로 직렬화
-            docs_json = json.dumps(formatted_case_docs, ensure_ascii=False)
-
-            # 디버깅: 프롬프트에 포함될 데이터의 길이 확인
-            self.logger.debug(f"User Query Length: {len(user_query)}")
-            self.logger.debug(f"Case Docs JSON Length: {len(docs_json)}")
-
-            # SPECIALTY_TAGS를 쉼표로 구분된 문자열로 변환
-            tag_list_str = ", ".join(SPECIALTY_TAGS)
-
-            invoked = self.chain.invoke({
-                "user_query": user_query,
-                "case_docs": docs_json,
-                "tag_list": tag_list_str,
+            # 캐시 우회 요청은 캐시를 사용하는 진행 중 분석과 합치지 않습니다.
+            key = make_request_key(user_query, top_k_docs, is_cache_bypassed())
+            return await _analysis_flight.do(key, lambda: self._analyze_case(user_query, top_k_docs))
+
+    async def _analyze_case(self, user_query: str, top_k_docs: int) -> dict:
+        self.logger.info(f"Starting case analysis for query: {user_query[:100]}...")
+        # 0. 시맨틱 캐시 조회 (질의 임베딩은 판례 검색에 그대로 재사용)
+        semantic_cache, query_embedding, cached_result = await self._lookup_semantic_cache(user_query, top_k_docs)
+        if cached_result is not None:
+            return {
+                "case_analysis": cached_result,
+            }
+
+        _, prompt_inputs, budget_report = await self._prepare_prompt(user_query, top_k_docs, query_embedding)
+
+        invoked = await self.chain.ainvoke(prompt_inputs)
+        # RunnableSequence.ainvoke()는 마지막 LLM의 출력(보통 string 또는 {"text":…} 형태)을 그대로 돌려줍니다.
+        raw_llm_response = invoked["text"] if isinstance(invoked, dict) and "text" in invoked else invoked
+
+        case_analysis_result = self._parse_llm_output(raw_llm_response)
+        if semantic_cache is not None:
+            semantic_cache.add(query_embedding, case_analysis_result, top_k=top_k_docs)
+
+        self.logger.info("Case analysis completed successfully")
+        return {
+            "case_analysis": case_analysis_result,
+            "token_usage": budget_report.as_dict(),
+        }
+
+    async def stream_analysis(self, user_query: str, top_k_docs: int = 5) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        분석 과정을 (이벤트, 데이터) 순서로 내보냅니다.
+        - status: 판례 검색 완료 (검색된 판례 ID, 소요 시간)
+        - token: LLM 출력 조각
+        - field: 출력 JSON에서 값이 완성된 필드 (issues, opinion, ... — 생성 중 점진적으로 파싱)
+        - result: 전체 출력을 analyze_case와 같은 방식으로 파싱한 CaseAnalysisResult와 토큰 사용량
+        시맨틱 캐시에 적중하면 result만 내보냅니다. (스트림은 동일 요청 병합 대상이 아님)
+        """
+        start_time = time.perf_counter()
+        semantic_cache, query_embedding, cached_result = await self._lookup_semantic_cache(user_query, top_k_docs)
+        if cached_result is not None:
+            yield "result", {"report": cached_result.model_dump(), "cached": True}
+            return
+
+        # 검색이 끝나는 즉시 status를 보내고, 문장 압축/토큰 예산 배분은 그 다음에 수행
+        retrieved_docs = await self._retrieve(user_query, top_k_docs, query_embedding)
+        yield "status", {
+            "stage": "retrieval",
+            "cases": list(dict.fromkeys(doc.get("case_id", "") for doc in retrieved_docs)),
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000),
+        }
+        prompt_inputs, budget_report = await self._build_prompt(user_query, retrieved_docs)
+
+        parser = IncrementalAnalysisParser()
+        # 스트림 소비가 중간에 끝나면 LLM 스트림도 바로 닫음
+        async with aclosing(self.chain.astream(prompt_inputs)) as chunks:
+            async for chunk in chunks:
+                text = chunk["text"] if isinstance(chunk, dict) else chunk
+                if not text:
+                    continue
+                yield "token", {"text": text}
+                for name, value in parser.feed(text):
+                    yield "field", {"name": name, "value": value}
+
+        case_analysis_result = self._parse_llm_output(parser.text)
+        if semantic_cache is not None:
+            semantic_cache.add(query_embedding, case_analysis_result, top_k=top_k_docs)
+        self.logger.info(f"Case analysis stream completed [{(time.perf_counter() - start_time) * 1000:.0f}ms]")
+        yield "result", {"report": case_analysis_result.model_dump(), "token_usage": budget_report.as_dict()}
+
+    async def _lookup_semantic_cache(self, user_query: str, top_k_docs: int):
+        """
+        (사용할 캐시, 질의 임베딩, 캐시된 결과 또는 None)을 반환합니다. 캐시를 쓰지 않으면 (None, None, None)
+        같은 top_k_docs로 분석한 결과만 재사용합니다.
+        """
+        semantic_cache = None if is_cache_bypassed() else self.semantic_cache
+        if semantic_cache is None:
+            return None, None, None
+
+        def embed_and_lookup():
+            embedding = self.search_service.embedding_model.get_embedding(user_query)
+            return embedding, semantic_cache.lookup(embedding, top_k=top_k_docs)
+
+        # 질의 임베딩(모델 추론)과 유사도 계산은 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+        query_embedding, cached = await asyncio.to_thread(embed_and_lookup)
+        if cached is None:
+            return semantic_cache, query_embedding, None
+        cached_result, similarity = cached
+        self.logger.info(f"Semantic cache hit (similarity={similarity:.4f})")
+        return semantic_cache, query_embedding, cached_result
+
+    async def _prepare_prompt(self, user_query: str, top_k_docs: int, query_embedding: Optional[List[float]]):
+        """판례 검색 → 문장 압축 → 토큰 예산 배분을 거쳐 (검색된 판례, 프롬프트 입력, 예산 보고서)를 반환합니다."""
+        retrieved_docs = await self._retrieve(user_query, top_k_docs, query_embedding)
+        prompt_inputs, budget_report = await self._build_prompt(user_query, retrieved_docs)
+        return retrieved_docs, prompt_inputs, budget_report
+
+    async def _retrieve(self, user_query: str, top_k_docs: int, query_embedding: Optional[List[float]]) -> List[Dict]:
+        """관련 판례 청크를 검색합니다. (RAG)"""
+        # Call vector_search method of SearchService
+        retrieved_docs, _ = await self.search_service.vector_search(
+            user_query, size=top_k_docs, query_embedding=query_embedding
+        )
+        return retrieved_docs
+
+    async def _build_prompt(self, user_query: str, retrieved_docs: List[Dict]):
+        """검색된 판례를 문장 압축과 토큰 예산 배분을 거쳐 (프롬프트 입력, 예산 보고서)로 만듭니다."""
+        # 1. 검색된 판례 청크를 LLM 입력 형식에 맞게 변환
+        # 이제 search_service는 chunk_text를 포함하여 반환합니다.
+        formatted_case_docs = []
+        for doc in retrieved_docs:
+            formatted_case_docs.append({
+                "id": doc.get("case_id", ""),
+                "issue": doc.get("issue", ""),
+                "text": doc.get("chunk_text", "")  # chunk_text 필드를 직접 사용
             })
-            # RunnableSequence.invoke()는 마지막 LLM의 출력(보통 string 또는 {"text":…} 형태)을 그대로 돌려줍니다.
-            raw_llm_response = invoked["text"] if isinstance(invoked, dict) and "text" in invoked else invoked
 
-            # CotOutputParser를 사용하여 추론 과정과 결론을 분리합니다.
-            cot_parsed_result = self.parser.parse(raw_llm_response)
-            thought_process = cot_parsed_result["thought_process"]
-            conclusion_text = cot_parsed_result["conclusion"]
+        # 2. 판례별로 질의와 관련도가 높은 문장만 남깁니다. (Cross-encoder 추론은 스레드에서 실행)
+        compression_stats = None
+        if self.context_compressor is not None and formatted_case_docs:
+            formatted_case_docs, compression_stats = await asyncio.to_thread(
+                self.context_compressor.compress, user_query, formatted_case_docs
+            )
+            self.logger.info(
+                f"Context compressed {compression_stats['chars_before']} → {compression_stats['chars_after']} chars "
+                f"(x{compression_stats['ratio']}, {compression_stats['chunks']} chunks → "
+                f"{compression_stats['cases']} cases, {compression_stats['sentences_scored']} sentences scored)"
+            )
 
-            # parse_case_analysis_output을 사용하여 결론 텍스트를 구조화합니다.
-            case_analysis_result = parse_case_analysis_output(conclusion_text)
+        # SPECIALTY_TAGS를 쉼표로 구분된 문자열로 변환
+        tag_list_str = ", ".join(SPECIALTY_TAGS)
 
-            self.logger.info("Case analysis completed successfully")
-            return {
-                "case_analysis": case_analysis_result,
-            }
+        # 토큰 예산에 맞춰 질문/판례를 자르고 case_docs를 JSON 문자열로 직렬화
+        llm_settings = get_llm_settings()
+        prompt_inputs, budget_report = assemble_analysis_inputs(
+            self.tokenizer,
+            self.template_tokens,
+            user_query,
+            formatted_case_docs,
+            tag_list_str,
+            max_prompt_tokens=llm_settings.analysis_prompt_max_tokens,
+            query_max_tokens=llm_settings.analysis_query_max_tokens,
+            min_doc_tokens=llm_settings.analysis_min_doc_tokens,
+        )
+        if compression_stats is not None:
+            budget_report.extra["compression"] = compression_stats
+        self.logger.info(
+            f"Prompt tokens {budget_report.prompt_tokens}/{budget_report.budget} "
+            f"(instructions={budget_report.instruction_tokens}, query={budget_report.query_tokens}"
+            f"{' truncated' if budget_report.query_truncated else ''}, docs={budget_report.doc_tokens} "
+            f"kept {budget_report.docs_kept}/{budget_report.docs_total}, trimmed {budget_report.docs_trimmed}, "
+            f"tokenizer={budget_report.tokenizer})"
+        )
+        return prompt_inputs, budget_report
+
+    def _parse_llm_output(self, raw_llm_response: str) -> CaseAnalysisResult:
+        # CotOutputParser를 사용하여 추론 과정과 결론을 분리합니다.
+        cot_parsed_result = self.parser.parse(raw_llm_response)
+        conclusion_text = cot_parsed_result["conclusion"]
+
+        # parse_case_analysis_output을 사용하여 결론 텍스트를 구조화합니다.
+        return parse_case_analysis_output(conclusion_text)
 
 # 사용 예시 (기존 analyze_case 함수와 호환성을 위해)
 async def analyze_case(case_text: str) -> dict:
@@ -1,26 +1,32 @@
 import inspect
 from app.api.schemas.chat import ChatRequest, StreamChunk
 from llm.prompt_templates.chat_prompts import ChatPromptTemplate
-from collections import deque
-from typing import Deque, Dict, Tuple
-from openai import OpenAI
+from services.chat_session_store import ChatSessionStore, InMemoryChatSessionStore
+from services.chat_summarizer import ChatHistorySummarizer
+from typing import Optional, TYPE_CHECKING
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 logger = get_logger(__name__)
 
 class ChatService:
-    def __init__(self, llm_client: OpenAI):
+    def __init__(
+        self,
+        llm_client: "OpenAI",
+        session_store: Optional[ChatSessionStore] = None,
+        summarizer: Optional[ChatHistorySummarizer] = None,
+    ):
         self.llm_client = llm_client
-        self.chat_histories: Dict[str, Deque[Tuple[str, str]]] = {}
-        self.MAX_HISTORY_TOKENS = 3000
+        # 대화 이력은 요청마다 새로 만들어지는 서비스가 아닌 공용 세션 저장소에 보관
+        self.session_store = session_store or InMemoryChatSessionStore()
+        # 이력이 길어지면 앞부분을 요약문으로 압축 (응답 이후 백그라운드에서 실행)
+        self.summarizer = summarizer
 
     async def stream_chat_response(self, req: ChatRequest, user_id: str):
-        if user_id not in self.chat_histories:
-            self.chat_histories[user_id] = deque()
-        history = self.chat_histories[user_id]
-
-        messages = ChatPromptTemplate.build_messages(history, req.message)
-        history.append(("user", req.message))
+        summary, history = await self.session_store.aget_context(user_id)
+        messages = ChatPromptTemplate.build_messages(history, req.message, summary=summary)
 
         assistant_reply = ""
         try:
@@ -40,12 +46,9 @@ class ChatService:
 
         finally:
             if assistant_reply:
-                history.append(("assistant", assistant_reply))
-                # 토큰 제한 초과 시 (user, assistant) 쌍으로 가장 오래된 대화부터 제거
-                total = sum(len(c) for _, c in history)
-                while total > self.MAX_HISTORY_TOKENS and len(history) >= 2:
-                    user_msg = history.popleft()
-                    assistant_msg = history.popleft()
-                    total -= (len(user_msg[1]) + len(assistant_msg[1]))
+                # 토큰 제한 초과 시 저장소가 (user, assistant) 쌍으로 가장 오래된 대화부터 제거
+                history_tokens = await self.session_store.aappend_turn(user_id, req.message, assistant_reply)
+                if self.summarizer is not None:
+                    self.summarizer.maybe_schedule(user_id, history_tokens)
             yield "data: [DONE]\n\n"
 
@@ -0,0 +1,334 @@
+"""
+채팅 세션(사용자별 대화 이력) 저장소
+
+- 이력은 실제 토큰 수(llm.tokenizer) 기준으로 max_history_tokens 이하가 되도록
+  가장 오래된 (user, assistant) 쌍부터 제거합니다.
+- 요약(compact)을 저장하면 요약된 앞부분 대화를 지우고 요약문을 세션과 함께 보관합니다. (services.chat_summarizer)
+- 마지막 사용 후 ttl_seconds가 지난 세션은 버리고, 세션 수(max_sessions) 또는 전체 크기(max_bytes)를 넘으면
+  가장 오래 사용하지 않은 세션부터 삭제합니다. (LRU)
+- InMemoryChatSessionStore: 워커 메모리에 보관
+- SQLiteChatSessionStore: SQLite 파일에 보관하여 여러 워커가 공유하고, 재시작 후에도 대화를 유지
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from llm.tokenizer import get_tokenizer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 메시지마다 role/구분자로 붙는 토큰 (OpenAI chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# (role, content, tokens)
+Message = Tuple[str, str, int]
+
+
+def trim_history(messages: List[Message], max_tokens: int) -> List[Message]:
+    """토큰 합계가 max_tokens 이하가 될 때까지 가장 오래된 (user, assistant) 쌍부터 제거합니다."""
+    total = sum(tokens for _, _, tokens in messages)
+    start = 0
+    while total > max_tokens and len(messages) - start >= 2:
+        total -= messages[start][2] + messages[start + 1][2]
+        start += 2
+    return messages[start:]
+
+
+def _size(summary: str, messages: List[Message]) -> int:
+    return len(summary.encode("utf-8")) + sum(len(content.encode("utf-8")) for _, content, _ in messages)
+
+
+def _is_prefix(messages: List[Message], summarized: List[Tuple[str, str]]) -> bool:
+    return [(role, content) for role, content, _ in messages[:len(summarized)]] == list(summarized)
+
+
+class ChatSessionStore:
+    """세션 저장소 공통 설정과 토큰 계산. 저장 방식은 하위 클래스에서 구현합니다."""
+    backend = "base"
+    # 파일 I/O나 다른 프로세스와의 잠금 대기가 있는 저장소 — 비동기 메서드가 워커 스레드에서 실행
+    blocking = False
+
+    def __init__(
+        self,
+        tokenizer=None,
+        max_history_tokens: int = 3000,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 86400,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.max_history_tokens = max_history_tokens
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+    def _message(self, role: str, content: str) -> Message:
+        return role, content, self.tokenizer.count(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def get_context(self, user_id: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """(이전 대화 요약, 요약 이후 (role, content) 목록)을 반환합니다. 없거나 만료된 세션은 ("", [])"""
+        raise NotImplementedError
+
+    def get_history(self, user_id: str) -> List[Tuple[str, str]]:
+        return self.get_context(user_id)[1]
+
+    def append_turn(self, user_id: str, user_message: str, assistant_reply: str) -> int:
+        """한 번의 질문/답변을 이력에 추가하고 토큰 한도에 맞게 자른 뒤, 남은 이력의 토큰 수를 반환합니다."""
+        raise NotImplementedError
+
+    def compact(self, user_id: str, summary: str, summarized: List[Tuple[str, str]]) -> bool:
+        """
+        이력 앞부분(summarized)을 요약문으로 대체합니다.
+        요약하는 동안 이력이 잘려 앞부분이 달라졌으면 적용하지 않고 False를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def clear(self, user_id: str):
+        raise NotImplementedError
+
+    # --- 이벤트 루프에서 사용하는 비동기 버전 --- #
+
+    async def _call(self, fn, *args):
+        return await asyncio.to_thread(fn, *args) if self.blocking else fn(*args)
+
+    async def aget_context(self, user_id: str) -> Tuple[str, List[Tuple[str, str]]]:
+        return await self._call(self.get_context, user_id)
+
+    async def aappend_turn(self, user_id: str, user_message: str, assistant_reply: str) -> int:
+        return await self._call(self.append_turn, user_id, user_message, assistant_reply)
+
+    async def acompact(self, user_id: str, summary: str, summarized: List[Tuple[str, str]]) -> bool:
+        return await self._call(self.compact, user_id, summary, summarized)
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+@dataclass
+class _Session:
+    messages: List[Message]
+    size: int
+    accessed_at: float
+    summary: str = ""
+
+
+class InMemoryChatSessionStore(ChatSessionStore):
+    backend = "memory"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _pop(self, user_id: str) -> Optional[_Session]:
+        session = self._sessions.pop(user_id, None)
+        if session is not None:
+            self._bytes -= session.size
+        return session
+
+    def _is_expired(self, session: _Session, now: float) -> bool:
+        return now - session.accessed_at > self.ttl_seconds
+
+    def _evict(self, now: float):
+        # OrderedDict 앞쪽이 가장 오래 사용하지 않은 세션 (만료된 세션도 앞쪽에 모임)
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if not (self._is_expired(session, now) or len(self._sessions) > self.max_sessions
+                    or self._bytes > self.max_bytes):
+                break
+            self._pop(user_id)
+            self.evictions += 1
+
+    def get_context(self, user_id: str) -> Tuple[str, List[Tuple[str, str]]]:
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                return "", []
+            if self._is_expired(session, now):
+                self._pop(user_id)
+                return "", []
+            session.accessed_at = now
+            self._sessions.move_to_end(user_id)
+            return session.summary, [(role, content) for role, content, _ in session.messages]
+
+    def append_turn(self, user_id: str, user_message: str, assistant_reply: str) -> int:
+        turn = [self._message("user", user_message), self._message("assistant", assistant_reply)]
+        now = time.time()
+        with self._lock:
+            session = self._pop(user_id)
+            if session is None or self._is_expired(session, now):
+                session = _Session([], 0, now)
+            messages = trim_history(session.messages + turn, self.max_history_tokens)
+            session = _Session(messages, _size(session.summary, messages), now, session.summary)
+            self._sessions[user_id] = session
+            self._bytes += session.size
+            self._evict(now)
+            return sum(tokens for _, _, tokens in messages)
+
+    def compact(self, user_id: str, summary: str, summarized: List[Tuple[str, str]]) -> bool:
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None or not _is_prefix(session.messages, summarized):
+                return False
+            self._bytes -= session.size
+            session.messages = session.messages[len(summarized):]
+            session.summary = summary
+            session.size = _size(summary, session.messages)
+            self._bytes += session.size
+            return True
+
+    def clear(self, user_id: str):
+        with self._lock:
+            self._pop(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": self.backend, "sessions": len(self._sessions), "bytes": self._bytes,
+                    "evictions": self.evictions}
+
+
+class SQLiteChatSessionStore(ChatSessionStore):
+    """
+    세션을 SQLite 파일에 저장합니다. 여러 워커 프로세스가 같은 파일을 공유할 수 있도록 WAL 모드를 사용하고,
+    이력 갱신(읽기-자르기-쓰기)은 BEGIN IMMEDIATE 트랜잭션으로 직렬화합니다.
+    """
+    backend = "sqlite"
+    # BEGIN IMMEDIATE는 다른 워커의 쓰기가 끝날 때까지 최대 timeout(5초) 기다릴 수 있음
+    blocking = True
+
+    def __init__(self, path: str, *args, evict_interval: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self.evict_interval = evict_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                user_id     TEXT PRIMARY KEY,
+                messages    TEXT NOT NULL,
+                summary     TEXT NOT NULL DEFAULT '',
+                size        INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chat_sessions)")}
+        if "summary" not in columns:  # 요약 기능 이전에 만들어진 파일
+            self._conn.execute("ALTER TABLE chat_sessions ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_accessed ON chat_sessions (accessed_at)")
+        self.evict()
+
+    def _load(self, user_id: str, now: float) -> Tuple[str, List[Message]]:
+        row = self._conn.execute(
+            "SELECT summary, messages FROM chat_sessions WHERE user_id = ? AND accessed_at >= ?",
+            (user_id, now - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return "", []
+        return row[0], [tuple(message) for message in json.loads(row[1])]
+
+    def _save(self, user_id: str, summary: str, messages: List[Message], accessed_at: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO chat_sessions (user_id, messages, summary, size, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (user_id, json.dumps(messages, ensure_ascii=False), summary, _size(summary, messages), accessed_at)
+        )
+
+    def get_context(self, user_id: str) -> Tuple[str, List[Tuple[str, str]]]:
+        now = time.time()
+        with self._lock:
+            summary, messages = self._load(user_id, now)
+            if summary or messages:
+                self._conn.execute("UPDATE chat_sessions SET accessed_at = ? WHERE user_id = ?", (now, user_id))
+        return summary, [(role, content) for role, content, _ in messages]
+
+    def append_turn(self, user_id: str, user_message: str, assistant_reply: str) -> int:
+        turn = [self._message("user", user_message), self._message("assistant", assistant_reply)]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                summary, messages = self._load(user_id, now)
+                messages = trim_history(messages + turn, self.max_history_tokens)
+                self._save(user_id, summary, messages, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._writes += 1
+            due = self._writes % self.evict_interval == 0
+        if due:
+            self.evict()
+        return sum(tokens for _, _, tokens in messages)
+
+    def compact(self, user_id: str, summary: str, summarized: List[Tuple[str, str]]) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT messages, accessed_at FROM chat_sessions WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                messages = [tuple(message) for message in json.loads(row[0])] if row else []
+                applied = bool(messages) and _is_prefix(messages, summarized)
+                if applied:
+                    self._save(user_id, summary, messages[len(summarized):], row[1])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return applied
+
+    def evict(self) -> int:
+        """만료된 세션을 지우고, 세션 수/전체 크기 한도를 넘으면 오래 사용하지 않은 세션부터 삭제합니다."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM chat_sessions WHERE accessed_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            removed += self._conn.execute("""
+                DELETE FROM chat_sessions WHERE user_id IN (
+                    SELECT user_id FROM chat_sessions ORDER BY accessed_at DESC, user_id LIMIT -1 OFFSET ?
+                )
+            """, (self.max_sessions,)).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM chat_sessions").fetchone()[0]
+            if total > self.max_bytes:
+                removed += self._conn.execute("""
+                    DELETE FROM chat_sessions WHERE user_id IN (
+                        SELECT user_id FROM (
+                            SELECT user_id, SUM(size) OVER (ORDER BY accessed_at, user_id) - size AS freed_before
+                            FROM chat_sessions
+                        ) WHERE freed_before < ?
+                    )
+                """, (total - self.max_bytes,)).rowcount
+            self.evictions += removed
+        if removed:
+            logger.debug(f"채팅 세션 {removed}건 삭제")
+        return removed
+
+    def clear(self, user_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_sessions WHERE user_id = ?", (user_id,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM chat_sessions"
+            ).fetchone()
+        return {"backend": self.backend, "sessions": sessions, "bytes": size, "evictions": self.evictions}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,98 @@
+"""
+긴 채팅 이력의 점진적 요약 (rolling summarization)
+
+답변을 저장한 뒤 이력 토큰 수가 threshold_tokens를 넘으면, 최근 keep_recent_turns 턴을 제외한 앞부분을
+기존 요약과 합쳐 새 요약문으로 만들고 세션 저장소에서 그 앞부분을 요약문으로 대체합니다.
+요약은 백그라운드 태스크로 실행되어 응답 스트림을 기다리게 하지 않으며,
+같은 사용자의 요약이 진행 중이면 새로 시작하지 않습니다.
+"""
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+
+from llm.prompt_templates.chat_prompts import CHAT_SUMMARY_PROMPT
+from services.chat_session_store import ChatSessionStore
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = get_logger(__name__)
+
+ROLE_LABELS = {"user": "사용자", "assistant": "상담봇"}
+
+
+class ChatHistorySummarizer:
+    def __init__(
+        self,
+        llm_client: "AsyncOpenAI",
+        session_store: ChatSessionStore,
+        threshold_tokens: int = 1500,
+        keep_recent_turns: int = 2,
+        max_summary_tokens: int = 400,
+        model: str = "gpt-4o-mini",
+    ):
+        self.llm_client = llm_client
+        self.session_store = session_store
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.max_summary_tokens = max_summary_tokens
+        self.model = model
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.scheduled = 0
+        self.compacted = 0
+        self.discarded = 0
+        self.failed = 0
+
+    def maybe_schedule(self, user_id: str, history_tokens: int) -> bool:
+        """이력이 threshold를 넘었으면 요약 태스크를 시작합니다. (이벤트 루프 안에서 호출)"""
+        if history_tokens <= self.threshold_tokens or user_id in self._in_flight:
+            return False
+        self._in_flight.add(user_id)
+        self.scheduled += 1
+        task = asyncio.create_task(self._run(user_id))
+        # 태스크가 끝나기 전에 가비지 컬렉션되지 않도록 참조를 유지
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, user_id: str):
+        try:
+            summary, history = await self.session_store.aget_context(user_id)
+            older = history[:max(0, len(history) - self.keep_recent_turns * 2)]
+            if len(older) < 2:
+                return
+            new_summary = await self.summarize(summary, older)
+            if not new_summary:
+                return
+            if await self.session_store.acompact(user_id, new_summary, older):
+                self.compacted += 1
+                logger.debug(f"Chat history compacted for user {user_id}: {len(older)} messages summarized")
+            else:
+                # 요약하는 동안 이력이 잘려 앞부분이 달라진 경우 — 다음 턴에 다시 요약
+                self.discarded += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Chat history summarization failed for user {user_id}: {e!r}")
+        finally:
+            self._in_flight.discard(user_id)
+
+    async def summarize(self, previous_summary: str, messages: List[Tuple[str, str]]) -> str:
+        conversation = "\n".join(f"{ROLE_LABELS.get(role, role)}: {content}" for role, content in messages)
+        response = await self.llm_client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": CHAT_SUMMARY_PROMPT.format(
+                previous_summary=previous_summary or "(없음)", conversation=conversation)}],
+            temperature=0,
+            max_tokens=self.max_summary_tokens,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    async def drain(self):
+        """진행 중인 요약 태스크가 끝날 때까지 기다립니다. (종료 시/테스트용)"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"scheduled": self.scheduled, "compacted": self.compacted, "discarded": self.discarded,
+                "failed": self.failed, "in_flight": len(self._in_flight)}
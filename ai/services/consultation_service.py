@@ -1,60 +1,121 @@
+import asyncio
 import json
-from typing import Any, Dict, List, Tuple
-
-from openai import AsyncOpenAI
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from app.api.schemas.consult import ConsultationRequest, ApplicationCase, ApplicationData
 from llm.prompt_templates.consult_prompts import (
     CORE_QUESTION_GENERATION_PROMPT,
     KEYWORD_TAG_GENERATION_PROMPT,
+    QUESTION_TAG_GENERATION_PROMPT,
     APPLICATION_FORMAT_PROMPT
 )
 from config.tags import SPECIALTY_TAGS
+from config.settings import get_llm_settings
+from llm.clients.response_cache import acached_completion
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from services.tag_classifier import TagClassifier
+
+logger = get_logger(__name__)
+
+
+def _is_json_object(content: str) -> bool:
+    try:
+        return isinstance(json.loads(content), dict)
+    except ValueError:
+        return False
 
 
 class ConsultationService:
     """
     상담 신청서 생성 및 관련 AI 기능을 처리하는 서비스 클래스입니다.
+
+    신청서 포맷, 핵심 질문, 태그 생성은 서로 독립적인 LLM 호출이므로 asyncio.gather로 동시에 실행하고,
+    각 호출에는 제한 시간(call_timeout)을 둡니다. 시간 초과나 파싱 실패는 호출별 기본값으로 대체합니다.
+    merge_questions_tags가 True이면 질문과 태그를 하나의 JSON 호출로 생성합니다.
+    tag_classifier가 주어지면 태그는 로컬 분류기로 먼저 분류하고, 확신도가 낮을 때만 LLM을 호출합니다.
     """
-    def __init__(self, llm_client: AsyncOpenAI):
+    def __init__(
+        self,
+        llm_client: "AsyncOpenAI",
+        call_timeout: Optional[float] = None,
+        merge_questions_tags: Optional[bool] = None,
+        tag_classifier: Optional["TagClassifier"] = None,
+    ):
+        settings = get_llm_settings()
         self.llm_client = llm_client
+        self.call_timeout = call_timeout if call_timeout is not None else settings.consult_call_timeout
+        self.merge_questions_tags = (
+            merge_questions_tags if merge_questions_tags is not None else settings.consult_merge_questions_tags
+        )
+        self.tag_classifier = tag_classifier
 
-    def _format_application(self, request: ConsultationRequest) -> Dict[str, Any]:
+    async def _chat_json(self, system: str, prompt: str) -> Dict[str, Any]:
         """
-        원본 Pydantic 객체에서 model_dump한 JSON을 LLM에 전달하여
-        주요 필드만 추려낸 가독성 높은 application dict로 변환합니다.
-        실패 시에는 최소 필드만 수동 매핑하여 반환합니다.
+        JSON 모드로 LLM을 호출하여 파싱된 dict를 반환합니다. (제한 시간 초과 시 asyncio.TimeoutError)
+        캐시된 응답을 모든 사용자에게 재사용하므로 temperature=0으로 결정적으로 호출하고,
+        응답은 LLM 응답 캐시(활성화된 경우)를 거칩니다.
         """
-        # 1) raw application 데이터 생성
+        model = "gpt-4o-mini"
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt},
+        ]
+
+        async def fetch() -> str:
+            response = await asyncio.wait_for(
+                self.llm_client.chat.completions.create(
+                    model=model,
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    messages=messages,
+                ),
+                timeout=self.call_timeout,
+            )
+            return response.choices[0].message.content
+
+        content = await acached_completion(
+            model, messages, {"response_format": "json_object", "temperature": 0}, fetch, validate=_is_json_object
+        )
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError("JSON 객체가 아닌 응답")
+        return data
+
+    @staticmethod
+    def _build_raw_application(request: ConsultationRequest) -> Dict[str, Any]:
         case_obj = ApplicationCase(
             title=request.case.title,
             summary=request.case.summary,
             fullText=request.case.fullText,
         )
-        raw_app = ApplicationData(
+        return ApplicationData(
             case=case_obj,
             weakPoints=request.weakPoints,
             desiredOutcome=request.desiredOutcome,
         ).model_dump()
 
+    async def _format_application(self, request: ConsultationRequest) -> Dict[str, Any]:
+        """
+        원본 Pydantic 객체에서 model_dump한 JSON을 LLM에 전달하여
+        주요 필드만 추려낸 가독성 높은 application dict로 변환합니다.
+        실패 시에는 최소 필드만 수동 매핑하여 반환합니다.
+        """
+        # 1) raw application 데이터 생성
+        raw_app = self._build_raw_application(request)
+
         # 2) LLM 호출
         try:
             prompt = APPLICATION_FORMAT_PROMPT.format(raw_json=json.dumps(raw_app, ensure_ascii=False))
-            resp = self.llm_client.chat.completions.create(
-                model="gpt-4o-mini",
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "You are a JSON formatting assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            formatted = json.loads(resp.choices[0].message.content)
+            formatted = await self._chat_json("You are a JSON formatting assistant.", prompt)
             # 검증: 필수 키가 모두 있는지 확인
             if all(k in formatted for k in ("case", "weakPoints", "desiredOutcome")):
                 return formatted
-        except Exception:
+        except Exception as e:
             # LLM 포맷 실패 시 수동 매핑으로 fallback
-            pass
+            logger.warning(f"신청서 포맷 LLM 호출 실패, 수동 매핑 사용: {e!r}")
 
         # 3) 수동 매핑 fallback
         return {
@@ -68,48 +129,90 @@ class ConsultationService:
         }
 
     async def _call_llm_and_parse(
-        self, prompt: str, field: str
-    ) -> List[str]:
+        self, prompt: str, *fields: str
+    ) -> Tuple[List[str], ...]:
         """
-        LLM 호출 후 JSON 파싱을 수행하고, 지정된 key(field)의 리스트를 반환합니다.
-        실패 시 빈 리스트 반환.
+        LLM 호출 후 JSON 파싱을 수행하고, 지정된 key(fields)별 리스트를 순서대로 반환합니다.
+        실패하거나 리스트가 아닌 key는 빈 리스트를 반환합니다.
         """
         try:
-            response = await self.llm_client.chat.completions.create(
-                model="gpt-4o-mini",
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "You output strict JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            data = json.loads(response.choices[0].message.content)
-            return data.get(field, []) if isinstance(data.get(field), list) else []
-        except Exception:
-            return []
+            data = await self._chat_json("You output strict JSON.", prompt)
+        except Exception as e:
+            logger.warning(f"LLM 호출/파싱 실패 ({', '.join(fields)}): {e!r}")
+            data = {}
+        return tuple(data[f] if isinstance(data.get(f), list) else [] for f in fields)
+
+    def _classify_tags_locally(self, application: Dict[str, Any]) -> Optional[List[str]]:
+        """로컬 분류기로 태그를 분류합니다. 분류기가 없거나 확신도가 낮으면 None (LLM fallback)"""
+        if self.tag_classifier is None:
+            return None
+        case = application["case"]
+        text = "\n".join(t for t in (case.get("title"), case.get("summary"), case.get("fullText")) if t)
+        if not text:
+            return None
+        try:
+            prediction = self.tag_classifier.classify(text)
+        except Exception as e:
+            logger.warning(f"로컬 태그 분류 실패, LLM 사용: {e!r}")
+            return None
+        if not prediction.confident:
+            logger.debug(f"로컬 태그 확신도 낮음 {prediction.scores}, LLM 사용")
+            return None
+        return prediction.tags
 
     async def _generate_questions_tags_from_llm(
         self, application: Dict[str, Any]
     ) -> Tuple[List[str], List[str]]:
         """
         LLM 호출을 통해 핵심 질문과 키워드 태그를 생성·파싱하여 반환합니다.
+        두 호출은 동시에 실행하며, merge_questions_tags이면 한 번의 호출로 생성합니다.
         실패 시 빈 리스트 반환.
         """
         full_text = application["case"]["fullText"]
         desired = application.get("desiredOutcome", "")
+        specialty_tags = ", ".join(SPECIALTY_TAGS)
 
         q_prompt = CORE_QUESTION_GENERATION_PROMPT.format(
             fullText=full_text,
             desiredOutcome=desired,
         )
-        questions = await self._call_llm_and_parse(q_prompt, "questions")
-
         t_prompt = KEYWORD_TAG_GENERATION_PROMPT.format(
             fullText=full_text,
-            specialty_tags=", ".join(SPECIALTY_TAGS),
+            specialty_tags=specialty_tags,
+        )
+        if self.tag_classifier is not None:
+            return await self._generate_with_local_tags(application, q_prompt, t_prompt)
+
+        if self.merge_questions_tags:
+            prompt = QUESTION_TAG_GENERATION_PROMPT.format(
+                fullText=full_text,
+                desiredOutcome=desired,
+                specialty_tags=specialty_tags,
+            )
+            return await self._call_llm_and_parse(prompt, "questions", "tags")
+
+        (questions,), (tags,) = await asyncio.gather(
+            self._call_llm_and_parse(q_prompt, "questions"),
+            self._call_llm_and_parse(t_prompt, "tags"),
         )
-        tags = await self._call_llm_and_parse(t_prompt, "tags")
+        return questions, tags
 
+    async def _generate_with_local_tags(
+        self, application: Dict[str, Any], q_prompt: str, t_prompt: str
+    ) -> Tuple[List[str], List[str]]:
+        """
+        질문 LLM 호출과 로컬 태그 분류(임베딩 계산, 워커 스레드)를 동시에 실행합니다.
+        로컬 분류 확신도가 낮으면 질문 호출이 진행되는 동안 태그 LLM 호출로 fallback 합니다.
+        """
+        questions_task = asyncio.ensure_future(self._call_llm_and_parse(q_prompt, "questions"))
+        try:
+            tags = await asyncio.to_thread(self._classify_tags_locally, application)
+            if tags is None:
+                (tags,) = await self._call_llm_and_parse(t_prompt, "tags")
+            (questions,) = await questions_task
+        except BaseException:
+            questions_task.cancel()
+            raise
         return questions, tags
 
     async def create_application_and_questions(
@@ -117,14 +220,16 @@ class ConsultationService:
     ) -> Dict[str, Any]:
         """
         상담 신청서(application), 핵심 질문, 태그를 생성하여 반환합니다.
+        신청서 포맷은 원문을 바꾸지 않으므로, 질문/태그 생성은 포맷 결과를 기다리지 않고 원본으로 동시에 실행합니다.
         """
-        # application: LLM 포맷 또는 수동 매핑
-        application = self._format_application(request)
-        questions, tags = await self._generate_questions_tags_from_llm(application)
+        raw_app = self._build_raw_application(request)
+        application, (questions, tags) = await asyncio.gather(
+            self._format_application(request),
+            self._generate_questions_tags_from_llm(raw_app),
+        )
 
         return {
             "application": application,
             "questions": questions,
             "tags": tags,
         }
-
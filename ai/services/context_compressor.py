@@ -0,0 +1,93 @@
+"""
+검색 판례의 추출 요약(문장 선택) 압축
+
+검색된 청크 전체를 프롬프트에 넣는 대신, 청크를 문장으로 나누고 Cross-encoder로 질의와의 관련도를
+한 번에(배치) 계산하여 판례(case_id)별로 점수가 높은 문장만 원래 순서대로 남깁니다.
+같은 판례의 청크 여러 개는 하나로 합쳐지므로 판례 단위 중복도 함께 줄어듭니다.
+"""
+import re
+from typing import Any, Dict, List, Tuple
+
+from llm.models.cross_encoder_model import CrossEncoderModel
+
+# 마침표/물음표/느낌표 뒤 공백 또는 줄바꿈에서 문장을 나눕니다. (판결문은 대부분 "~다." 로 끝남)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?!。])\s+|\n+")
+
+
+def split_sentences(text: str, min_chars: int = 15, max_chars: int = 400) -> List[str]:
+    """문장 단위로 나눕니다. 너무 짧은 조각은 다음 문장에 붙이고, 너무 긴 문장은 max_chars로 자릅니다."""
+    sentences: List[str] = []
+    carry = ""
+    for piece in _SENTENCE_SPLIT.split(text or ""):
+        piece = piece.strip()
+        if not piece:
+            continue
+        piece = f"{carry} {piece}".strip() if carry else piece
+        if len(piece) < min_chars:
+            carry = piece
+            continue
+        carry = ""
+        sentences.append(piece[:max_chars])
+    if carry:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {carry}"[:max_chars]
+        else:
+            sentences.append(carry)
+    return sentences
+
+
+class ContextCompressor:
+    def __init__(
+        self,
+        cross_encoder_model: CrossEncoderModel,
+        sentences_per_case: int = 3,
+        batch_size: int = 64,
+        min_sentence_chars: int = 15,
+        max_sentence_chars: int = 400,
+    ):
+        self.cross_encoder_model = cross_encoder_model
+        self.sentences_per_case = sentences_per_case
+        self.batch_size = batch_size
+        self.min_sentence_chars = min_sentence_chars
+        self.max_sentence_chars = max_sentence_chars
+
+    def compress(self, query: str, docs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        {"id", "issue", "text"} 목록(관련도 순)을 판례별로 합치고 상위 문장만 남긴 목록과 압축 통계를 반환합니다.
+        판례 순서는 처음 등장한 순서(검색 순위)를 유지합니다.
+        """
+        cases: Dict[Any, Dict[str, Any]] = {}
+        for doc in docs:
+            case = cases.setdefault(doc.get("id", ""), {**doc, "sentences": []})
+            case["sentences"].extend(
+                split_sentences(doc.get("text", ""), self.min_sentence_chars, self.max_sentence_chars)
+            )
+
+        # 모든 판례의 문장을 한 번의 Cross-encoder 호출로 채점합니다.
+        pairs = [(case_id, i, sentence) for case_id, case in cases.items()
+                 for i, sentence in enumerate(case["sentences"])]
+        scores = self.cross_encoder_model.get_cross_encoder_scores(
+            query, [sentence for _, _, sentence in pairs], batch_size=self.batch_size
+        )
+        scored: Dict[Any, List[Tuple[float, int]]] = {case_id: [] for case_id in cases}
+        for (case_id, i, _), score in zip(pairs, scores):
+            scored[case_id].append((score, i))
+
+        compressed = []
+        for case_id, case in cases.items():
+            top = sorted(scored[case_id], reverse=True)[:self.sentences_per_case]
+            keep = sorted(i for _, i in top)
+            text = " ".join(case["sentences"][i] for i in keep)
+            compressed.append({k: v for k, v in case.items() if k != "sentences"} | {"text": text})
+
+        chars_before = sum(len(doc.get("text", "")) for doc in docs)
+        chars_after = sum(len(doc["text"]) for doc in compressed)
+        stats = {
+            "chunks": len(docs),
+            "cases": len(compressed),
+            "sentences_scored": len(pairs),
+            "chars_before": chars_before,
+            "chars_after": chars_after,
+            "ratio": round(chars_before / chars_after, 2) if chars_after else 0.0,
+        }
+        return compressed, stats
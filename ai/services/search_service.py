@@ -3,16 +3,16 @@ from pgvector.psycopg2 import register_vector
 import os
 from dotenv import load_dotenv
 from datetime import date
+from typing import List, Optional
 
-from db.database import get_psycopg2_connection
-from utils.logger import setup_logger, get_logger
+from db.database import pooled_connection
+from utils.logger import get_logger
 from llm.models.embedding_model import EmbeddingModel
 from llm.models.cross_encoder_model import CrossEncoderModel
 
 load_dotenv()
 
 # ────────────────── 로거 설정 ──────────────────
-setup_logger()
 logger = get_logger(__name__)
 
 class SearchService:
@@ -20,7 +20,8 @@ class SearchService:
         self.embedding_model = embedding_model
         self.cross_encoder_model = cross_encoder_model
 
-    async def vector_search(self, query: str, page: int = 1, size: int = 10, use_rerank: bool = True) -> tuple[list[dict], int]:
+    async def vector_search(self, query: str, page: int = 1, size: int = 10, use_rerank: bool = True,
+                            query_embedding: Optional[List[float]] = None) -> tuple[list[dict], int]:
         """
         주어진 질의(query)에 대해 임베딩 유사도 기준으로
         유사한 법률 문서 청크를 조회한다.
@@ -36,6 +37,8 @@ class SearchService:
             페이지 당 결과 개수.
         use_rerank : bool, 기본값 True
             Cross-encoder를 사용하여 검색 결과를 재정렬할지 여부.
+        query_embedding : list[float], 선택
+            호출하는 쪽에서 이미 계산한 질의 임베딩. 주어지면 다시 인코딩하지 않는다.
 
         반환값
         ----------
@@ -43,16 +46,17 @@ class SearchService:
             각 요소가 {'case_id': str, 'title': str, 'decision_date': date, 'category': str, 'summary': str, 'full_text': str} 형태인 리스트와 총 결과 개수.
             DB 오류나 예외 발생 시 빈 리스트와 0을 반환한다.
         """
-        query_embedding = self.embedding_model.get_embedding(query)
+        if query_embedding is None:
+            query_embedding = self.embedding_model.get_embedding(query)
+
+        # legal_*_current 뷰는 활성 인덱스 버전을 가리키므로 blue/green 전환 시 재시작 없이 새 버전을 조회합니다.
 
-        conn = None
         try:
-            conn = get_psycopg2_connection()
-            register_vector(conn)
+            with pooled_connection() as conn, conn.cursor() as cur:
+                register_vector(conn)
 
-            with conn.cursor() as cur:
                 # 먼저 전체 개수를 가져옵니다.
-                cur.execute("SELECT COUNT(DISTINCT lc.case_id) FROM legal_chunks lch JOIN legal_cases lc ON lch.case_id = lc.case_id")
+                cur.execute("SELECT COUNT(DISTINCT lc.case_id) FROM legal_chunks_current lch JOIN legal_cases_current lc ON lch.case_id = lc.case_id")
                 total_count = cur.fetchone()[0]
 
                 # 페이지네이션을 고려하여 검색합니다.
@@ -60,8 +64,8 @@ class SearchService:
                 cur.execute(
                     """
                     SELECT lc.case_id, lc.title, lc.decision_date, lc.category, lc.issue, lc.summary, lc.full_text, lch.chunk_text
-                    FROM legal_chunks lch
-                    JOIN legal_cases lc ON lch.case_id = lc.case_id
+                    FROM legal_chunks_current lch
+                    JOIN legal_cases_current lc ON lch.case_id = lc.case_id
                     ORDER BY lch.embedding <-> %s::vector
                     LIMIT %s OFFSET %s
                     """,
@@ -97,9 +101,6 @@ class SearchService:
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}")
             return [], 0
-        finally:
-            if conn:
-                conn.close()
 
     async def get_case_by_id(self, prec_id: str) -> dict | None:
         """
@@ -115,14 +116,12 @@ class SearchService:
         dict | None
             판례 상세 정보 딕셔너리 또는 찾을 수 없는 경우 None.
         """
-        conn = None
         try:
-            conn = get_psycopg2_connection()
-            with conn.cursor() as cur:
+            with pooled_connection() as conn, conn.cursor() as cur:
                 cur.execute(
                     """
                     SELECT case_id, title, decision_date, category, issue, summary, statutes, precedents, full_text
-                    FROM legal_cases
+                    FROM legal_cases_current
                     WHERE case_id = %s
                     """,
                     (prec_id,)
@@ -138,9 +137,6 @@ class SearchService:
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}")
             return None
-        finally:
-            if conn:
-                conn.close()
 
     def _rerank_cases(self, query: str, initial_results: list[dict]) -> list[dict]:
         """
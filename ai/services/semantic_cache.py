@@ -0,0 +1,117 @@
+"""
+사건 분석 시맨틱 캐시
+
+같은 사연을 조금 고쳐 다시 요청하는 경우가 많으므로, 사건 본문 임베딩이 이전 분석과
+코사인 유사도 threshold 이상으로 가까우면 저장된 CaseAnalysisResult를 재사용합니다.
+
+- 인덱스는 정규화된 임베딩을 담는 (max_entries, dim) numpy 행렬이며, 조회는 행렬-벡터 곱 한 번입니다.
+  가득 차면 가장 오래된 항목부터 덮어씁니다. (워커 프로세스별 메모리 캐시)
+- 검색 판례 수(top_k)가 다르면 분석 입력이 달라지므로, 항목마다 top_k를 저장하고 같은 값끼리만 비교합니다.
+- 완전히 같은 본문이 아니면 유사도만큼 confidence를 낮춰 반환합니다.
+- 조회마다 최고 유사도를 기록하여 적중률과 유사도 분포(구간별 개수, 백분위)를 제공하므로
+  threshold를 실제 분포를 보고 조정할 수 있습니다.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.api.schemas.analysis import CaseAnalysisResult
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 유사도 분포 구간 경계 (threshold 조정에 필요한 0.8 이상 구간을 세분화)
+SIMILARITY_BUCKETS = (0.5, 0.7, 0.8, 0.85, 0.9, 0.93, 0.95, 0.97, 0.99)
+EXACT_SIMILARITY = 0.9999
+
+
+class SemanticAnalysisCache:
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1000, ttl_seconds: float = 86400,
+                 history_size: int = 1000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._results: List[Optional[CaseAnalysisResult]] = [None] * max_entries
+        self._created_at = np.zeros(max_entries)
+        self._top_k = np.full(max_entries, -1, dtype=np.int64)
+        self._size = 0
+        self._next = 0
+        self.lookups = 0
+        self.hits = 0
+        self._bucket_counts = [0] * (len(SIMILARITY_BUCKETS) + 1)
+        self._recent_similarities: deque = deque(maxlen=history_size)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def lookup(self, embedding: Sequence[float], top_k: Optional[int] = None) -> Optional[Tuple[CaseAnalysisResult, float]]:
+        """같은 top_k로 저장된 이전 분석 중 가장 가까운 것이 threshold 이상이면 (결과, 유사도)를 반환합니다."""
+        query = self._normalize(embedding)
+        with self._lock:
+            self.lookups += 1
+            best, index = 0.0, -1
+            if self._size:
+                similarities = self._vectors[:self._size] @ query
+                expired = self._created_at[:self._size] < time.time() - self.ttl_seconds
+                similarities[expired] = -1.0
+                similarities[self._top_k[:self._size] != self._top_k_key(top_k)] = -1.0
+                index = int(np.argmax(similarities))
+                best = float(similarities[index])
+            self._record(best)
+            if index < 0 or best < self.threshold:
+                return None
+            self.hits += 1
+            stored = self._results[index]
+        result = stored.model_copy(deep=True)
+        if best < EXACT_SIMILARITY:
+            # 거의 같은 사연이지만 동일하지 않으므로 유사도만큼 신뢰도를 낮춥니다.
+            result.confidence = round(result.confidence * best, 4)
+        return result, best
+
+    def add(self, embedding: Sequence[float], result: CaseAnalysisResult, top_k: Optional[int] = None):
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            slot = self._next
+            self._vectors[slot] = vector
+            self._results[slot] = result.model_copy(deep=True)
+            self._created_at[slot] = time.time()
+            self._top_k[slot] = self._top_k_key(top_k)
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    @staticmethod
+    def _top_k_key(top_k: Optional[int]) -> int:
+        return -1 if top_k is None else top_k
+
+    def _record(self, similarity: float):
+        bucket = int(np.searchsorted(SIMILARITY_BUCKETS, similarity, side="right"))
+        self._bucket_counts[bucket] += 1
+        self._recent_similarities.append(similarity)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            edges = ("0",) + tuple(str(b) for b in SIMILARITY_BUCKETS)
+            upper = tuple(str(b) for b in SIMILARITY_BUCKETS) + ("1",)
+            histogram = {f"{lo}-{hi}": count for lo, hi, count in zip(edges, upper, self._bucket_counts)}
+            recent = np.asarray(self._recent_similarities)
+            percentiles = (
+                {f"p{p}": round(float(np.percentile(recent, p)), 4) for p in (50, 90, 99)} if recent.size else {}
+            )
+            return {
+                "threshold": self.threshold,
+                "entries": self._size,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "similarity_histogram": histogram,
+                "recent_similarity": percentiles,
+            }
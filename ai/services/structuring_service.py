@@ -4,11 +4,16 @@ import time
 from langchain_core.language_models import BaseChatModel
 
 from config.settings import get_llm_settings
+from core.single_flight import SingleFlight, make_request_key
+from llm.clients.response_cache import is_cache_bypassed
 from llm.prompt_templates.structuring_prompts import STRUCTURING_PROMPT
 from llm.structuring_parser import StructuringParser
 from utils.logger import LoggerMixin
 from utils.exceptions import handle_service_exceptions, LLMError
 
+# 같은 사연이 동시에 들어오면(중복 제출/재시도) 한 번만 구조화 (서비스는 요청마다 생성되므로 모듈 단위로 공유)
+_structuring_flight = SingleFlight("structure_case")
+
 class StructuringService(LoggerMixin):
     def __init__(self, llm: BaseChatModel):
         self.llm = llm
@@ -17,6 +22,11 @@ class StructuringService(LoggerMixin):
 
     @handle_service_exceptions("사건 구조화 처리 중 오류가 발생했습니다.")
     async def structure_case(self, free_text: str) -> Dict[str, str]:
+        # 캐시 우회 요청은 캐시를 쓸 수 있는 진행 중 요청의 결과를 받지 않도록 키를 분리
+        key = make_request_key(free_text, is_cache_bypassed())
+        return await _structuring_flight.do(key, lambda: self._structure_case(free_text))
+
+    async def _structure_case(self, free_text: str) -> Dict[str, str]:
         llm_settings = get_llm_settings()
         max_retries = llm_settings.max_retries
         
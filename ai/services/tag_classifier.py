@@ -0,0 +1,90 @@
+"""
+로컬 임베딩 기반 전문 분야 태그 분류기
+
+태그별로 (태그 이름 + 설명 + 대표 사연 문장)을 EmbeddingModel로 임베딩하고 정규화·평균하여
+기준 벡터 행렬을 미리 만들어 둡니다. 분류는 입력 텍스트 임베딩 한 번과 행렬 곱 한 번(코사인 유사도)으로 끝납니다.
+
+- threshold 이상인 태그 중 점수가 높은 순으로 최대 top_k개를 선택합니다.
+- 최고 점수가 min_confidence보다 낮으면 confident=False로 표시하며, 호출하는 쪽에서 LLM으로 fallback 합니다.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from config.tags import SPECIALTY_TAGS, SPECIALTY_TAG_DESCRIPTIONS
+from llm.models.embedding_model import EmbeddingModel
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TagPrediction(NamedTuple):
+    tags: List[str]
+    scores: List[float]
+    confident: bool
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class TagClassifier:
+    def __init__(
+        self,
+        embedding_model: EmbeddingModel,
+        tags: Sequence[str] = SPECIALTY_TAGS,
+        descriptions: Optional[Dict[str, List[str]]] = None,
+        threshold: float = 0.35,
+        top_k: int = 3,
+        min_confidence: float = 0.5,
+    ):
+        self.embedding_model = embedding_model
+        self.tags = list(tags)
+        self.descriptions = descriptions if descriptions is not None else SPECIALTY_TAG_DESCRIPTIONS
+        self.threshold = threshold
+        self.top_k = top_k
+        self.min_confidence = min_confidence
+        self.tag_matrix = self._build_tag_matrix()
+
+    def _build_tag_matrix(self) -> np.ndarray:
+        """태그별 기준 벡터 (len(tags), dim) — 모든 프로토타입 문장을 한 번의 배치로 인코딩합니다."""
+        texts, owners = [], []
+        for i, tag in enumerate(self.tags):
+            for text in [tag, *self.descriptions.get(tag, [])]:
+                texts.append(text)
+                owners.append(i)
+        vectors = _normalize(np.asarray(self.embedding_model.encode_batch(texts), dtype=np.float32))
+        owners = np.asarray(owners)
+        centroids = np.stack([vectors[owners == i].mean(axis=0) for i in range(len(self.tags))])
+        logger.info(f"태그 분류기 준비 완료: 태그 {len(self.tags)}개, 프로토타입 문장 {len(texts)}개")
+        return _normalize(centroids)
+
+    def score(self, texts: List[str]) -> np.ndarray:
+        """텍스트별 태그 코사인 유사도 (len(texts), len(tags))"""
+        embeddings = _normalize(np.asarray(self.embedding_model.encode_batch(texts), dtype=np.float32))
+        return embeddings @ self.tag_matrix.T
+
+    def select(
+        self,
+        scores: np.ndarray,
+        threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> TagPrediction:
+        """한 텍스트의 점수 벡터에서 태그를 선택합니다."""
+        threshold = self.threshold if threshold is None else threshold
+        top_k = self.top_k if top_k is None else top_k
+        order = np.argsort(-scores)[:top_k]
+        picked = [i for i in order if scores[i] >= threshold]
+        best = float(scores[order[0]]) if len(order) else 0.0
+        return TagPrediction(
+            tags=[self.tags[i] for i in picked],
+            scores=[round(float(scores[i]), 4) for i in picked],
+            confident=bool(picked) and best >= self.min_confidence,
+        )
+
+    def classify(self, text: str) -> TagPrediction:
+        return self.select(self.score([text])[0])
+
+    def classify_batch(self, texts: List[str]) -> List[TagPrediction]:
+        return [self.select(row) for row in self.score(texts)]
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from app.api.routers.analysis import stream_analysis_endpoint
+from app.api.schemas.analysis import AnalysisRequest
+
+
+class _StreamingService:
+    """첫 이벤트를 보낸 뒤 LLM 출력을 기다리며 멈춰 있는 분석 서비스"""
+
+    def __init__(self):
+        self.closed = asyncio.Event()
+
+    async def stream_analysis(self, user_query):
+        try:
+            yield "status", {"stage": "retrieval", "cases": ["2020다123"]}
+            await asyncio.Event().wait()
+            yield "token", {"text": "도달하지 않음"}
+        finally:
+            self.closed.set()
+
+
+def _request():
+    return AnalysisRequest(case={"title": "제목", "summary": "요약", "fullText": "계약 위반 문의"})
+
+
+@pytest.mark.asyncio
+async def test_클라이언트_연결이_끊기면_분석_스트림을_닫음():
+    """SSE 응답 전송 태스크가 취소되면(연결 끊김) 서비스의 분석 스트림도 즉시 닫히는지 테스트"""
+    service = _StreamingService()
+    response = await stream_analysis_endpoint(_request(), service)
+    assert response.media_type == "text/event-stream"
+
+    received = []
+
+    async def send_body():
+        async for chunk in response.body_iterator:
+            received.append(chunk)
+
+    task = asyncio.create_task(send_body())
+    while not received:
+        await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.wait_for(service.closed.wait(), timeout=1)
+    event, data = received[0].strip().split("\n")
+    assert event == "event: status"
+    assert json.loads(data.removeprefix("data: "))["cases"] == ["2020다123"]
+
+
+@pytest.mark.asyncio
+async def test_분석_중_오류는_error_이벤트로_전달():
+    class _FailingService:
+        async def stream_analysis(self, user_query):
+            yield "status", {"stage": "retrieval", "cases": []}
+            raise RuntimeError("LLM 오류")
+
+    response = await stream_analysis_endpoint(_request(), _FailingService())
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    assert [chunk.split("\n")[0] for chunk in chunks] == ["event: status", "event: error", "event: done"]
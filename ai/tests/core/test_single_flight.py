@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from core.single_flight import SingleFlight, make_request_key
+
+
+def test_정규화된_입력으로_키_생성():
+    assert make_request_key("계약  위반\n문의 ", 3) == make_request_key("계약 위반 문의", 3)
+    assert make_request_key("계약 위반 문의", 3) != make_request_key("계약 위반 문의", 5)
+
+
+@pytest.mark.asyncio
+async def test_동시_동일_요청은_한_번만_실행():
+    flight = SingleFlight("test_coalesce")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"result": calls}
+
+    results = await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == {"result": 1} for r in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4, "cancelled": 0}
+
+    await flight.do("k", compute)  # 완료 후에는 다시 실행 (결과를 캐시하지 않음)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_예외는_모든_호출자에게_전달():
+    flight = SingleFlight("test_error")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("LLM 오류")
+
+    results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_일부_호출자_취소는_계산에_영향_없음():
+    """한 호출자가 취소되어도 나머지는 결과를 받고, 모두 취소되면 계산도 취소되는지 테스트"""
+    flight = SingleFlight("test_cancel")
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    first = asyncio.create_task(flight.do("k", compute))
+    second = asyncio.create_task(flight.do("k", compute))
+    await started.wait()
+    first.cancel()
+
+    assert await second == "ok"
+    assert first.cancelled()
+
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    only = asyncio.create_task(flight.do("slow", slow))
+    await asyncio.sleep(0.01)
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    assert flight.stats()["cancelled"] == 1 and flight.stats()["in_flight"] == 0
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock
+
+from config.settings import WarmupSettings
+from core.lifecycle import ReadinessState
+from core.warmup import warmup_models, _is_steady
+
+
+@pytest.fixture
+def warmup_settings():
+    return WarmupSettings(
+        enabled=True,
+        min_iterations=4,
+        max_iterations=20,
+        window=2,
+        stability_tolerance=0.5,
+        rerank_batch_sizes_str="5,10",
+    )
+
+
+def test_워밍업_실제_배치_크기로_모델_호출(warmup_settings):
+    """워밍업 시 설정된 배치 크기로 Cross-encoder가 호출되는지 테스트"""
+    embedding_model = MagicMock()
+    cross_encoder_model = MagicMock()
+
+    result = warmup_models(embedding_model, cross_encoder_model, warmup_settings)
+
+    assert result["iterations"] >= warmup_settings.min_iterations
+    assert embedding_model.get_embedding.called
+    batch_sizes = {len(call.args[1]) for call in cross_encoder_model.get_cross_encoder_scores.call_args_list}
+    assert batch_sizes == {5, 10}
+
+
+def test_p50_안정_판정():
+    """최근 구간의 p50 변화율로 안정 여부를 판단하는지 테스트"""
+    assert _is_steady([100.0, 100.0, 101.0, 99.0], window=2, tolerance=0.1)
+    assert not _is_steady([500.0, 400.0, 100.0, 90.0], window=2, tolerance=0.1)
+    assert not _is_steady([100.0], window=2, tolerance=0.1)
+
+
+def test_준비_상태_전환():
+    """워밍업 완료 전후로 ready 상태가 바뀌는지 테스트"""
+    readiness = ReadinessState()
+    assert readiness.snapshot()["ready"] is False
+
+    readiness.update(models={"steady": True})
+    readiness.mark_ready()
+    snapshot = readiness.snapshot()
+    assert snapshot["ready"] is True
+    assert snapshot["details"]["models"] == {"steady": True}
+
+    readiness.mark_failed("boom")
+    assert readiness.snapshot()["error"] == "boom"
@@ -0,0 +1,166 @@
+import asyncio
+import gc
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from llm.clients.http_client import DNSCache, InstrumentedAsyncTransport, InstrumentedTransport
+from llm.clients.rate_limiter import LLMRateLimiter
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self._stream_slowly()
+            return
+        body = b'{"ok": true}'
+        self.send_response(429 if self.path == "/busy" else 200)
+        if self.path == "/busy":
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_slowly(self):
+        """첫 조각 이후 천천히 이어지는 chunked 응답 (SSE 스트림 대용)"""
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for _ in range(40):
+                self.wfile.write(b"5\r\nchunk\r\n")
+                self.wfile.flush()
+                time.sleep(0.05)
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_재사용과_DNS_캐시(server_url):
+    """두 번째 요청은 기존 커넥션을 재사용하고, 새 연결에서만 DNS를 조회하는지 테스트"""
+    dns_cache = DNSCache(ttl_seconds=60)
+    transport = InstrumentedTransport(limits=httpx.Limits(max_connections=2), dns_cache=dns_cache)
+    with httpx.Client(transport=transport) as client:
+        assert client.get(server_url).json() == {"ok": True}
+        assert client.get(server_url).status_code == 200
+
+        stats = transport.metrics.stats()
+    assert stats["requests"] == 2 and stats["requests_in_flight"] == 0
+    assert stats["connects"] == 1
+    assert stats["connections"] == 1 and stats["connections_idle"] == 1
+    assert stats["pool_wait_ms_max"] >= 0
+    assert stats["dns_cache"] == {"entries": 1, "hits": 0, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_비동기_스트리밍_응답은_닫을_때까지_진행_중(server_url):
+    dns_cache = DNSCache(ttl_seconds=60)
+    transport = InstrumentedAsyncTransport(dns_cache=dns_cache)
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", server_url) as response:
+            assert transport.metrics.stats()["requests_in_flight"] == 1
+            assert transport.metrics.stats()["connections_in_use"] == 1
+            await response.aread()
+        assert transport.metrics.stats()["requests_in_flight"] == 0
+
+    # 새 커넥션을 만들 때는 캐시된 주소를 사용
+    async with httpx.AsyncClient(transport=InstrumentedAsyncTransport(dns_cache=dns_cache)) as client:
+        assert (await client.get(server_url)).status_code == 200
+    assert dns_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_제한기를_거쳐_요청하고_429에_반응(server_url):
+    """응답 본문을 닫을 때 실행 권한을 반환하고, 429 응답은 제한기에 반영되는지 테스트"""
+    limiter = LLMRateLimiter(max_concurrency=4)
+    transport = InstrumentedAsyncTransport(limiter=limiter)
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", server_url) as response:
+            assert limiter.stats()["active"] == 1
+            await response.aread()
+        assert (await client.get(f"{server_url}/busy")).status_code == 429
+
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["completed"] == 2
+    assert stats["throttled"] == 1 and stats["limit"] == 2
+
+
+@pytest.mark.asyncio
+async def test_스트림_소비가_취소되면_실행_권한을_반환(server_url):
+    """응답을 닫지 않은 채 본문 반복이 취소되거나 응답이 버려져도 제한기 슬롯이 새지 않는지 테스트"""
+    limiter = LLMRateLimiter(max_concurrency=1)
+    transport = InstrumentedAsyncTransport(limiter=limiter)
+    async with httpx.AsyncClient(transport=transport) as client:
+        first_chunk = asyncio.Event()
+
+        async def consume():
+            response = await client.send(client.build_request("GET", f"{server_url}/slow"), stream=True)
+            async for _ in response.aiter_bytes():
+                first_chunk.set()
+
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(first_chunk.wait(), timeout=5)
+        assert limiter.stats()["active"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.stats()["active"] == 0
+
+        # 본문을 읽지도 닫지도 않고 버린 응답
+        response = await client.send(client.build_request("GET", f"{server_url}/slow"), stream=True)
+        assert limiter.stats()["active"] == 1
+        del response
+        gc.collect()
+        await asyncio.sleep(0)
+        assert limiter.stats()["active"] == 0
+
+        # 다음 요청이 막히지 않음
+        assert (await asyncio.wait_for(client.get(server_url), timeout=5)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_동기_클라이언트도_이벤트_루프의_제한기를_거침(server_url):
+    """다른 스레드의 동기 호출이 같은 제한기에서 순서를 기다리고 429를 반영하는지 테스트"""
+    limiter = LLMRateLimiter(max_concurrency=1)
+    held = await limiter.acquire()
+    transport = InstrumentedTransport(limiter=limiter)
+
+    def sync_calls():
+        with httpx.Client(transport=transport) as client:
+            return client.get(server_url).status_code, client.get(f"{server_url}/busy").status_code
+
+    calls = asyncio.ensure_future(asyncio.to_thread(sync_calls))
+    await asyncio.sleep(0.2)
+    assert not calls.done() and limiter.stats()["queue_depth"] == 1
+    held.release()
+
+    assert await asyncio.wait_for(calls, timeout=5) == (200, 429)
+    await asyncio.sleep(0)
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["completed"] == 3 and stats["throttled"] == 1
+
+
+def test_이벤트_루프가_없으면_동기_호출은_제한하지_않음(server_url):
+    limiter = LLMRateLimiter(max_concurrency=1)
+    with httpx.Client(transport=InstrumentedTransport(limiter=limiter)) as client:
+        assert client.get(server_url).status_code == 200
+    assert limiter.stats()["completed"] == 0
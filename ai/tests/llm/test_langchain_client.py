@@ -0,0 +1,69 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from llm.clients.langchain_client import Gpt4oMini
+
+
+class _FakeStream:
+    """openai.AsyncStream 대용 — 반복과 close()만 지원"""
+
+    def __init__(self, contents):
+        self.contents = contents
+        self.closed = False
+
+    async def __aiter__(self):
+        for content in self.contents:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_ainvoke는_비동기_클라이언트를_사용():
+    """ainvoke가 동기 call_gpt4o 대신 async_call_gpt4o를 await하는지 테스트"""
+    with patch("llm.clients.langchain_client.async_call_gpt4o", new=AsyncMock(return_value="응답")) as async_call, \
+            patch("llm.clients.langchain_client.call_gpt4o") as sync_call:
+        result = await Gpt4oMini(max_tokens=100).ainvoke("질문")
+
+    assert result == "응답"
+    sync_call.assert_not_called()
+    async_call.assert_awaited_once_with(
+        messages=[{"role": "user", "content": "질문"}],
+        temperature=0.0,
+        max_tokens=100,
+        validate=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_출력_검사기를_응답_캐시_검증에_전달():
+    validator = lambda raw: raw.startswith("{")  # noqa: E731
+    with patch("llm.clients.langchain_client.async_call_gpt4o", new=AsyncMock(return_value="{}")) as async_call:
+        await Gpt4oMini(output_validator=validator).ainvoke("질문")
+
+    assert async_call.await_args.kwargs["validate"] is validator
+
+
+@pytest.mark.asyncio
+async def test_astream은_스트리밍_조각을_순서대로_반환():
+    """astream이 stream=True로 호출하고 비어 있지 않은 delta만 차례로 내보내는지 테스트"""
+    stream = _FakeStream(["안녕", None, "하세요"])
+    with patch("llm.clients.langchain_client.async_call_gpt4o", new=AsyncMock(return_value=stream)) as async_call:
+        chunks = [chunk async for chunk in Gpt4oMini(max_tokens=100).astream("질문")]
+
+    assert chunks == ["안녕", "하세요"]
+    assert async_call.await_args.kwargs["stream"] is True
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_astream_소비를_중단하면_응답_스트림을_닫음():
+    stream = _FakeStream(["첫", "둘", "셋"])
+    with patch("llm.clients.langchain_client.async_call_gpt4o", new=AsyncMock(return_value=stream)):
+        chunks = Gpt4oMini().astream("질문")
+        assert await chunks.__anext__() == "첫"
+        await chunks.aclose()
+
+    assert stream.closed
@@ -0,0 +1,42 @@
+import pytest
+
+from llm.llm_response_parser import (
+    IncrementalAnalysisParser, is_complete_analysis_output, parse_case_analysis_output
+)
+
+RAW = """{
+    "data": {"report": {"issues": ["계약위반", "손해배상"], "opinion": "따옴표(\\") 포함 의견", "sentencePrediction": "승소",
+                        "confidence": 0.84, "references": {"cases": ["2020다123"], "statutes": []}}},
+    "tags": ["민사"]
+}"""
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, len(RAW)])
+def test_조각_크기와_무관하게_필드를_순서대로_파싱(size):
+    parser = IncrementalAnalysisParser()
+    fields = []
+    for i in range(0, len(RAW), size):
+        fields.extend(parser.feed(RAW[i:i + size]))
+
+    assert [name for name, _ in fields] == ["issues", "opinion", "expected_sentence", "confidence", "references", "tags"]
+    values = dict(fields)
+    assert values["opinion"] == '따옴표(") 포함 의견'
+    assert values["confidence"] == 0.84
+    assert parser.text == RAW
+    assert parse_case_analysis_output(parser.text).confidence == 0.84
+
+
+def test_숫자는_구분자가_도착한_뒤_확정():
+    """"0"까지만 도착했을 때 confidence=0으로 확정하지 않는지 테스트"""
+    parser = IncrementalAnalysisParser()
+    head = '{"issues": [], "opinion": "", "sentencePrediction": "", "confidence": 0'
+    assert [name for name, _ in parser.feed(head)] == ["issues", "opinion", "expected_sentence"]
+    assert list(parser.feed(".9")) == []
+    assert list(parser.feed(", ")) == [("confidence", 0.9)]
+
+
+def test_잘리거나_깨진_분석_출력은_캐시_대상이_아님():
+    assert is_complete_analysis_output(RAW)
+    assert is_complete_analysis_output("추론...\n결론:\n소견: 손해배상 청구가 가능합니다")
+    assert not is_complete_analysis_output(RAW[:len(RAW) // 2])
+    assert not is_complete_analysis_output("")
@@ -0,0 +1,20 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from llm.clients import openai_client
+from llm.clients.response_cache import bypass_llm_cache
+
+
+@pytest.mark.asyncio
+async def test_async_call_gpt4o_반환_형식():
+    """스트리밍이 아닌 호출은 응답 텍스트를, 스트리밍 호출은 응답 스트림 객체를 그대로 반환하는지 테스트"""
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="응답"))])
+    stream = MagicMock()
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[response, stream])
+    messages = [{"role": "user", "content": "질문"}]
+
+    with patch.object(openai_client, "get_async_openai_client", return_value=client), bypass_llm_cache():
+        assert await openai_client.async_call_gpt4o(messages) == "응답"
+        assert await openai_client.async_call_gpt4o(messages, stream=True) is stream
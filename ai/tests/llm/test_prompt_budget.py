@@ -0,0 +1,98 @@
+from llm.prompt_budget import QUERY_ELLIPSIS, assemble_analysis_inputs, truncate_middle
+from llm.tokenizer import ApproxTokenizer
+
+
+class CharTokenizer:
+    """한 글자를 한 토큰으로 세는 테스트용 토크나이저"""
+    name = "char"
+    exact = True
+
+    def count(self, text):
+        return len(text)
+
+    def truncate(self, text, max_tokens, from_end=False):
+        if max_tokens <= 0:
+            return ""
+        return text[-max_tokens:] if from_end else text[:max_tokens]
+
+
+def _docs(*lengths):
+    return [{"id": str(i), "issue": "", "text": "가" * n} for i, n in enumerate(lengths)]
+
+
+def test_예산_안이면_그대로_포함():
+    inputs, report = assemble_analysis_inputs(
+        CharTokenizer(), 100, "질문", _docs(50, 50), "태그", max_prompt_tokens=10000,
+        query_max_tokens=100, min_doc_tokens=10,
+    )
+
+    assert inputs["user_query"] == "질문"
+    assert report.docs_kept == 2 and report.docs_trimmed == 0
+    assert report.prompt_tokens == 100 + 2 + 2 + len(inputs["case_docs"])
+
+
+def test_문서는_같은_상한으로_잘라_예산_준수():
+    """긴 문서만 상한으로 잘리고 전체 프롬프트가 예산을 넘지 않는지 테스트"""
+    inputs, report = assemble_analysis_inputs(
+        CharTokenizer(), 100, "질문", _docs(1000, 30, 1000), "태그", max_prompt_tokens=700,
+        query_max_tokens=100, min_doc_tokens=10,
+    )
+
+    assert report.prompt_tokens <= 700
+    assert report.docs_kept == 3 and report.docs_trimmed == 2
+    assert "가" * 30 in inputs["case_docs"]
+
+
+def test_예산이_부족하면_관련도_낮은_문서부터_제외():
+    inputs, report = assemble_analysis_inputs(
+        CharTokenizer(), 100, "질문", _docs(500, 500, 500), "태그", max_prompt_tokens=200,
+        query_max_tokens=100, min_doc_tokens=20,
+    )
+
+    assert report.prompt_tokens <= 200
+    assert 0 < report.docs_kept < 3
+    assert '"id": "0"' in inputs["case_docs"]
+
+
+def test_긴_질문은_앞뒤를_남기고_가운데_생략():
+    text = "처음" + "중간" * 500 + "결말"
+    truncated = truncate_middle(CharTokenizer(), text, 60)
+
+    assert len(truncated) <= 60
+    assert truncated.startswith("처음") and truncated.endswith("결말")
+    assert QUERY_ELLIPSIS in truncated
+
+
+def test_추정_토크나이저():
+    """tiktoken을 쓸 수 없을 때의 추정값이 문자 종류를 반영하고 자르기와 일관되는지 테스트"""
+    tokenizer = ApproxTokenizer()
+
+    assert tokenizer.count("abcd") == 1
+    assert tokenizer.count("가나다") == 2
+    assert tokenizer.count(tokenizer.truncate("가나다라마바사" * 10, 7)) <= 7
+    assert tokenizer.truncate("가나다라마", 2, from_end=True) == "다라마"
+
+
+def test_짧은_문서가_있어도_긴_문서에_최소_토큰_보장():
+    """가장 짧은 문서가 아니라 긴 문서 각각이 min_doc_tokens 이상을 받을 수 있을 때만 포함하는지 테스트"""
+    inputs, report = assemble_analysis_inputs(
+        CharTokenizer(), 100, "질문", _docs(1, 500, 500), "태그", max_prompt_tokens=260,
+        query_max_tokens=100, min_doc_tokens=50,
+    )
+
+    assert report.prompt_tokens <= 260
+    assert report.docs_kept == 2
+    assert report.doc_cap >= 50
+
+
+def test_JSON_이스케이프를_포함해_예산_준수():
+    """따옴표/개행이 많은 본문도 직렬화 후 토큰 수가 예산을 넘지 않는지 테스트"""
+    docs = [{"id": str(i), "issue": "", "text": '"인용"\n' * 200} for i in range(3)]
+    inputs, report = assemble_analysis_inputs(
+        CharTokenizer(), 100, "질문", docs, "태그", max_prompt_tokens=700,
+        query_max_tokens=100, min_doc_tokens=10,
+    )
+
+    assert report.docs_kept == 3 and report.docs_trimmed == 3
+    assert report.prompt_tokens == 100 + 2 + 2 + len(inputs["case_docs"])
+    assert report.prompt_tokens <= 700
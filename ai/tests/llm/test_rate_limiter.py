@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from llm.clients.rate_limiter import LLMRateLimiter, estimate_request_tokens, llm_endpoint
+
+
+class CharTokenizer:
+    def count(self, text):
+        return len(text)
+
+
+@pytest.mark.asyncio
+async def test_동시_실행_수_상한():
+    limiter = LLMRateLimiter(max_concurrency=2)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        permit = await limiter.acquire()
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        permit.release()
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["queue_depth"] == 0 and stats["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_엔드포인트별_공정_대기():
+    """한 엔드포인트에 요청이 몰려도 다른 엔드포인트 요청이 번갈아 처리되는지 테스트"""
+    limiter = LLMRateLimiter(max_concurrency=1)
+    first = await limiter.acquire("/api/analysis")
+    order = []
+
+    async def call(endpoint, name):
+        permit = await limiter.acquire(endpoint)
+        order.append(name)
+        permit.release()
+
+    tasks = [asyncio.create_task(call("/api/analysis", f"a{i}")) for i in range(3)]
+    with llm_endpoint("/api/consult"):
+        tasks.append(asyncio.create_task(call(None, "c0")))
+    await asyncio.sleep(0)
+    assert limiter.stats()["queue_by_endpoint"] == {"/api/analysis": 3, "/api/consult": 1}
+
+    first.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["a0", "c0", "a1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_429_응답시_대기_후_동시성_축소와_회복():
+    limiter = LLMRateLimiter(max_concurrency=8, recovery_successes=2)
+    limiter.record_response(429, retry_after=0.05)
+    assert limiter.limit == 4 and limiter.stats()["throttled"] == 1
+
+    started = time.monotonic()
+    (await limiter.acquire()).release()
+    assert time.monotonic() - started >= 0.04
+
+    limiter.record_response(200)
+    limiter.record_response(200)
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_토큰_버킷():
+    """분당 토큰 한도를 다 쓰면 다시 채워질 때까지 기다리는지 테스트"""
+    limiter = LLMRateLimiter(max_concurrency=4, tokens_per_minute=6000)  # 초당 100 토큰
+    (await limiter.acquire(tokens=6000)).release()
+
+    started = time.monotonic()
+    (await limiter.acquire(tokens=10)).release()
+
+    assert time.monotonic() - started >= 0.08
+
+
+def test_요청_토큰_추정():
+    body = json.dumps({"model": "gpt-4o-mini", "max_tokens": 100,
+                       "messages": [{"role": "system", "content": "abc"}, {"role": "user", "content": "가나"}]})
+
+    assert estimate_request_tokens(body.encode(), CharTokenizer()) == 105
+    assert estimate_request_tokens(b"not json", CharTokenizer()) == 0
+    # 기본 추정: UTF-8 바이트 수 / 4 (올림) — "abc가나" = 9바이트 → 3
+    assert estimate_request_tokens(body.encode()) == 103
+
+
+@pytest.mark.asyncio
+async def test_토큰_버킷을_기다리는_엔드포인트가_다른_엔드포인트를_막지_않음():
+    limiter = LLMRateLimiter(max_concurrency=4, tokens_per_minute=600)
+    (await limiter.acquire("/api/analysis", tokens=600)).release()
+
+    big = asyncio.create_task(limiter.acquire("/api/analysis", tokens=600))
+    await asyncio.sleep(0)
+    assert limiter.stats()["queue_by_endpoint"] == {"/api/analysis": 1}
+
+    # 버킷이 조금 채워지면 작은 요청은 큰 요청을 기다리지 않고 실행
+    await asyncio.sleep(0.05)
+    permit = await asyncio.wait_for(limiter.acquire("/api/chat", tokens=1), timeout=1)
+    permit.release()
+    assert not big.done()
+    big.cancel()
+
+
+@pytest.mark.asyncio
+async def test_권한을_받은_직후_취소되면_완료로_세지_않음():
+    limiter = LLMRateLimiter(max_concurrency=1)
+    first = await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    first.release()  # waiting에 권한이 넘어간 뒤, 재개되기 전에 취소
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["completed"] == 1
@@ -0,0 +1,109 @@
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from llm.clients import response_cache
+from llm.clients.response_cache import (
+    LLMResponseCache,
+    acached_completion,
+    bypass_llm_cache,
+    cached_completion,
+    make_cache_key,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=60, max_bytes=1024)
+    with patch.object(response_cache, "get_llm_cache", return_value=cache):
+        yield cache
+    cache.close()
+
+
+def test_캐시_키는_모델_메시지_파라미터로_결정():
+    """파라미터 순서와 무관하고, 값이 바뀌면 키가 달라지는지 테스트"""
+    messages = [{"role": "user", "content": "질문"}]
+    key = make_cache_key("gpt-4o-mini", messages, {"temperature": 0.0, "max_tokens": 10})
+
+    assert key == make_cache_key("gpt-4o-mini", messages, {"max_tokens": 10, "temperature": 0.0})
+    assert key != make_cache_key("gpt-4o-mini", messages, {"temperature": 0.3, "max_tokens": 10})
+    assert key != make_cache_key("gpt-4o", messages, {"temperature": 0.0, "max_tokens": 10})
+
+
+def test_캐시_적중시_네트워크_생략(cache):
+    """같은 요청은 두 번째부터 fetch 없이 저장된 응답을 반환하는지 테스트"""
+    fetch = MagicMock(return_value="응답")
+    messages = [{"role": "user", "content": "질문"}]
+
+    assert cached_completion("m", messages, {}, fetch) == "응답"
+    assert cached_completion("m", messages, {}, fetch) == "응답"
+
+    assert fetch.call_count == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_요청_단위_우회와_검증_실패_미저장(cache):
+    """우회 중에는 캐시를 읽거나 쓰지 않고, validate를 통과하지 못한 응답은 저장하지 않는지 테스트"""
+    fetch = AsyncMock(return_value="잘못된 JSON")
+    messages = [{"role": "user", "content": "질문"}]
+
+    await acached_completion("m", messages, {}, fetch, validate=lambda r: r.startswith("{"))
+    assert cache.stats()["entries"] == 0
+
+    fetch.return_value = "{}"
+    await acached_completion("m", messages, {}, fetch)
+    with bypass_llm_cache():
+        await acached_completion("m", messages, {}, fetch)
+
+    assert fetch.await_count == 3
+
+
+def test_TTL_만료(cache):
+    """TTL이 지난 항목은 조회되지 않고 정리되는지 테스트"""
+    cache.set("k", "m", "응답")
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+
+    assert cache.get("k") is None
+    assert cache.evict() == 1
+
+
+def test_크기_초과시_오래_사용하지_않은_항목부터_삭제(cache):
+    """전체 크기가 max_bytes를 넘으면 최근에 사용한 항목을 남기고 삭제하는지 테스트"""
+    for i in range(4):
+        cache.set(f"k{i}", "m", "x" * 300)
+        time.sleep(0.001)
+    cache.get("k0")  # 최근 사용
+
+    cache.evict()
+
+    assert cache.stats()["bytes"] <= 1024
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+
+
+@pytest.mark.asyncio
+async def test_비동기_호출의_캐시_조회와_저장은_워커_스레드에서_실행(cache):
+    """SQLite 잠금 대기가 이벤트 루프를 막지 않도록 get/set을 워커 스레드에서 호출하는지 테스트"""
+    import threading
+
+    threads = []
+    original_get, original_set = cache.get, cache.set
+
+    def get(*args):
+        threads.append(threading.current_thread())
+        return original_get(*args)
+
+    def set_(*args):
+        threads.append(threading.current_thread())
+        return original_set(*args)
+
+    messages = [{"role": "user", "content": "질문"}]
+    with patch.object(cache, "get", side_effect=get), patch.object(cache, "set", side_effect=set_):
+        assert await acached_completion("m", messages, {}, AsyncMock(return_value="응답")) == "응답"
+        assert await acached_completion("m", messages, {}, AsyncMock(return_value="다른 응답")) == "응답"
+
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
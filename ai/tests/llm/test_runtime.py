@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from config.settings import get_runtime_settings
+from llm.models.runtime import _BLAS_ENV_VARS, apply_thread_env
+
+
+def test_직접_지정한_스레드_환경변수는_유지(monkeypatch):
+    # apply_thread_env가 쓰는 변수를 모두 테스트 후 원래대로 되돌리도록 등록
+    for name in (*_BLAS_ENV_VARS, "TOKENIZERS_PARALLELISM"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OMP_NUM_THREADS", "7")
+    settings = get_runtime_settings().model_copy(update={"blas_threads": 2})
+
+    apply_thread_env(settings)
+    assert os.environ["OMP_NUM_THREADS"] == "7"
+    assert os.environ["MKL_NUM_THREADS"] == "2"
+
+    apply_thread_env(settings, override=True)
+    assert os.environ["OMP_NUM_THREADS"] == "2"
+
+
+def test_앱_모듈은_numpy보다_먼저_스레드_환경변수를_설정():
+    """app.main이 numpy를 불러오기 전에 apply_thread_env를 호출하는지 (별도 프로세스에서) 확인"""
+    code = (
+        "import sys, llm.models.runtime as runtime\n"
+        "original = runtime.apply_thread_env\n"
+        "def check(*args, **kwargs):\n"
+        "    assert 'numpy' not in sys.modules\n"
+        "    return original(*args, **kwargs)\n"
+        "runtime.apply_thread_env = check\n"
+        "import app.main\n"
+    )
+    cwd = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
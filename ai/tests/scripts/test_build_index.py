@@ -0,0 +1,235 @@
+import json
+import struct
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from scripts.build_index import (
+    ACTION_INSERT,
+    ACTION_REPLACE,
+    ACTION_SKIP,
+    StageStats,
+    batch_items,
+    chunk_cases,
+    content_hash,
+    copy_rows,
+    dedupe_case_rows,
+    diff_cases,
+    embed_batches,
+    encode_copy_binary,
+    insert_rows,
+    iter_case_files,
+    parse_cases,
+    process_text_to_chunks,
+    write_batches,
+)
+from scripts.embedding_cache import EmbeddingCache
+from scripts.index_versions import BASE_TABLES
+
+
+@pytest.fixture
+def case_dir(tmp_path):
+    for i in range(3):
+        case = {
+            "case_id": f"2020다{i}",
+            "title": f"사건 {i}",
+            "decision_date": "2020-01-01",
+            "category": "민사_일반",
+            "issue": "쟁점",
+            "summary": "요약",
+            "statutes": ["민법 제390조"],
+            "precedents": [],
+            "full_text": "가" * 50,
+        }
+        (tmp_path / f"{i}.json").write_text(json.dumps(case, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    return tmp_path
+
+
+def test_청크_분할_중첩():
+    """본문이 chunk_size/overlap 기준으로 분할되고 헤더 청크가 먼저 오는지 테스트"""
+    chunks = process_text_to_chunks("c1", "헤더", "0123456789", chunk_size=4, chunk_overlap=1)
+
+    assert chunks[0]["section"] == "header"
+    assert [c["chunk_text"] for c in chunks[1:]] == ["0123", "3456", "6789", "9"]
+
+
+def test_파이프라인_판례_단위_배치(case_dir):
+    """배치가 청크 수 기준으로 묶이되 한 판례의 청크가 여러 배치로 나뉘지 않는지 테스트"""
+    parse_stats, chunk_stats = StageStats("parse", "files"), StageStats("chunk", "chunks")
+    items = parse_cases(iter_case_files(str(case_dir)), parse_stats)
+    chunked = chunk_cases(items, chunk_stats, chunk_size=20, chunk_overlap=0)
+
+    batches = list(batch_items(chunked, batch_size=4))
+
+    assert len(batches) == 3
+    assert [item["case_id"] for batch in batches for item in batch] == ["2020다0", "2020다1", "2020다2"]
+    assert sum(len(item["chunks"]) for batch in batches for item in batch) == chunk_stats.count == 12
+    assert parse_stats.count == 4  # 깨진 파일 포함, 건너뜀
+
+
+def test_재개_시_체크포인트_이후_파일만_처리(case_dir):
+    """after로 지정한 파일 다음부터 정렬 순서대로 반환되는지 테스트"""
+    files = list(iter_case_files(str(case_dir)))
+
+    assert files == sorted(files)
+    assert list(iter_case_files(str(case_dir), after=files[1])) == files[2:]
+
+
+def test_내용_해시_비교로_변경분만_처리():
+    """DB의 해시/버전과 비교하여 insert/replace/skip이 결정되고 skip 판례는 청크를 만들지 않는지 테스트"""
+    cases = [{"case_id": cid, "title": cid, "full_text": "본문"} for cid in ("new", "changed", "same", "old_ver")]
+    items = [{"source": c["case_id"], "case_id": c["case_id"], "data": c, "content_hash": content_hash(c)}
+             for c in cases]
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [
+        ("changed", "stale-hash", "v1"),
+        ("same", items[2]["content_hash"], "v1"),
+        ("old_ver", items[3]["content_hash"], "v0"),
+    ]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    diffed = list(diff_cases(items, conn, "v1", StageStats("diff", "cases"), lookup_size=10))
+    chunked = list(chunk_cases(diffed, StageStats("chunk", "chunks")))
+
+    assert [item["action"] for item in chunked] == [ACTION_INSERT, ACTION_REPLACE, ACTION_SKIP, ACTION_REPLACE]
+    assert cursor.execute.call_count == 1
+    assert chunked[2]["chunks"] == [] and "row" not in chunked[2]
+    assert all("data" not in item for item in chunked)
+
+
+def test_같은_실행의_중복_case_id는_앞선_사본과_비교():
+    """재실행 사본처럼 같은 case_id가 한 실행에 다시 나오면 DB 조회 결과가 아니라 앞선 사본과 비교되는지 테스트
+    (내용이 다르면 앞선 사본의 청크를 지우도록 replace, 같으면 skip)"""
+    payloads = [
+        {"case_id": "dup", "title": "첫 사본", "full_text": "본문"},
+        {"case_id": "dup", "title": "둘째 사본", "full_text": "바뀐 본문"},
+        {"case_id": "dup", "title": "둘째 사본", "full_text": "바뀐 본문"},
+    ]
+    items = [{"source": f"dup_{i}.json", "case_id": p["case_id"], "data": p, "content_hash": content_hash(p)}
+             for i, p in enumerate(payloads)]
+    cursor = MagicMock()
+    cursor.fetchall.return_value = []
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    diffed = list(diff_cases(items, conn, "v1", StageStats("diff", "cases"), lookup_size=2))
+
+    assert [item["action"] for item in diffed] == [ACTION_INSERT, ACTION_REPLACE, ACTION_SKIP]
+
+
+def test_내용_해시_키_순서_무관():
+    """JSON 키 순서가 달라도 같은 해시가 나오는지 테스트"""
+    assert content_hash({"a": 1, "b": "가"}) == content_hash({"b": "가", "a": 1})
+
+
+def _inline_encoder():
+    encoder = MagicMock()
+    encoder.max_pending = 2
+    encoder.submit.side_effect = lambda texts: _done(np.full((len(texts), 3), len(texts), dtype=np.float32))
+    return encoder
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def test_임베딩_배치_단위_호출():
+    """임베딩 단계가 배치마다 한 번씩 인코더에 제출하고 청크가 없는 배치는 건너뛰는지 테스트"""
+    encoder = _inline_encoder()
+    batches = [
+        [{"chunks": [{"chunk_text": "a"}]}, {"chunks": [{"chunk_text": "b"}]}],
+        [{"chunks": []}],
+        [{"chunks": [{"chunk_text": "c"}]}],
+    ]
+    stats = StageStats("embed", "chunks")
+
+    results = list(embed_batches(batches, encoder, stats))
+
+    assert encoder.submit.call_count == 2
+    assert [len(embeds) for _, embeds in results] == [2, 0, 1]
+    assert [items for items, _ in results] == batches
+    assert stats.count == 3
+
+
+def test_임베딩_캐시_재사용(tmp_path):
+    """캐시에 있는 청크는 인코딩하지 않고, 기록된 샤드는 다시 열어도 조회되는지 테스트"""
+    cache = EmbeddingCache(str(tmp_path), "org/model", shard_size=2)
+    encoder = _inline_encoder()
+    batch = [{"chunks": [{"chunk_text": "a"}, {"chunk_text": "b"}, {"chunk_text": "c"}]}]
+
+    list(embed_batches([batch], encoder, StageStats("embed", "chunks"), cache))
+    cache.close()
+    reopened = EmbeddingCache(str(tmp_path), "org/model")
+    batch[0]["chunks"].append({"chunk_text": "d"})
+    (_, embeds), = list(embed_batches([batch], encoder, StageStats("embed", "chunks"), reopened))
+
+    assert encoder.submit.call_args_list[-1].args == (["d"],)
+    assert reopened.hits == 3 and reopened.misses == 1
+    assert embeds.shape == (4, 3)
+    assert list(embeds[:, 0]) == [3, 3, 3, 1]
+    assert len(EmbeddingCache(str(tmp_path), "other-model")) == 0
+
+
+def test_COPY_바이너리_인코딩():
+    """text/int4/NULL/pgvector 필드가 PGCOPY 바이너리 포맷으로 인코딩되는지 테스트"""
+    row = ("c1", 3, None, np.array([1.0, -2.0], dtype=np.float32))
+
+    data = encode_copy_binary([row]).getvalue()
+
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    body = data[19:-2]
+    assert data[-2:] == struct.pack("!h", -1)
+    expected = (
+        struct.pack("!h", 4)
+        + struct.pack("!i", 2) + b"c1"
+        + struct.pack("!ii", 4, 3)
+        + struct.pack("!i", -1)
+        + struct.pack("!iHH", 12, 2, 0) + struct.pack(">ff", 1.0, -2.0)
+    )
+    assert body == expected
+
+
+def test_COPY_병합_전_중복_case_id_제거():
+    """한 배치에 같은 case_id가 두 번 있으면 마지막 행만 스테이징에 COPY하는지 테스트
+    (INSERT ... SELECT ... ON CONFLICT DO UPDATE는 같은 행을 두 번 갱신하면 실패)"""
+    rows = [("2020다1", "이전 제목"), ("2020다2", "제목"), ("2020다1", "새 제목")]
+    assert dedupe_case_rows(rows) == [("2020다1", "새 제목"), ("2020다2", "제목")]
+
+    cur = MagicMock()
+    copy_rows(cur, BASE_TABLES, rows, [])
+
+    copied = cur.copy_expert.call_args.args[1].getvalue()
+    assert copied == encode_copy_binary([("2020다1", "새 제목"), ("2020다2", "제목")]).getvalue()
+
+
+@pytest.mark.parametrize("loader", [copy_rows, insert_rows])
+def test_적재_시_배치_내_중복_case_id는_마지막_사본만(loader):
+    """두 loader 모두 같은 배치의 중복 case_id는 마지막 사본의 행/청크만 적재하고 청크 충돌은 무시하는지 테스트"""
+    def item(title, action, chunk_texts):
+        chunks = [{"case_id": "dup", "chunk_index": n, "section": "body", "chunk_text": t}
+                  for n, t in enumerate(chunk_texts)]
+        return {"case_id": "dup", "action": action, "row": ("dup", title), "content_hash": title, "chunks": chunks}
+
+    items = [item("첫 사본", ACTION_INSERT, ["a", "b"]),
+             {"case_id": "other", "action": ACTION_SKIP, "chunks": []},
+             item("둘째 사본", ACTION_REPLACE, ["c"])]
+    embeds = np.arange(3, dtype=np.float32).reshape(3, 1)
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    loaded = MagicMock(wraps=loader)
+
+    with patch("scripts.build_index.execute_values"), patch("scripts.build_index.execute_batch") as batch:
+        write_batches(conn, [(items, embeds)], StageStats("write", "rows"), "run", "v1",
+                      BASE_TABLES, loader=loaded)
+
+    _, _, case_rows, chunk_rows = loaded.call_args.args
+    assert case_rows == [("dup", "둘째 사본", "둘째 사본", "v1")]
+    assert [(row[3], row[4][0]) for row in chunk_rows] == [("c", 2.0)]
+    statements = [c.args[0] for c in cur.execute.call_args_list] + [c.args[1] for c in batch.call_args_list]
+    assert any("ON CONFLICT (case_id, chunk_index, section) DO NOTHING" in sql for sql in statements)
@@ -0,0 +1,115 @@
+import json
+
+from scripts.case_preprocessor import compute_delta, iter_parsed, iter_unique_cases, main, normalize_case
+from scripts.case_shards import ShardWriter, iter_shard_cases, new_layer, read_manifest, write_manifest
+
+
+def _raw_case(case_id, title="사건"):
+    return {
+        "사건번호": case_id,
+        "사건명": title,
+        "선고일자": "2020.01.02",
+        "사건종류명": "민사",
+        "판시사항": "【판시사항】 쟁점",
+        "참조조문": "【참조조문】 [1] 민법 제390조\n[2] 민법 제750조",
+        "판례내용": "【전문】 본문",
+    }
+
+
+def test_원본_판례_정규화():
+    """날짜/마커/참조조문 분리가 이전과 같이 처리되는지 테스트"""
+    case = normalize_case(_raw_case("2020다1"))
+
+    assert case["decision_date"] == "2020-01-02"
+    assert case["issue"] == "쟁점"
+    assert case["statutes"] == ["[1] 민법 제390조", "[2] 민법 제750조"]
+    assert case["precedents"] == []
+    assert normalize_case({"사건명": "번호 없음"}) is None
+
+
+def test_병렬_파싱_순서_유지_및_중복_제거(tmp_path):
+    """프로세스 풀 결과가 파일 순서를 유지하고 먼저 나온 사건만 남는지 테스트"""
+    files = []
+    for i, (case_id, title) in enumerate([("A", "첫번째"), ("B", "둘"), ("A", "중복"), ("C", "셋")]):
+        path = tmp_path / f"{i}.json"
+        path.write_text(json.dumps(_raw_case(case_id, title), ensure_ascii=False), encoding="utf-8")
+        files.append(str(path))
+
+    cases = list(iter_unique_cases(iter_parsed(files, workers=2, chunksize=1)))
+
+    assert [(c["case_id"], c["title"]) for c in cases] == [("A", "첫번째"), ("B", "둘"), ("C", "셋")]
+
+
+def test_샤드_기록_후_이어읽기(tmp_path):
+    """JSONL 샤드가 manifest와 함께 기록되고 source 이후부터 이어 읽을 수 있는지 테스트"""
+    writer = ShardWriter(str(tmp_path), shard_size=2)
+    for i in range(5):
+        writer.write({"case_id": f"c{i}", "statutes": ["가"]})
+    write_manifest(str(tmp_path), "jsonl", writer.close(), {"total_unique": 5})
+
+    manifest = read_manifest(str(tmp_path))
+    records = list(iter_shard_cases(str(tmp_path), manifest))
+    resumed = list(iter_shard_cases(str(tmp_path), manifest, after=records[2][0]))
+
+    assert [s["cases"] for s in manifest["shards"]] == [2, 2, 1]
+    assert [case["case_id"] for _, case in records] == ["c0", "c1", "c2", "c3", "c4"]
+    assert [case["case_id"] for _, case in resumed] == ["c3", "c4"]
+
+
+def _entry(path, case_id, sha="h"):
+    return {"path": path, "size": 1, "mtime_ns": 1, "sha256": sha, "case_id": case_id}
+
+
+def test_원본_manifest_delta_계산():
+    """내용 변경/추가/삭제와 중복 사건의 제공 파일 변경이 delta에 반영되는지 테스트"""
+    old = {
+        "a.json": _entry("a.json", "A"),
+        "b.json": _entry("b.json", "B"),
+        "c.json": _entry("c.json", "C"),
+        "d.json": _entry("d.json", "C"),  # C의 중복, a-b-c 순서상 c.json이 제공
+    }
+    new = {
+        "a.json": _entry("a.json", "A"),
+        "b.json": _entry("b.json", "B", sha="changed"),
+        "d.json": _entry("d.json", "C"),
+        "e.json": _entry("e.json", "E"),
+    }
+
+    upserts, deleted = compute_delta(old, new, changed_paths=["b.json", "e.json"])
+
+    assert upserts == {"B": "b.json", "C": "d.json", "E": "e.json"}
+    assert deleted == []
+    assert compute_delta(old, {"a.json": old["a.json"]}, [])[1] == ["B", "C"]
+
+
+def test_delta_레이어_적용(tmp_path):
+    """위 레이어에서 변경/삭제된 판례는 아래 레이어에서 건너뛰고, delta 레이어만 따로 읽을 수 있는지 테스트"""
+    base = ShardWriter(str(tmp_path), prefix="base")
+    for case_id in ("A", "B", "C"):
+        base.write({"case_id": case_id, "title": "old"})
+    delta = ShardWriter(str(tmp_path), prefix="delta", layer=1)
+    delta.write({"case_id": "B", "title": "new"})
+    layers = [new_layer("base"), new_layer("d1", ["B"], deleted=["C"])]
+    write_manifest(str(tmp_path), "jsonl", base.close() + delta.close(), {}, layers)
+
+    manifest = read_manifest(str(tmp_path))
+    live = [(c["case_id"], c["title"]) for _, c in iter_shard_cases(str(tmp_path), manifest)]
+    only_delta = [c["case_id"] for _, c in iter_shard_cases(str(tmp_path), manifest, layers=[1])]
+
+    assert live == [("A", "old"), ("B", "new")]
+    assert only_delta == ["B"]
+
+
+def test_JSON_형식으로_다시_처리하면_기존_샤드_삭제(tmp_path):
+    """샤드 출력 디렉터리를 --format json으로 다시 처리하면 manifest와 샤드를 지워 판례별 JSON이 색인되는지 테스트"""
+    raw_dir, out_dir = tmp_path / "raw", tmp_path / "out"
+    raw_dir.mkdir()
+    (raw_dir / "a.json").write_text(json.dumps(_raw_case("2020다1"), ensure_ascii=False), encoding="utf-8")
+    main(["--raw-dir", str(raw_dir), "--output-dir", str(out_dir), "--workers", "1"])
+    shards = [s["file"] for s in read_manifest(str(out_dir))["shards"]]
+
+    main(["--raw-dir", str(raw_dir), "--output-dir", str(out_dir), "--workers", "1", "--format", "json"])
+
+    assert read_manifest(str(out_dir)) is None
+    assert not any((out_dir / name).exists() for name in shards)
+    assert (out_dir / "2020다1.json").exists()
@@ -0,0 +1,35 @@
+import os
+
+from scripts.collect_case_jsons import main
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_중복_파일_하드링크_및_파일명_충돌(tmp_path):
+    """내용이 같은 파일은 하드링크로, 이름이 같은 파일은 _N 접미사로 수집되는지 테스트"""
+    train, valid, dest = tmp_path / "train", tmp_path / "valid", tmp_path / "dest"
+    _write(train / "a" / "case.json", '{"id": 1}')
+    _write(train / "b" / "case.json", '{"id": 2}')
+    _write(valid / "case.json", '{"id": 1}')
+    _write(valid / "other.json", '{"id": 3}')
+
+    main(["--sources", str(train), str(valid), "--dest", str(dest), "--mode", "copy", "--workers", "2"])
+
+    names = sorted(os.listdir(dest))
+    assert names == ["case.json", "case_1.json", "case_2.json", "other.json"]
+    assert os.stat(dest / "case.json").st_ino == os.stat(dest / "case_2.json").st_ino
+    assert (dest / "case_1.json").read_text(encoding="utf-8") == '{"id": 2}'
+
+
+def test_중복_파일_생략(tmp_path):
+    """--skip-duplicates 이면 내용이 같은 파일을 만들지 않는지 테스트"""
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    _write(src / "x" / "a.json", "{}")
+    _write(src / "y" / "b.json", "{}")
+
+    main(["--sources", str(src), "--dest", str(dest), "--skip-duplicates", "--mode", "copy"])
+
+    assert os.listdir(dest) == ["a.json"]
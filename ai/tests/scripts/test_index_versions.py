@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock
+
+from scripts.index_versions import (
+    BASE_TABLES,
+    activate_version,
+    gc_versions,
+    new_version_name,
+    tables_for,
+)
+
+
+def test_버전별_테이블_이름():
+    """base는 기존 테이블을, 새 버전은 버전 이름이 붙은 섀도 테이블을 가리키는지 테스트"""
+    version = new_version_name()
+
+    assert tables_for("base") == BASE_TABLES
+    assert tables_for(version) == (f"legal_cases_{version}", f"legal_chunks_{version}")
+
+
+def test_잘못된_버전_이름_거부():
+    """SQL에 들어가는 테이블 이름이므로 형식이 다른 버전 이름은 거부하는지 테스트"""
+    with pytest.raises(ValueError):
+        tables_for("v1; DROP TABLE legal_cases")
+
+
+def test_뷰_전환은_한_트랜잭션():
+    """두 뷰 교체와 상태 변경이 한 번의 커밋으로 이루어지는지 테스트"""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+
+    activate_version(conn, "v20250101t000000")
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert any("VIEW legal_cases_current AS SELECT * FROM legal_cases_v20250101t000000" in s for s in statements)
+    assert any("VIEW legal_chunks_current AS SELECT * FROM legal_chunks_v20250101t000000" in s for s in statements)
+    conn.commit.assert_called_once()
+
+
+def test_구축_중인_버전은_정리하지_않음():
+    """advisory lock을 얻지 못한(다른 프로세스가 구축 중인) building 버전은 삭제하지 않는지 테스트"""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.side_effect = [[("v20240101t000000",)], [("v20250101t000000",), ("v20250102t000000",)]]
+    cursor.fetchone.side_effect = [(False,), (True,)]
+
+    removed = gc_versions(conn, keep=2)
+
+    assert removed == ["v20240101t000000", "v20250102t000000"]
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert not any("legal_cases_v20250101t000000" in s for s in statements)
+    assert any("DROP TABLE IF EXISTS legal_chunks_v20250102t000000" in s for s in statements)
+    assert any("pg_advisory_unlock" in s for s in statements)
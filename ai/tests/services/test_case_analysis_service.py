@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from langchain_core.runnables import Runnable
@@ -11,8 +13,15 @@ class MockChain(Runnable):
         self.response = response
     
     def invoke(self, input):
+        raise AssertionError("이벤트 루프를 막는 동기 invoke가 호출되었습니다.")
+
+    async def ainvoke(self, input):
         return {"text": self.response}
 
+    async def astream(self, input):
+        for i in range(0, len(self.response), 7):
+            yield self.response[i:i + 7]
+
 
 @pytest.fixture
 def mock_search_service():
@@ -60,7 +69,9 @@ async def test_벡터_검색_및_판례_조회_성공(case_analysis_service, moc
     
     result = await case_analysis_service.analyze_case("계약 위반 시 손해배상 청구 가능한가요?", 2)
     
-    mock_search_service.vector_search.assert_called_once_with("계약 위반 시 손해배상 청구 가능한가요?", size=2)
+    mock_search_service.vector_search.assert_called_once_with(
+        "계약 위반 시 손해배상 청구 가능한가요?", size=2, query_embedding=None
+    )
     assert "case_analysis" in result
 
 
@@ -116,4 +127,124 @@ async def test_검색된_판례가_없을_때_처리(case_analysis_service, mock
     result = await case_analysis_service.analyze_case("특이한 법률 문의", 1)
     
     assert result["case_analysis"].issues == ["일반상담"]
-    assert result["case_analysis"].confidence == 0.5
\ No newline at end of file
+    assert result["case_analysis"].confidence == 0.5
+
+@pytest.mark.asyncio
+async def test_시맨틱_캐시_적중시_LLM_생략(mock_llm, mock_search_service):
+    """비슷한 사연을 다시 분석하면 검색/LLM 호출 없이 이전 결과를 재사용하는지 테스트"""
+    from services.semantic_cache import SemanticAnalysisCache
+
+    mock_search_service.embedding_model = MagicMock()
+    embed_threads = []
+
+    def get_embedding(text):
+        embed_threads.append(threading.current_thread())
+        return [0.6, 0.8]
+
+    mock_search_service.embedding_model.get_embedding.side_effect = get_embedding
+    service = CaseAnalysisService(mock_llm, mock_search_service, semantic_cache=SemanticAnalysisCache(threshold=0.95))
+    service.chain = MagicMock(wraps=MockChain("""
+    {
+        "data": {"report": {"issues": ["손해배상"], "opinion": "가능", "sentencePrediction": "승소", "confidence": 0.9}},
+        "tags": ["민사"]
+    }
+    """))
+
+    first = await service.analyze_case("손해배상 문의", 1)
+    second = await service.analyze_case("손해배상 문의입니다", 1)
+
+    assert second["case_analysis"].issues == first["case_analysis"].issues
+    assert mock_search_service.vector_search.await_count == 1
+    mock_search_service.vector_search.assert_awaited_once_with("손해배상 문의", size=1, query_embedding=[0.6, 0.8])
+    assert service.chain.ainvoke.call_count == 1
+    # 검색 판례 수가 다르면 이전 결과를 재사용하지 않음
+    await service.analyze_case("손해배상 문의", 3)
+    assert service.chain.ainvoke.call_count == 2
+    # 질의 임베딩은 이벤트 루프가 아닌 워커 스레드에서 계산
+    assert embed_threads and threading.main_thread() not in embed_threads
+
+
+@pytest.mark.asyncio
+async def test_판례_문장_압축_결과를_프롬프트에_사용(mock_llm, mock_search_service):
+    """압축기가 있으면 압축된 판례 문장으로 프롬프트를 만들고 통계를 token_usage에 남기는지 테스트"""
+    compressor = MagicMock()
+    compressor.compress.return_value = (
+        [{"id": "2020다123", "issue": "손해배상", "text": "압축된 문장"}],
+        {"chunks": 2, "cases": 1, "sentences_scored": 2, "chars_before": 30, "chars_after": 6, "ratio": 5.0},
+    )
+    service = CaseAnalysisService(mock_llm, mock_search_service, context_compressor=compressor)
+    service.chain = MagicMock(wraps=MockChain("""
+    {"data": {"report": {"issues": ["손해배상"], "opinion": "가능", "sentencePrediction": "승소", "confidence": 0.9}}}
+    """))
+
+    result = await service.analyze_case("손해배상 문의", 2)
+
+    query, docs = compressor.compress.call_args.args
+    assert query == "손해배상 문의" and len(docs) == 2
+    prompt_inputs = service.chain.ainvoke.call_args.args[0]
+    assert "압축된 문장" in prompt_inputs["case_docs"]
+    assert "계약 위반 시 손해배상 의무" not in prompt_inputs["case_docs"]
+    assert result["token_usage"]["extra"]["compression"]["ratio"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_분석_스트리밍_이벤트_순서(case_analysis_service):
+    """검색 완료 → 토큰/완성된 필드 → 최종 결과 순서로 내보내고 결과가 analyze_case와 같은지 테스트"""
+    response = """
+    {
+        "data": {"report": {"issues": ["계약위반"], "opinion": "손해배상이 가능합니다", "sentencePrediction": "승소",
+                            "confidence": 0.85, "references": {"cases": ["2020다123"], "statutes": []}}},
+        "tags": ["민사"]
+    }
+    """
+    case_analysis_service.chain = MockChain(response)
+    compressed_after_status = []
+    compressor = MagicMock()
+
+    def compress(query, docs):
+        compressed_after_status.append(status_sent)
+        return docs, {"chunks": 2, "cases": 2, "sentences_scored": 0, "chars_before": 0, "chars_after": 0, "ratio": 1.0}
+
+    compressor.compress.side_effect = compress
+    case_analysis_service.context_compressor = compressor
+
+    events, status_sent = [], False
+    async for event in case_analysis_service.stream_analysis("계약 위반 문의", 2):
+        status_sent = status_sent or event[0] == "status"
+        events.append(event)
+    names = [name for name, _ in events]
+
+    assert names[0] == "status"
+    # status(검색 완료)는 문장 압축 전에 도착
+    assert compressed_after_status == [True]
+    assert events[0][1]["cases"] == ["2020다123", "2021다456"]
+    assert names[-1] == "result"
+    assert "".join(data["text"] for name, data in events if name == "token") == response
+    fields = {data["name"]: data["value"] for name, data in events if name == "field"}
+    assert fields["issues"] == ["계약위반"] and fields["confidence"] == 0.85
+    # 필드는 출력이 끝나기 전에 도착
+    assert names.index("field") < len(names) - 2
+
+    expected = await case_analysis_service.analyze_case("계약 위반 문의", 2)
+    assert events[-1][1]["report"] == expected["case_analysis"].model_dump()
+
+
+@pytest.mark.asyncio
+async def test_분석_스트림을_중간에_닫으면_LLM_스트림도_닫힘(case_analysis_service):
+    closed = []
+
+    class BlockingChain(MockChain):
+        async def astream(self, input):
+            try:
+                yield '{"issues": '
+                await asyncio.Event().wait()
+            finally:
+                closed.append(True)
+
+    case_analysis_service.chain = BlockingChain("")
+    events = case_analysis_service.stream_analysis("계약 위반 문의", 2)
+    assert (await events.__anext__())[0] == "status"
+    assert (await events.__anext__())[0] == "token"
+    await events.aclose()
+
+    assert closed == [True]
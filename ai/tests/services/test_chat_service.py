@@ -1,6 +1,5 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from collections import deque
 
 from services.chat_service import ChatService
 from app.api.schemas.chat import ChatRequest
@@ -93,8 +92,7 @@ async def test_채팅_히스토리_관리(chat_service):
         pass
     
     # 히스토리가 저장되었는지 확인
-    assert user_id in chat_service.chat_histories
-    history = chat_service.chat_histories[user_id]
+    history = chat_service.session_store.get_history(user_id)
     assert len(history) == 4  # user1, assistant1, user2, assistant2 메시지
 
 
@@ -115,9 +113,10 @@ async def test_다중_사용자_히스토리_분리(chat_service):
         pass
     
     # 각 사용자의 히스토리가 분리되어 있는지 확인
-    assert user1_id in chat_service.chat_histories
-    assert user2_id in chat_service.chat_histories
-    assert chat_service.chat_histories[user1_id] != chat_service.chat_histories[user2_id]
+    user1_history = chat_service.session_store.get_history(user1_id)
+    user2_history = chat_service.session_store.get_history(user2_id)
+    assert user1_history and user2_history
+    assert user1_history != user2_history
 
 
 @pytest.mark.asyncio 
@@ -150,5 +149,29 @@ async def test_히스토리_토큰_제한_관리(chat_service):
             pass
     
     # 히스토리가 있지만 토큰 제한을 고려하여 관리되고 있는지 확인
-    assert user_id in chat_service.chat_histories
-    # 실제 토큰 수 계산은 복잡하므로 히스토리 존재 여부만 확인
\ No newline at end of file
+    store = chat_service.session_store
+    history = store.get_history(user_id)
+    assert history
+    assert sum(store.tokenizer.count(content) for _, content in history) <= store.max_history_tokens
+
+
+@pytest.mark.asyncio
+async def test_세션_저장소_공유(mock_openai_client):
+    """요청마다 새로 만든 ChatService라도 같은 저장소를 쓰면 이전 대화가 이어지는지 테스트"""
+    from services.chat_session_store import InMemoryChatSessionStore
+
+    store = InMemoryChatSessionStore()
+    async for _ in ChatService(mock_openai_client, session_store=store).stream_chat_response(
+            ChatRequest(message="첫 질문"), "user_shared"):
+        pass
+
+    service = ChatService(mock_openai_client, session_store=store)
+    messages = []
+    service.llm_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: (
+        messages.extend(kwargs["messages"]) or MockAsyncIterator([MockChunk("답변")])
+    ))
+    async for _ in service.stream_chat_response(ChatRequest(message="두 번째 질문"), "user_shared"):
+        pass
+
+    assert [m["content"] for m in messages[1:]][:1] == ["첫 질문"]
+    assert len(store.get_history("user_shared")) == 4
@@ -0,0 +1,108 @@
+import time
+
+from services.chat_session_store import (
+    MESSAGE_OVERHEAD_TOKENS, InMemoryChatSessionStore, SQLiteChatSessionStore, trim_history
+)
+
+
+class CharTokenizer:
+    """문자 1개 = 토큰 1개"""
+    name = "char"
+    exact = True
+
+    def count(self, text):
+        return len(text)
+
+
+def _store(**kwargs):
+    return InMemoryChatSessionStore(CharTokenizer(), **kwargs)
+
+
+def test_토큰_한도를_넘으면_오래된_대화쌍부터_제거():
+    messages = [("user", "a", 10), ("assistant", "b", 10), ("user", "c", 10), ("assistant", "d", 10)]
+
+    assert trim_history(messages, 40) == messages
+    assert trim_history(messages, 39) == messages[2:]
+    assert trim_history(messages, 5) == []
+
+
+def test_실제_토큰_수로_이력_관리():
+    """문자 수가 아닌 토크나이저 토큰 수(메시지 오버헤드 포함)로 자르는지 테스트"""
+    store = _store(max_history_tokens=2 * (10 + MESSAGE_OVERHEAD_TOKENS) * 2)
+    store.append_turn("u", "1" * 10, "2" * 10)
+    store.append_turn("u", "3" * 10, "4" * 10)
+    assert len(store.get_history("u")) == 4
+
+    store.append_turn("u", "5" * 10, "6" * 10)
+
+    assert store.get_history("u") == [("user", "3" * 10), ("assistant", "4" * 10),
+                                      ("user", "5" * 10), ("assistant", "6" * 10)]
+
+
+def test_세션_수_초과시_가장_오래_안_쓴_세션_삭제():
+    store = _store(max_sessions=2)
+    store.append_turn("a", "q", "r")
+    store.append_turn("b", "q", "r")
+    store.get_history("a")  # a를 최근 사용으로
+    store.append_turn("c", "q", "r")
+
+    assert store.get_history("b") == []
+    assert store.get_history("a") and store.get_history("c")
+    assert store.stats()["evictions"] == 1
+
+
+def test_전체_크기_한도와_TTL():
+    store = _store(max_bytes=10)
+    store.append_turn("a", "12345", "")
+    store.append_turn("b", "12345", "")
+    store.append_turn("c", "1", "")
+    assert store.get_history("a") == []
+    assert store.stats()["bytes"] <= 10
+
+    expired = _store(ttl_seconds=-1)
+    expired.append_turn("a", "q", "r")
+    assert expired.get_history("a") == []
+
+
+def test_SQLite_저장소는_인스턴스간_공유(tmp_path):
+    """다른 워커(인스턴스)나 재시작 후에도 같은 파일의 대화를 이어가는지 테스트"""
+    path = str(tmp_path / "sessions.sqlite3")
+    first = SQLiteChatSessionStore(path, CharTokenizer(), max_history_tokens=100)
+    first.append_turn("u", "안녕하세요", "네, 말씀하세요")
+    first.close()
+
+    second = SQLiteChatSessionStore(path, CharTokenizer(), max_history_tokens=100, max_sessions=1)
+    assert second.get_history("u") == [("user", "안녕하세요"), ("assistant", "네, 말씀하세요")]
+    assert second.compact("u", "인사함", [("user", "안녕하세요"), ("assistant", "네, 말씀하세요")])
+    assert second.get_context("u") == ("인사함", [])
+
+    time.sleep(0.01)
+    second.append_turn("v", "q", "r")
+    assert second.evict() == 1
+    assert second.get_history("u") == []
+    assert second.stats()["sessions"] == 1
+
+
+async def test_SQLite_저장소의_비동기_메서드는_워커_스레드에서_실행(tmp_path):
+    """잠금 대기가 있는 SQLite 호출은 이벤트 루프 밖에서, 메모리 저장소는 바로 실행하는지 테스트"""
+    import threading
+
+    store = SQLiteChatSessionStore(str(tmp_path / "chat.sqlite3"), CharTokenizer())
+    threads = []
+    original_append = store.append_turn
+
+    def append_turn(*args):
+        threads.append(threading.current_thread())
+        return original_append(*args)
+
+    store.append_turn = append_turn
+    assert await store.aappend_turn("u", "질문", "답변") > 0
+    assert await store.acompact("u", "요약", [("user", "질문"), ("assistant", "답변")])
+    assert await store.aget_context("u") == ("요약", [])
+    assert threads and threading.main_thread() not in threads
+
+    memory = _store()
+    memory.append_turn = append_turn
+    threads.clear()
+    await memory.aappend_turn("u", "질문", "답변")
+    assert threads == [threading.main_thread()]
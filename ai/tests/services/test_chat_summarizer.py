@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.schemas.chat import ChatRequest
+from services.chat_service import ChatService
+from services.chat_session_store import InMemoryChatSessionStore
+from services.chat_summarizer import ChatHistorySummarizer
+
+
+class CharTokenizer:
+    name = "char"
+    exact = True
+
+    def count(self, text):
+        return len(text)
+
+
+def _llm(*replies):
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[
+        MagicMock(choices=[MagicMock(message=MagicMock(content=reply))]) for reply in replies
+    ])
+    return client
+
+
+def _store():
+    return InMemoryChatSessionStore(CharTokenizer(), max_history_tokens=10000)
+
+
+@pytest.mark.asyncio
+async def test_threshold_넘으면_앞부분을_요약으로_대체():
+    """최근 턴은 남기고 앞부분만 요약문으로 바꾸는지 테스트"""
+    store = _store()
+    for i in range(3):
+        tokens = store.append_turn("u", f"질문{i}", f"답변{i}")
+    summarizer = ChatHistorySummarizer(_llm("요약된 내용"), store, threshold_tokens=10, keep_recent_turns=1)
+
+    assert summarizer.maybe_schedule("u", tokens)
+    assert not summarizer.maybe_schedule("u", tokens)  # 진행 중이면 중복 실행하지 않음
+    await summarizer.drain()
+
+    summary, history = store.get_context("u")
+    assert summary == "요약된 내용"
+    assert history == [("user", "질문2"), ("assistant", "답변2")]
+    prompt = summarizer.llm_client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+    assert "질문0" in prompt and "답변1" in prompt and "질문2" not in prompt
+    assert summarizer.stats()["compacted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_이하면_요약하지_않음():
+    summarizer = ChatHistorySummarizer(_llm(), _store(), threshold_tokens=100)
+
+    assert not summarizer.maybe_schedule("u", 100)
+
+
+@pytest.mark.asyncio
+async def test_요약_중_이력이_바뀌면_적용하지_않음():
+    store = _store()
+    store.append_turn("u", "질문0", "답변0")
+    store.append_turn("u", "질문1", "답변1")
+
+    assert not store.compact("u", "요약", [("user", "다른 질문"), ("assistant", "답변0")])
+    assert store.compact("u", "요약", [("user", "질문0"), ("assistant", "답변0")])
+    assert store.get_context("u") == ("요약", [("user", "질문1"), ("assistant", "답변1")])
+
+
+@pytest.mark.asyncio
+async def test_다음_턴에_요약문을_프롬프트에_포함():
+    """요약 이후 질문에는 요약문이 시스템 메시지로, 최근 이력만 대화로 전달되는지 테스트"""
+    store = _store()
+    store.append_turn("u", "질문0", "답변0")
+    store.compact("u", "사용자는 임대차 분쟁 중", [("user", "질문0"), ("assistant", "답변0")])
+    store.append_turn("u", "질문1", "답변1")
+
+    client = MagicMock()
+    stream = MagicMock()
+    stream.__aiter__.return_value = [MagicMock(choices=[MagicMock(delta=MagicMock(content="답"))])]
+    client.chat.completions.create = AsyncMock(return_value=stream)
+    summarizer = MagicMock()
+    summarizer.maybe_schedule.return_value = False
+
+    service = ChatService(client, session_store=store, summarizer=summarizer)
+    async for _ in service.stream_chat_response(ChatRequest(message="질문2"), "u"):
+        pass
+
+    messages = client.chat.completions.create.call_args.kwargs["messages"]
+    assert "사용자는 임대차 분쟁 중" in messages[1]["content"]
+    assert [m["content"] for m in messages[2:]] == ["질문1", "답변1", "질문2"]
+    summarizer.maybe_schedule.assert_called_once()
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 import json
@@ -98,7 +99,7 @@ async def test_상담신청서_생성_성공(consultation_service, sample_reques
 async def test_신청서_포맷_처리_성공(consultation_service, sample_request):
     """신청서 포맷팅이 정상적으로 동작하는지 테스트"""
     # _format_application은 private 메서드이지만 테스트에서 직접 호출
-    formatted_app = consultation_service._format_application(sample_request)
+    formatted_app = await consultation_service._format_application(sample_request)
     
     assert "case" in formatted_app
     assert "desiredOutcome" in formatted_app
@@ -176,4 +177,141 @@ async def test_프라이빗_메서드_질문_태그_생성(consultation_service)
     assert isinstance(tags, list)
     # Mock 응답에 따라 결과가 생성되어야 함
     assert len(questions) > 0
-    assert len(tags) > 0
\ No newline at end of file
+    assert len(tags) > 0
+
+
+@pytest.mark.asyncio
+async def test_LLM_호출_동시_실행(consultation_service, sample_request):
+    """신청서 포맷, 질문, 태그 호출이 순차가 아니라 동시에 진행되는지 테스트"""
+    original_create = consultation_service.llm_client.chat.completions.create
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_create(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await original_create(**kwargs)
+
+    consultation_service.llm_client.chat.completions.create = slow_create
+
+    result = await consultation_service.create_application_and_questions(sample_request)
+
+    assert max_in_flight == 3
+    assert len(result["questions"]) == 3
+    assert "민사" in result["tags"]
+
+
+@pytest.mark.asyncio
+async def test_질문_태그_통합_호출(mock_openai_client, sample_request):
+    """merge_questions_tags 옵션이면 질문과 태그를 한 번의 호출로 생성하는지 테스트"""
+    content = json.dumps({"questions": ["질문1", "질문2", "질문3"], "tags": ["민사", "계약"]}, ensure_ascii=False)
+    mock_openai_client.chat.completions.create = AsyncMock(
+        return_value=MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+    )
+    service = ConsultationService(mock_openai_client, merge_questions_tags=True)
+
+    questions, tags = await service._generate_questions_tags_from_llm(
+        {"case": {"fullText": "계약 위반"}, "desiredOutcome": "손해배상"}
+    )
+
+    assert mock_openai_client.chat.completions.create.await_count == 1
+    assert questions == ["질문1", "질문2", "질문3"]
+    assert tags == ["민사", "계약"]
+
+
+@pytest.mark.asyncio
+async def test_JSON_호출은_temperature_0으로_캐시_키에_포함(mock_openai_client, monkeypatch):
+    """캐시되는 JSON 호출이 temperature=0으로 요청되고 캐시 키 파라미터에도 포함되는지 테스트"""
+    mock_openai_client.chat.completions.create = AsyncMock(
+        return_value=MagicMock(choices=[MagicMock(message=MagicMock(content='{"ok": true}'))])
+    )
+    seen = {}
+
+    async def fake_cached(model, messages, params, fetch, validate=None):
+        seen["params"] = params
+        return await fetch()
+
+    monkeypatch.setattr("services.consultation_service.acached_completion", fake_cached)
+    service = ConsultationService(mock_openai_client)
+
+    assert await service._chat_json("system", "prompt") == {"ok": True}
+    assert mock_openai_client.chat.completions.create.call_args.kwargs["temperature"] == 0
+    assert seen["params"]["temperature"] == 0
+
+
+@pytest.mark.asyncio
+async def test_호출_시간_초과시_기본값(mock_openai_client, sample_request):
+    """제한 시간을 넘긴 호출은 기다리지 않고 기본값으로 대체하는지 테스트"""
+    async def hanging_create(**kwargs):
+        await asyncio.sleep(10)
+
+    mock_openai_client.chat.completions.create = hanging_create
+    service = ConsultationService(mock_openai_client, call_timeout=0.01)
+
+    result = await asyncio.wait_for(service.create_application_and_questions(sample_request), timeout=1)
+
+    assert result["application"]["case"]["title"] == "계약 분쟁 상담"
+    assert result["questions"] == []
+    assert result["tags"] == []
+
+
+@pytest.mark.asyncio
+async def test_로컬_태그_분류기_사용(mock_openai_client, sample_request):
+    """로컬 분류기 확신도가 높으면 태그 LLM 호출 없이 로컬 태그를 사용하는지 테스트"""
+    from services.tag_classifier import TagPrediction
+
+    tag_classifier = MagicMock()
+    tag_classifier.classify.return_value = TagPrediction(["계약분쟁"], [0.82], True)
+    original_create = mock_openai_client.chat.completions.create
+    mock_openai_client.chat.completions.create = AsyncMock(side_effect=original_create)
+    service = ConsultationService(mock_openai_client, tag_classifier=tag_classifier)
+
+    result = await service.create_application_and_questions(sample_request)
+
+    assert result["tags"] == ["계약분쟁"]
+    assert len(result["questions"]) == 3
+    prompts = [c.kwargs["messages"][-1]["content"] for c in mock_openai_client.chat.completions.create.await_args_list]
+    assert not any("키워드" in p for p in prompts)
+
+    # 확신도가 낮으면 LLM 태그로 fallback
+    tag_classifier.classify.return_value = TagPrediction(["계약분쟁"], [0.31], False)
+    result = await service.create_application_and_questions(sample_request)
+    assert "민사" in result["tags"]
+
+
+@pytest.mark.asyncio
+async def test_로컬_태그_분류는_워커_스레드에서_질문_호출과_동시_실행(mock_openai_client):
+    """임베딩 계산이 이벤트 루프를 막지 않고 질문 LLM 호출과 겹쳐 실행되는지 테스트"""
+    import threading
+    import time
+    from services.tag_classifier import TagPrediction
+
+    classify_threads = []
+
+    def slow_classify(text):
+        classify_threads.append(threading.current_thread())
+        time.sleep(0.1)
+        return TagPrediction(["계약분쟁"], [0.82], True)
+
+    original_create = mock_openai_client.chat.completions.create
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.1)
+        return await original_create(**kwargs)
+
+    mock_openai_client.chat.completions.create = slow_create
+    tag_classifier = MagicMock()
+    tag_classifier.classify.side_effect = slow_classify
+    service = ConsultationService(mock_openai_client, tag_classifier=tag_classifier)
+
+    started = time.perf_counter()
+    questions, tags = await service._generate_questions_tags_from_llm(
+        {"case": {"title": "계약", "fullText": "계약 위반"}, "desiredOutcome": "손해배상"}
+    )
+
+    assert tags == ["계약분쟁"] and len(questions) == 3
+    assert classify_threads[0] is not threading.main_thread()
+    assert time.perf_counter() - started < 0.18
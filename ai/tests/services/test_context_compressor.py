@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+from services.context_compressor import ContextCompressor, split_sentences
+
+
+def _scorer(keyword):
+    """keyword가 들어간 문장에 높은 점수를 주는 Cross-encoder 대역"""
+    model = MagicMock()
+    model.get_cross_encoder_scores.side_effect = lambda query, docs, batch_size=32: [
+        1.0 if keyword in doc else 0.0 for doc in docs
+    ]
+    return model
+
+
+def test_문장_분리_짧은_조각은_합침():
+    """짧은 조각(사건번호 등)은 다음 문장에 붙이고 긴 문장은 잘라내는지 테스트"""
+    text = "가.\n원고는 피고에게 손해배상을 청구하였다. 피고는 계약 위반이 없다고 주장한다.\n" + "다" * 50
+
+    sentences = split_sentences(text, min_chars=10, max_chars=30)
+
+    assert sentences[0].startswith("가. 원고는")
+    assert sentences[1] == "피고는 계약 위반이 없다고 주장한다."
+    assert sentences[2] == "다" * 30
+
+
+def test_판례별_상위_문장만_원래_순서로_유지():
+    """같은 판례의 청크를 합쳐 한 번에 채점하고, 판례별 상위 문장만 원래 순서대로 남기는지 테스트"""
+    model = _scorer("손해배상")
+    compressor = ContextCompressor(model, sentences_per_case=2, batch_size=16, min_sentence_chars=5)
+    docs = [
+        {"id": "2020다1", "issue": "손해배상", "text": "손해배상 책임이 인정된다. 사건의 경위는 다음과 같다."},
+        {"id": "2021다2", "issue": "계약", "text": "계약은 유효하다. 별도의 판단은 하지 않는다."},
+        {"id": "2020다1", "issue": "손해배상", "text": "원심은 정당하다. 손해배상 범위는 통상손해로 한정된다."},
+    ]
+
+    compressed, stats = compressor.compress("손해배상 청구", docs)
+
+    model.get_cross_encoder_scores.assert_called_once()
+    assert model.get_cross_encoder_scores.call_args.kwargs["batch_size"] == 16
+    assert [doc["id"] for doc in compressed] == ["2020다1", "2021다2"]
+    assert compressed[0]["text"] == "손해배상 책임이 인정된다. 손해배상 범위는 통상손해로 한정된다."
+    assert compressed[0]["issue"] == "손해배상"
+    assert stats["chunks"] == 3 and stats["cases"] == 2 and stats["sentences_scored"] == 6
+    assert stats["chars_after"] < stats["chars_before"]
+    assert stats["ratio"] > 1
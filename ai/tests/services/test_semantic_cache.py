@@ -0,0 +1,64 @@
+import pytest
+
+from app.api.schemas.analysis import CaseAnalysisResult
+from services.semantic_cache import SemanticAnalysisCache
+
+
+def _result(confidence=0.8):
+    return CaseAnalysisResult(issues=["손해배상"], opinion="소견", expected_sentence="승소", confidence=confidence)
+
+
+def test_threshold_이상이면_적중():
+    """유사도가 threshold 이상인 이전 분석만 재사용하는지 테스트"""
+    cache = SemanticAnalysisCache(threshold=0.95, max_entries=10)
+    cache.add([1.0, 0.0, 0.0], _result())
+
+    assert cache.lookup([1.0, 0.0, 0.0])[1] == pytest.approx(1.0)
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    metrics = cache.metrics()
+    assert metrics["lookups"] == 2 and metrics["hits"] == 1
+    assert metrics["hit_rate"] == 0.5
+    assert metrics["similarity_histogram"]["0.99-1"] == 1
+    assert metrics["similarity_histogram"]["0-0.5"] == 1
+
+
+def test_유사한_사연은_신뢰도_조정():
+    """완전히 같지 않은 사연은 유사도만큼 confidence를 낮추고 저장된 결과는 바꾸지 않는지 테스트"""
+    cache = SemanticAnalysisCache(threshold=0.9, max_entries=10)
+    cache.add([1.0, 0.0], _result(0.8))
+
+    result, similarity = cache.lookup([1.0, 0.3])
+
+    assert 0.9 < similarity < 1.0
+    assert result.confidence == pytest.approx(0.8 * similarity, abs=1e-4)
+    assert cache.lookup([1.0, 0.0])[0].confidence == 0.8
+
+
+def test_가득_차면_오래된_항목부터_교체():
+    """max_entries를 넘으면 가장 오래된 항목을 덮어쓰는지 테스트"""
+    cache = SemanticAnalysisCache(threshold=0.99, max_entries=2)
+    cache.add([1.0, 0.0, 0.0], _result())
+    cache.add([0.0, 1.0, 0.0], _result())
+    cache.add([0.0, 0.0, 1.0], _result())
+
+    assert cache.lookup([1.0, 0.0, 0.0]) is None
+    assert cache.lookup([0.0, 0.0, 1.0]) is not None
+    assert cache.metrics()["entries"] == 2
+
+
+def test_top_k가_다르면_적중하지_않음():
+    """검색 판례 수(top_k)가 같은 항목끼리만 비교하는지 테스트"""
+    cache = SemanticAnalysisCache(threshold=0.9, max_entries=10)
+    cache.add([1.0, 0.0], _result(0.8), top_k=1)
+    cache.add([1.0, 0.0], _result(0.6), top_k=10)
+
+    assert cache.lookup([1.0, 0.0], top_k=1)[0].confidence == 0.8
+    assert cache.lookup([1.0, 0.0], top_k=10)[0].confidence == 0.6
+    assert cache.lookup([1.0, 0.0], top_k=5) is None
+
+
+def test_TTL_지난_항목은_무시():
+    cache = SemanticAnalysisCache(threshold=0.9, max_entries=2, ttl_seconds=-1)
+    cache.add([1.0, 0.0], _result())
+
+    assert cache.lookup([1.0, 0.0]) is None
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from langchain_core.messages import AIMessage
@@ -126,4 +127,46 @@ async def test_빈_텍스트_처리():
     
     assert "title" in result
     assert "summary" in result
-    assert "fullText" in result
\ No newline at end of file
+    assert "fullText" in result
+
+@pytest.mark.asyncio
+async def test_동시_중복_제출은_한_번만_구조화():
+    """같은 사연이 동시에 두 번 들어오면 LLM을 한 번만 호출하고 같은 결과를 반환하는지 테스트"""
+    mock_llm = MockLLM(['{"title": "중복 제출", "summary": "요약", "fullText": "본문"}'])
+    first, second = StructuringService(mock_llm), StructuringService(mock_llm)
+
+    results = await asyncio.gather(
+        first.structure_case("중복으로 제출된 사연입니다."),
+        second.structure_case("중복으로 제출된  사연입니다. "),
+    )
+
+    assert mock_llm.call_count == 1
+    assert results[0] == results[1]
+
+
+@pytest.mark.asyncio
+async def test_캐시_우회_요청은_진행_중인_일반_요청과_병합하지_않음():
+    from llm.clients.response_cache import bypass_llm_cache
+
+    mock_llm = MockLLM([
+        '{"title": "일반", "summary": "요약", "fullText": "본문"}',
+        '{"title": "우회", "summary": "요약", "fullText": "본문"}',
+    ])
+
+    async def bypassed():
+        with bypass_llm_cache():
+            return await StructuringService(mock_llm).structure_case("같은 사연입니다.")
+
+    normal, fresh = await asyncio.gather(StructuringService(mock_llm).structure_case("같은 사연입니다."), bypassed())
+
+    assert mock_llm.call_count == 2
+    assert {normal["title"], fresh["title"]} == {"일반", "우회"}
+
+
+def test_복구가_필요한_구조화_출력은_캐시_대상이_아님():
+    from llm.structuring_parser import is_complete_structuring_output
+
+    assert is_complete_structuring_output('{"title": "제목", "summary": "요약", "fullText": "본문"}')
+    assert not is_complete_structuring_output('{"title": "제목", "fullText": "본')
+    assert not is_complete_structuring_output('{"title": "제목", "fullText": ""}')
+    assert not is_complete_structuring_output("[]")
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from services.tag_classifier import TagClassifier
+from scripts.evaluate_tag_classifier import evaluate
+
+# 텍스트에 포함된 키워드로 축을 정하는 가짜 임베딩
+AXES = {"음주": 0, "이혼": 1, "해고": 2}
+
+
+def _fake_encode(texts, batch_size=32):
+    vectors = np.full((len(texts), len(AXES)), 0.05, dtype=np.float32)
+    for row, text in enumerate(texts):
+        for keyword, axis in AXES.items():
+            if keyword in text:
+                vectors[row, axis] = 1.0
+    return vectors
+
+
+@pytest.fixture
+def classifier():
+    model = MagicMock()
+    model.encode_batch.side_effect = _fake_encode
+    return TagClassifier(
+        model,
+        tags=["음주운전", "이혼", "부당해고"],
+        descriptions={"음주운전": ["음주 단속"], "이혼": ["이혼 소송"], "부당해고": ["해고 통보"]},
+        threshold=0.3,
+        top_k=2,
+        min_confidence=0.8,
+    )
+
+
+def test_태그_기준_벡터_한_번에_인코딩(classifier):
+    """프로토타입 문장을 한 번의 배치로 인코딩하고 태그별 정규화된 벡터를 만드는지 테스트"""
+    assert classifier.embedding_model.encode_batch.call_count == 1
+    assert classifier.tag_matrix.shape == (3, 3)
+    assert np.allclose(np.linalg.norm(classifier.tag_matrix, axis=1), 1.0)
+
+
+def test_threshold_이상_top_k_선택(classifier):
+    """점수가 높은 순으로 threshold 이상인 태그만 top_k개까지 선택하는지 테스트"""
+    prediction = classifier.classify("음주 후 운전하다 해고까지 당했습니다")
+
+    assert set(prediction.tags) == {"음주운전", "부당해고"}
+    assert prediction.scores == sorted(prediction.scores, reverse=True)
+    assert prediction.confident is False  # 두 축에 나뉘어 최고 점수가 min_confidence 미만
+
+
+def test_확신도_높은_분류(classifier):
+    """한 분야에 명확히 해당하면 confident=True로 분류하는지 테스트"""
+    prediction = classifier.classify("이혼을 준비하고 있습니다")
+
+    assert prediction.tags[0] == "이혼"
+    assert prediction.confident is True
+
+
+def test_평가_지표_계산(classifier):
+    """LLM 태그 대비 precision/recall/fallback 비율을 계산하는지 테스트"""
+    texts = ["이혼 상담", "음주 단속", "음주 해고"]
+    references = [{"이혼"}, {"음주운전"}, {"부당해고"}]
+
+    report = evaluate(classifier, classifier.score(texts), references, thresholds=[0.3, 1.01], top_k=1)
+
+    loose, strict = report
+    # "음주 해고"는 두 태그 점수가 같아 1순위가 음주운전 → 오답
+    assert loose["top1"] == pytest.approx(2 / 3)
+    assert loose["precision"] == pytest.approx(2 / 3)
+    assert loose["recall"] == pytest.approx(2 / 3)
+    assert loose["fallback"] == pytest.approx(1 / 3)
+    assert loose["confident_precision"] == 1.0
+    assert strict["precision"] == 0.0 and strict["fallback"] == 1.0
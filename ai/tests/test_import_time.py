@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# import 시점에 로드되면 안 되는 무거운 모듈들
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "openai")
+
+# 모듈별 import 시간 예산 (ms)
+IMPORT_BUDGETS_MS = {
+    "core.container": 300,
+    "llm.models.model_loader": 1500,
+    "db.database": 1500,
+}
+
+
+def _import_profile(module: str) -> dict:
+    """`python -X importtime`으로 모듈을 import 하고 {모듈명: 누적 시간(us)}을 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": PROJECT_ROOT},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        _self_us, cumulative_us, name = (part.strip() for part in rest.split("|"))
+        profile[name] = int(cumulative_us)
+    return profile
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_시간_예산_준수(module):
+    """모듈 import가 시간 예산 안에 끝나는지 테스트"""
+    profile = _import_profile(module)
+
+    cumulative_ms = profile[module] / 1000
+    assert cumulative_ms <= IMPORT_BUDGETS_MS[module], (
+        f"{module} import에 {cumulative_ms:.0f}ms 소요 (예산 {IMPORT_BUDGETS_MS[module]}ms)"
+    )
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_시_무거운_모듈_미로드(module):
+    """모델/클라이언트/엔진 라이브러리가 import 시점에 로드되지 않는지 테스트"""
+    profile = _import_profile(module)
+
+    loaded = [name for name in HEAVY_MODULES if name in profile]
+    assert loaded == [], f"{module} import 시 {loaded}가 함께 로드됨"
@@ -18,8 +18,20 @@ class CustomFormatter(logging.Formatter):
         return datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
 
 
-def setup_logger():
-    """전역 로깅 설정을 초기화합니다."""
+_logger_configured = False
+
+
+def setup_logger(force: bool = False):
+    """
+    전역 로깅 설정을 초기화합니다.
+
+    여러 진입점(app, scripts)에서 호출되어도 한 번만 설정되며,
+    force=True인 경우에만 핸들러를 다시 구성합니다.
+    """
+    global _logger_configured
+    if _logger_configured and not force:
+        return
+
     logging_settings = get_logging_settings()
     
     LOG_DIR = "logs"
@@ -60,6 +72,8 @@ def setup_logger():
     for handler in handlers:
         root_logger.addHandler(handler)
 
+    _logger_configured = True
+
 def get_logger(name: str) -> logging.Logger:
     """로거 인스턴스를 반환합니다."""
     return logging.getLogger(name)